@@ -2,75 +2,689 @@ from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
 import json
 import io
-from nyota_calculator import compute_all_scores, generate_radar_chart_data
-import matplotlib.pyplot as plt
-import numpy as np
+import os
+import re
+from nyota_cache import cache_from_env, scores_hash, team_hash, vector_hash
+from nyota_compression import init_compression, precompressed_variant
+from nyota_static import register_frontend
+from nyota_catalogue import get_catalogue
+from nyota_tenants import default_catalogue, get_tenant_catalogue, watcher_from_env
+from nyota_adaptive import DEFAULT_TOLERANCE, adaptive_step, parse_tolerance
+from nyota_quality import assess_quality, quality_summary
+from nyota_store import ResponseStore
+from nyota_teams import (
+    MAX_TEAM_SIZE,
+    MIN_TEAM_SIZE,
+    group_profile,
+    member_scores_from_dicts,
+    profile_to_dict,
+    store_member_scores
+)
+from nyota_jobs import ARTIFACTS, DONE, JobWorkerPool, queue_from_env
+from nyota_limits import AdmissionGate, limiter_from_env, retry_after, store_from_env
+from nyota_cohort_reports import ARCHIVE_FORMATS, stream_cohort_bundle
+from nyota_singleflight import SingleFlight
+from nyota_render import (
+    DEFAULT_VARIANT,
+    IMAGE_FORMATS,
+    IMAGE_VARIANTS,
+    SIMPLE_STYLE,
+    TEAM_STYLE,
+    render_radar_image,
+    render_team_image
+)
+from nyota_calculator import (
+    COMPILED_AXES,
+    CONFIDENCE_LEVEL,
+    compute_scores_with_errors,
+    confidence_intervals,
+    generate_radar_chart_data,
+    scores_to_dict,
+    validate_responses,
+    validate_scores
+)
 import base64
 
 app = Flask(__name__)
-CORS(app)  # Autoriser les requêtes depuis ton frontend
+CORS(app, expose_headers=["ETag", "X-Cache", "X-Catalogue-Version", "Retry-After"])  # Autoriser les requêtes depuis ton frontend
+init_compression(app)  # gzip/brotli selon Accept-Encoding
+
+# Frontend servi par l'API elle-même (fichiers empreintés, précompressés, cache immuable)
+if os.environ.get("NYOTA_SERVE_FRONTEND"):
+    register_frontend(app, os.path.dirname(os.path.abspath(__file__)))
+
+# Cache des résultats de /api/calculate (NYOTA_CACHE_SIZE, NYOTA_CACHE_TTL, NYOTA_CACHE_DIR)
+CALCULATE_CACHE = cache_from_env("NYOTA_CACHE", default_size=4096)
+CALCULATE_FORMAT = "v3"  # à changer quand le contenu de la réponse évolue (clés de cache et ETags)
+
+def invalidate_layouts(layouts):
+    # Seules les entrées des dispositions retirées sont supprimées, le reste du cache reste chaud
+    for layout in layouts:
+        CALCULATE_CACHE.invalidate(layout)
+
+# Configurations de scoring par client (NYOTA_TENANTS_FILE), compilées une fois puis rechargées à chaud
+TENANT_WATCHER = watcher_from_env(on_retire=invalidate_layouts)
+
+# Cache des images radar, une entrée par variante (NYOTA_CHART_CACHE_SIZE, _TTL, _DIR)
+CHART_CACHE = cache_from_env("NYOTA_CHART_CACHE", default_size=512)
+
+# Radars d'équipe, une entrée par composition d'équipe × variante (NYOTA_TEAM_CACHE_SIZE, _TTL, _DIR)
+TEAM_CACHE = cache_from_env("NYOTA_TEAM_CACHE", default_size=256)
+
+# Archive des réponses (nyota_store) pour les équipes désignées par identifiants (NYOTA_STORE_DIR)
+RESPONSE_STORE = ResponseStore(os.environ["NYOTA_STORE_DIR"]) if os.environ.get("NYOTA_STORE_DIR") else None
+
+# Coalescence des rendus identiques : entre threads, et entre processus via des verrous fichier
+# (NYOTA_RENDER_LOCK_DIR, par défaut à côté du cache partagé des images s'il existe)
+RENDER_LOCK_DIR = os.environ.get("NYOTA_RENDER_LOCK_DIR") or (
+    os.path.join(os.environ["NYOTA_CHART_CACHE_DIR"], "locks") if os.environ.get("NYOTA_CHART_CACHE_DIR") else None
+)
+RENDER_FLIGHTS = SingleFlight(RENDER_LOCK_DIR)
+
+# File de génération des rapports complets (NYOTA_JOBS_DB, NYOTA_JOBS_DIR, NYOTA_JOBS_WORKERS, NYOTA_JOBS_TTL)
+REPORT_JOBS = queue_from_env()
+REPORT_WORKERS = JobWorkerPool(REPORT_JOBS, workers=int(os.environ.get("NYOTA_JOBS_WORKERS", 2)))
+MAX_LONG_POLL = 30
+
+# Export d'archives de cohorte : processus de rendu (NYOTA_EXPORT_WORKERS, défaut : tous les cœurs)
+EXPORT_WORKERS = int(os.environ.get("NYOTA_EXPORT_WORKERS", 0)) or None
+SAFE_RESPONDENT_ID = re.compile(r'^[A-Za-z0-9_-][A-Za-z0-9._-]*$')
+
+# Limitation des routes de rendu par client (NYOTA_<ROUTE>_RATE jetons/s, NYOTA_<ROUTE>_BURST),
+# seaux partagés entre workers si NYOTA_LIMITS_DB est défini ; /api/calculate n'est jamais limité
+LIMITS_STORE = store_from_env()
+RENDER_LIMITER = limiter_from_env("NYOTA_RENDER", default_rate=0.5, default_burst=10, store=LIMITS_STORE)
+EXPORT_LIMITER = limiter_from_env("NYOTA_EXPORT", default_rate=1 / 60, default_burst=2, store=LIMITS_STORE)
+REPORTS_LIMITER = limiter_from_env("NYOTA_REPORTS", default_rate=1, default_burst=20, store=LIMITS_STORE)
+
+# Clés d'API reconnues (NYOTA_API_KEYS, séparées par des virgules) : seules celles-ci ont leur propre seau
+API_KEYS = frozenset(key.strip() for key in os.environ.get("NYOTA_API_KEYS", "").split(",") if key.strip())
+
+# Rendus simultanés par processus (NYOTA_RENDER_CONCURRENCY) : au-delà, 503 immédiat
+RENDER_GATE = AdmissionGate(int(os.environ.get("NYOTA_RENDER_CONCURRENCY", os.cpu_count() or 2)))
+OVERLOAD_RETRY_AFTER = 2
+
+class RenderRefused(Exception):
+    """Rendu refusé (limite de débit ou capacité) : porte la réponse HTTP à renvoyer"""
+    def __init__(self, response):
+        super().__init__(response.status)
+        self.response = response
+
+def client_key():
+    """
+    Clé de limitation : l'adresse du client, ou sa clé d'API si elle est reconnue. Une clé inconnue
+    est ignorée, sinon un client changerait d'en-tête à chaque requête pour obtenir un seau neuf.
+    """
+    api_key = request.headers.get('X-Api-Key')
+    if api_key and api_key in API_KEYS:
+        return f"key:{api_key}"
+    return request.remote_addr or 'anonyme'
+
+def rate_limited(limiter, route):
+    """Réponse 429 si le client a épuisé ses jetons pour cette route, sinon None"""
+    allowed, wait = limiter.acquire(f"{route}:{client_key()}")
+    if allowed:
+        return None
+    response = jsonify({"success": False, "error": "Trop de requêtes", "retry_after": round(wait, 2)})
+    response.status_code = 429
+    response.headers['Retry-After'] = retry_after(wait)
+    return response
+
+def overloaded():
+    response = jsonify({"success": False, "error": "Capacité de rendu saturée"})
+    response.status_code = 503
+    response.headers['Retry-After'] = retry_after(OVERLOAD_RETRY_AFTER)
+    return response
+
+def cached_render(cache, key, render):
+    """
+    (valeur, statut X-Cache) d'un rendu mis en cache. Le cache n'est lu qu'une fois, par le meneur
+    du vol (single-flight) : HIT, COALESCED (résultat d'une requête identique simultanée) ou MISS.
+    Lève RenderRefused si le rendu est refusé.
+    """
+    hits = []
+    
+    def lookup():
+        value = cache.get(key)
+        if value is not None:
+            hits.append(key)
+        return value
+    
+    value, shared = RENDER_FLIGHTS.do(key, render, lookup=lookup)
+    return value, "HIT" if hits else ("COALESCED" if shared else "MISS")
+
+def request_object():
+    """Corps JSON de la requête : (objet, None), ou (None, 400 invalid_payload) si ce n'est pas un objet"""
+    data = request.get_json(silent=True)
+    if data is None:
+        return {}, None
+    if not isinstance(data, dict):
+        return None, (jsonify({
+            "success": False,
+            "error": "Objet JSON attendu",
+            "errors": [{"item": None, "code": "invalid_payload", "value": None}]
+        }), 400)
+    return data, None
+
+def request_catalogue(version=None):
+    """
+    Catalogue (et donc disposition de scoring précompilée) de la requête : celui du tenant
+    désigné par X-Tenant ou ?tenant, sinon la version demandée, sinon le catalogue par défaut.
+    Renvoie (catalogue, None) ou (None, réponse d'erreur).
+    """
+    version = request.headers.get('X-Catalogue-Version') or version
+    tenant = request.headers.get('X-Tenant') or request.args.get('tenant')
+    
+    if tenant:
+        catalogue = get_tenant_catalogue(tenant)
+        if catalogue is None:
+            return None, (jsonify({"success": False, "error": "Tenant inconnu"}), 404)
+    else:
+        catalogue = get_catalogue(version) if version else default_catalogue()
+    
+    if catalogue is None or (version and version != catalogue["version"]):
+        return None, (jsonify({
+            "success": False,
+            "error": "Version de catalogue inconnue",
+            "catalogue_version": (catalogue or default_catalogue())["version"]
+        }), 409)
+    return catalogue, None
+
+def request_layout():
+    """Disposition de scoring de la requête pour valider des scores (None si tenant ou version inconnus)"""
+    catalogue, error = request_catalogue(request.args.get('catalogue_version'))
+    return (catalogue.compiled, None) if error is None else (None, error)
+
+def report_layout():
+    """
+    Disposition de la requête pour les routes de rapport. Les rapports (diag, recommandations,
+    gabarits de cohorte, radar à 8 branches) ne connaissent que les axes par défaut : une autre
+    configuration d'axes est refusée avant tout traitement plutôt qu'en cours de tâche ou de flux.
+    """
+    layout, error = request_layout()
+    if error is None and tuple(layout.axis_names) != tuple(COMPILED_AXES.axis_names):
+        return None, (jsonify({
+            "success": False,
+            "error": "Rapports indisponibles pour cette configuration d'axes",
+            "code": "unsupported_axes",
+            "axes": list(layout.axis_names)
+        }), 400)
+    return layout, error
+
+def job_payload(job):
+    payload = {
+        "success": True,
+        "job_id": job["id"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "status_url": f"/api/reports/{job['id']}"
+    }
+    if job["status"] == DONE:
+        payload["expires_at"] = job["expires_at"]
+        payload["artifacts"] = {name: f"/api/reports/{job['id']}/{name}" for name in ARTIFACTS}
+    elif job["error"]:
+        payload["error"] = job["error"].strip().splitlines()[-1]
+    return payload
 
 @app.route('/api/calculate', methods=['POST'])
 def calculate_scores():
     try:
-        data = request.json
-        responses = {int(k): int(v) for k, v in data.items()}
+        data = request.get_json(silent=True)
+        catalogue, error = request_catalogue(request.args.get('catalogue_version'))
         
-        scores = compute_all_scores(responses)
-        chart_data = generate_radar_chart_data(scores)
+        if error is not None:
+            return error
         
-        return jsonify({
-            "success": True,
-            "scores": scores,
-            "chart_data": chart_data
-        })
+        layout = catalogue.compiled
+        validation = validate_responses(data, layout=layout)
+        
+        if not validation["valid"]:
+            return jsonify({
+                "success": False,
+                "error": "Réponses invalides",
+                "errors": validation["errors"],
+                "coverage": validation["coverage"]
+            }), 400
+        
+        # Scores partagés par les catalogues d'une même disposition ; la version du catalogue
+        # est ajoutée après le cache et distingue l'ETag (mêmes axes, autres questions)
+        key = vector_hash(validation["vector"], namespace=f"{catalogue['layout']}:{CALCULATE_FORMAT}")
+        etag = f"{key}.{catalogue['version']}"
+        
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+        
+        payload = CALCULATE_CACHE.get(key, tag=catalogue["layout"])
+        cache_status = "HIT"
+        
+        if payload is None:
+            scores, standard_errors = compute_scores_with_errors(validation["vector"], layout)
+            low, high = confidence_intervals(scores, standard_errors)
+            scores = scores_to_dict(scores[0], layout)
+            chart_data = generate_radar_chart_data(scores)
+            
+            payload = {
+                "success": True,
+                "scores": scores,
+                "standard_errors": scores_to_dict(standard_errors[0], layout),
+                "confidence_intervals": {
+                    axis: [float(l), float(h)] for axis, l, h in zip(layout.axis_names, low[0], high[0])
+                },
+                "confidence_level": CONFIDENCE_LEVEL,
+                "quality": quality_summary(assess_quality(validation["vector"], layout=layout)),
+                "chart_data": chart_data
+            }
+            CALCULATE_CACHE.set(key, payload, tag=catalogue["layout"])
+            cache_status = "MISS"
+        
+        response = jsonify({**payload, "catalogue_version": catalogue["version"]})
+        response.set_etag(etag)
+        response.headers["X-Cache"] = cache_status
+        return response
     except Exception as e:
         return jsonify({
             "success": False,
             "error": str(e)
         }), 400
 
+def chart_format():
+    """Mode binaire : ?format=png|webp, ou Accept qui préfère une image au JSON ; None = JSON base64"""
+    requested = request.args.get('format')
+    if requested in IMAGE_FORMATS:
+        return requested
+    best = request.accept_mimetypes.best_match(['application/json', 'image/webp', 'image/png'])
+    return {'image/webp': 'webp', 'image/png': 'png'}.get(best)
+
+@app.route('/api/adaptive/next', methods=['POST'])
+def adaptive_next():
+    data, error = request_object()
+    if error is not None:
+        return error
+    
+    catalogue, error = request_catalogue(data.get('catalogue_version'))
+    
+    if error is not None:
+        return error
+    
+    layout = catalogue.compiled
+    validation = validate_responses(data.get('answers', {}), require_complete=False, layout=layout)
+    
+    if not validation["valid"]:
+        return jsonify({
+            "success": False,
+            "error": "Réponses invalides",
+            "errors": validation["errors"]
+        }), 400
+    
+    tolerance, errors = parse_tolerance(data.get('tolerance', DEFAULT_TOLERANCE))
+    if errors:
+        return jsonify({"success": False, "error": "Tolérance invalide", "errors": errors}), 400
+    
+    step = adaptive_step(validation["vector"], tolerance, layout)
+    if step["next_item"] is not None:
+        step["question"] = catalogue["questions"][step["next_item"] - 1]
+    
+    return jsonify({"success": True, "catalogue_version": catalogue["version"], **step})
+
 @app.route('/api/generate-pdf', methods=['POST'])
 def generate_pdf():
+    data, error = request_object()
+    if error is not None:
+        return error
+    
+    scores = data.get('scores')
+    layout, error = report_layout()
+    
+    if error is not None:
+        return error
+    
+    errors = validate_scores(scores, layout)
+    
+    if errors:
+        return jsonify({"success": False, "error": "Scores invalides", "errors": errors}), 400
+    
+    variant = request.args.get('size', DEFAULT_VARIANT)
+    if variant not in IMAGE_VARIANTS:
+        return jsonify({"success": False, "error": f"Taille inconnue (attendu : {', '.join(IMAGE_VARIANTS)})"}), 400
+    
+    fmt = chart_format()
+    image_format = fmt or 'png'
+    key = scores_hash(scores, namespace=f"{variant}.{image_format}:")
+    
+    if fmt is not None and request.if_none_match.contains_weak(key):
+        response = app.response_class(status=304)
+        response.set_etag(key)
+        response.vary.add('Accept')
+        return response
+    
+    # Une entrée par variante (taille × format), stockée en base64 pour le backend JSON partagé
+    def render():
+        # Seuls les vrais rendus consomment des jetons et une place de rendu
+        error = rate_limited(RENDER_LIMITER, 'render')
+        if error is not None:
+            raise RenderRefused(error)
+        with RENDER_GATE.admit() as admitted:
+            if not admitted:
+                raise RenderRefused(overloaded())
+            rendered = base64.b64encode(render_radar_image(scores, SIMPLE_STYLE, variant, image_format)).decode()
+        CHART_CACHE.set(key, rendered)
+        return rendered
+    
+    # Requêtes identiques simultanées : un seul rendu, dont toutes reçoivent le résultat
     try:
-        data = request.json
-        scores = data.get('scores', {})
-        
-        # Créer le diagramme radar
-        labels = list(scores.keys())
-        values = list(scores.values())
-        
-        num_axes = len(labels)
-        angles = np.linspace(0, 2 * np.pi, num_axes, endpoint=False).tolist()
-        values += values[:1]
-        angles += angles[:1]
-        
-        plt.figure(figsize=(10, 10))
-        ax = plt.subplot(111, polar=True)
-        ax.set_theta_offset(np.pi / 2)
-        ax.set_theta_direction(-1)
-        ax.set_xticks(angles[:-1])
-        ax.set_xticklabels(labels, fontsize=9)
-        ax.set_ylim(0, 100)
-        
-        ax.plot(angles, values, 'o-', linewidth=2, color='#2E86AB')
-        ax.fill(angles, values, alpha=0.25, color='#2E86AB')
-        ax.grid(True, linestyle='--', alpha=0.7)
-        ax.set_title("NYOTA Personality - Profil à 8 dimensions", pad=20)
-        
-        # Convertir en image base64
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        img_str = base64.b64encode(img_buffer.getvalue()).decode()
-        
+        image, cache_status = cached_render(CHART_CACHE, key, render)
+    except RenderRefused as refused:
+        return refused.response
+    
+    if fmt is not None:
+        # Image brute envoyée par blocs : 33 % plus légère que le base64 et sans mise en tampon JSON
+        response = send_file(io.BytesIO(base64.b64decode(image)), mimetype=IMAGE_FORMATS[fmt],
+                             download_name=f'nyota-profil-{variant}.{fmt}', etag=key)
+        response.vary.add('Accept')
+        response.headers["X-Cache"] = cache_status
+        return response
+    
+    response = jsonify({
+        "success": True,
+        "image": image,
+        "size": variant,
+        "format": image_format
+    })
+    response.headers["X-Cache"] = cache_status
+    return response
+
+def team_members(data, layout):
+    """
+    (identifiants, scores membres × axes) des membres soumis ("members") ou archivés ("member_ids"),
+    ou (None, réponse d'erreur)
+    """
+    member_ids = data.get('member_ids')
+    members = data.get('members')
+    
+    if member_ids is not None:
+        if RESPONSE_STORE is None:
+            return None, (jsonify({"success": False, "error": "Aucune archive de réponses configurée"}), 400)
+        if not isinstance(member_ids, list) or not all(isinstance(m, str) for m in member_ids) \
+                or len(set(member_ids)) != len(member_ids):
+            return None, (jsonify({"success": False, "error": "Liste 'member_ids' d'identifiants uniques attendue"}), 400)
+        unknown = [member_id for member_id in member_ids if member_id not in RESPONSE_STORE]
+        if unknown:
+            return None, (jsonify({"success": False, "error": "Membres inconnus", "member_ids": unknown[:50]}), 404)
+        if not MIN_TEAM_SIZE <= len(member_ids) <= MAX_TEAM_SIZE:
+            return None, team_size_error()
+        return (member_ids, store_member_scores(RESPONSE_STORE, member_ids, layout)), None
+    
+    if not isinstance(members, list):
+        return None, (jsonify({"success": False, "error": "Liste 'members' ou 'member_ids' attendue"}), 400)
+    if not MIN_TEAM_SIZE <= len(members) <= MAX_TEAM_SIZE:
+        return None, team_size_error()
+    
+    seen = set()
+    for index, member in enumerate(members):
+        member_id = str(member.get('id', '')) if isinstance(member, dict) else ''
+        if not SAFE_RESPONDENT_ID.match(member_id) or member_id in seen:
+            return None, (jsonify({"success": False, "error": "Identifiant invalide ou en double", "index": index}), 400)
+        errors = validate_scores(member.get('scores'), layout)
+        if errors:
+            return None, (jsonify({"success": False, "error": "Scores invalides", "index": index, "errors": errors}), 400)
+        seen.add(member_id)
+    return member_scores_from_dicts(members, layout.axis_names), None
+
+def team_size_error():
+    return jsonify({
+        "success": False,
+        "error": f"Une équipe compte de {MIN_TEAM_SIZE} à {MAX_TEAM_SIZE} membres"
+    }), 400
+
+@app.route('/api/team-profile', methods=['POST'])
+def team_profile():
+    data, error = request_object()
+    if error is not None:
+        return error
+    
+    layout, error = request_layout()
+    
+    if error is not None:
+        return error
+    
+    team, error = team_members(data, layout)
+    if error is not None:
+        return error
+    member_ids, member_scores = team
+    
+    variant = request.args.get('size', DEFAULT_VARIANT)
+    if variant not in IMAGE_VARIANTS:
+        return jsonify({"success": False, "error": f"Taille inconnue (attendu : {', '.join(IMAGE_VARIANTS)})"}), 400
+    
+    fmt = chart_format()
+    image_format = fmt or 'png'
+    with_chart = fmt is not None or request.args.get('chart', '1') != '0'
+    
+    # Le profil vaut pour toute configuration d'axes ; le radar n'en trace que 8
+    if with_chart and len(layout.axis_names) != len(COMPILED_AXES.axis_names):
         return jsonify({
-            "success": True,
-            "image": img_str
-        })
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 400
+            "success": False,
+            "error": "Radar indisponible pour cette configuration d'axes (utiliser ?chart=0)",
+            "code": "unsupported_axes",
+            "axes": list(layout.axis_names)
+        }), 400
+    key = team_hash(member_ids, member_scores, layout.axis_names, namespace=f"{variant}.{image_format}:")
+    
+    if fmt is not None and request.if_none_match.contains_weak(key):
+        response = app.response_class(status=304)
+        response.set_etag(key)
+        response.vary.add('Accept')
+        return response
+    
+    # Les agrégats coûtent quelques microsecondes ; seul le rendu passe par le cache et la coalescence
+    if with_chart:
+        def render():
+            error = rate_limited(RENDER_LIMITER, 'render')
+            if error is not None:
+                raise RenderRefused(error)
+            profile = group_profile(member_scores)
+            with RENDER_GATE.admit() as admitted:
+                if not admitted:
+                    raise RenderRefused(overloaded())
+                image = render_team_image(layout.axis_names, member_scores, profile, TEAM_STYLE,
+                                          variant, image_format)
+            rendered = {
+                "profile": profile_to_dict(profile, layout.axis_names),
+                "image": base64.b64encode(image).decode()
+            }
+            TEAM_CACHE.set(key, rendered)
+            return rendered
+        
+        try:
+            cached, cache_status = cached_render(TEAM_CACHE, key, render)
+        except RenderRefused as refused:
+            return refused.response
+    else:
+        cached = {"profile": profile_to_dict(group_profile(member_scores), layout.axis_names), "image": None}
+        cache_status = "MISS"
+    
+    if fmt is not None:
+        response = send_file(io.BytesIO(base64.b64decode(cached["image"])), mimetype=IMAGE_FORMATS[fmt],
+                             download_name=f'nyota-equipe-{variant}.{fmt}', etag=key)
+        response.vary.add('Accept')
+        response.headers["X-Cache"] = cache_status
+        return response
+    
+    payload = {
+        "success": True,
+        "team_hash": key,
+        "members": len(member_ids),
+        "profile": cached["profile"]
+    }
+    if with_chart:
+        payload.update({"image": cached["image"], "size": variant, "format": image_format})
+    response = jsonify(payload)
+    response.headers["X-Cache"] = cache_status
+    return response
+
+@app.route('/api/report-html', methods=['POST'])
+def report_html():
+    from diag import generate_html_report
+    
+    data, error = request_object()
+    if error is not None:
+        return error
+    
+    scores = data.get('scores')
+    layout, error = report_layout()
+    
+    if error is not None:
+        return error
+    
+    errors = validate_scores(scores, layout)
+    
+    if errors:
+        return jsonify({"success": False, "error": "Scores invalides", "errors": errors}), 400
+    
+    # Compressé par init_compression ; les rapports identiques réutilisent le corps déjà compressé
+    return app.response_class(generate_html_report(scores), mimetype='text/html')
+
+def catalogue_response(catalogue, cache_control):
+    response = jsonify(catalogue)
+    response.set_etag(catalogue["version"])
+    response.headers["Cache-Control"] = cache_control
+    response.headers["X-Catalogue-Version"] = catalogue["version"]
+    return response.make_conditional(request)
+
+@app.route('/api/catalogue', methods=['GET'])
+def current_catalogue():
+    # Revalidation à chaque chargement : 304 tant que la version (du tenant) ne change pas
+    catalogue, error = request_catalogue()
+    if error is not None:
+        return error
+    response = catalogue_response(catalogue, "no-cache")
+    response.vary.add('X-Tenant')
+    return response
+
+@app.route('/api/catalogue/<version>', methods=['GET'])
+def versioned_catalogue(version):
+    catalogue = get_catalogue(version)
+    
+    if catalogue is None:
+        return jsonify({"success": False, "error": "Version de catalogue inconnue"}), 404
+    
+    return catalogue_response(catalogue, "public, max-age=31536000, immutable")
+
+@app.route('/api/reports', methods=['POST'])
+def create_report_job():
+    data, error = request_object()
+    if error is not None:
+        return error
+    
+    scores = data.get('scores')
+    layout, error = report_layout()
+    
+    if error is not None:
+        return error
+    
+    errors = validate_scores(scores, layout)
+    
+    if errors:
+        return jsonify({"success": False, "error": "Scores invalides", "errors": errors}), 400
+    
+    error = rate_limited(REPORTS_LIMITER, 'reports')
+    if error is not None:
+        return error
+    
+    REPORT_WORKERS.start()
+    job = REPORT_JOBS.submit(scores)
+    
+    response = jsonify(job_payload(job))
+    response.status_code = 200 if job["status"] == DONE else 202
+    response.headers["Location"] = f"/api/reports/{job['id']}"
+    return response
+
+@app.route('/api/reports/<job_id>', methods=['GET'])
+def report_job_status(job_id):
+    wait = min(request.args.get('wait', 0, type=float), MAX_LONG_POLL)
+    job = REPORT_JOBS.wait(job_id, wait) if wait > 0 else REPORT_JOBS.get(job_id)
+    
+    if job is None:
+        return jsonify({"success": False, "error": "Tâche inconnue"}), 404
+    
+    return jsonify(job_payload(job))
+
+@app.route('/api/reports/<job_id>/<artifact>', methods=['GET'])
+def report_job_artifact(job_id, artifact):
+    job = REPORT_JOBS.get(job_id)
+    
+    if job is None or artifact not in ARTIFACTS:
+        return jsonify({"success": False, "error": "Artefact inconnu"}), 404
+    if job["status"] != DONE:
+        return jsonify({"success": False, "error": f"Rapport non disponible ({job['status']})"}), 409
+    
+    filename, mimetype = ARTIFACTS[artifact]
+    path = os.path.join(os.path.abspath(REPORT_JOBS.job_dir(job_id)), filename)
+    variant = precompressed_variant(path, request.headers.get('Accept-Encoding', ''))
+    
+    if variant is None:
+        return send_file(path, mimetype=mimetype, download_name=filename, max_age=3600)
+    
+    variant_path, encoding = variant
+    response = send_file(variant_path, mimetype=mimetype, download_name=filename, max_age=3600)
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+@app.route('/api/cohort-export', methods=['POST'])
+def cohort_export():
+    data, error = request_object()
+    if error is not None:
+        return error
+    
+    fmt = data.get('format', 'zip')
+    respondents = data.get('respondents')
+    
+    if fmt not in ARCHIVE_FORMATS:
+        return jsonify({"success": False, "error": f"Format inconnu (attendu : {', '.join(ARCHIVE_FORMATS)})"}), 400
+    if not isinstance(respondents, list) or not respondents:
+        return jsonify({"success": False, "error": "Liste 'respondents' attendue"}), 400
+    
+    layout, error = report_layout()
+    if error is not None:
+        return error
+    
+    # Tout est validé avant le premier octet : une fois le flux commencé, le statut ne peut plus changer
+    records = []
+    seen = set()
+    for index, respondent in enumerate(respondents):
+        respondent_id = str(respondent.get('id', '')) if isinstance(respondent, dict) else ''
+        if not SAFE_RESPONDENT_ID.match(respondent_id) or respondent_id in seen:
+            return jsonify({"success": False, "error": "Identifiant invalide ou en double", "index": index}), 400
+        errors = validate_scores(respondent.get('scores'), layout)
+        if errors:
+            return jsonify({"success": False, "error": "Scores invalides", "index": index, "errors": errors}), 400
+        seen.add(respondent_id)
+        records.append((respondent_id, respondent['scores']))
+    
+    error = rate_limited(EXPORT_LIMITER, 'export')
+    if error is not None:
+        return error
+    if not RENDER_GATE.try_enter():
+        return overloaded()
+    
+    # La place de rendu est rendue à la fin du flux (ou à la déconnexion du client)
+    response = app.response_class(RENDER_GATE.hold(stream_cohort_bundle(records, fmt, EXPORT_WORKERS)),
+                                  mimetype=ARCHIVE_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="nyota-cohorte.{fmt}"'
+    return response
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify({
+        "calculate": CALCULATE_CACHE.stats(),
+        "chart": CHART_CACHE.stats(),
+        "team": TEAM_CACHE.stats(),
+        "render_admission": RENDER_GATE.stats(),
+        "render_flights": RENDER_FLIGHTS.stats()
+    })
 
 @app.route('/health', methods=['GET'])
 def health_check():
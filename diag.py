@@ -6,59 +6,15 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import webbrowser
+from nyota_render import KIVIAT_STYLE, draw_radar, render_radar_png
 
 
 # ============================================
 # CONFIGURATION DES 8 AXES NYOTA
 # ============================================
 
-AXES_CONFIG = {
-    "Ouverture & Curiosité": {
-        "bloc1": list(range(1, 7)),
-        "bloc2": [14],
-        "bloc3": [3, 6],
-        "invert": []
-    },
-    
-    "Discipline & Fiabilité": {
-        "bloc1": list(range(7, 13)),
-        "bloc3": [7, 11, 12],
-        "invert": []
-    },
-    
-    "Influence & Présence": {
-        "bloc1": list(range(13, 19)),
-        "bloc2": [15],
-        "invert": []
-    },
-    
-    "Coopération": {
-        "bloc1": list(range(19, 25)),
-        "bloc2": [16],
-        "invert": []
-    },
-    
-    "Résilience & Stress": {
-        "bloc1": list(range(25, 31)),
-        "bloc2": list(range(1, 9)),
-        "invert": [("bloc2", q) for q in range(1, 9)]
-    },
-    
-    "Drive & Motivation": {
-        "bloc2": [9, 10, 11, 12, 13, 15, 16],
-        "invert": []
-    },
-    
-    "Style d'action": {
-        "bloc3": list(range(1, 13)),
-        "invert": []
-    },
-    
-    "Alignement stratégique": {
-        "bloc4": list(range(1, 15)),
-        "invert": []
-    }
-}
+# Source unique : nyota_calculator (les déploiements multi-clients passent par nyota_tenants)
+from nyota_calculator import AXES_CONFIG
 
 
 # ============================================
@@ -156,28 +112,185 @@ def compute_all_scores(json_responses: Dict[int, int]) -> Dict[str, float]:
 # GÉNÉRATION DU RAPPORT ÉCRIT (CONSOLE/TXT)
 # ============================================
 
-def generate_written_report(scores: Dict[str, float]) -> str:
-    """
-    Génère un rapport écrit complet avec points forts, points faibles et recommandations
-    """
-    
-    # Trier les scores
-    sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-    top_3 = sorted_scores[:3]
-    bottom_3 = sorted_scores[-3:]
+# Paragraphes par axe, repérés par mot-clé dans le nom de l'axe (premier mot-clé trouvé)
+STRENGTH_LINES = [
+    ("Ouverture", [
+        "   → Vous excellez dans l'exploration intellectuelle et l'innovation.",
+        "   → Capacité à remettre en question les méthodes établies.",
+        "   → Curiosité naturelle et goût pour l'apprentissage continu."
+    ]),
+    ("Discipline", [
+        "   → Excellente rigueur et organisation dans le travail.",
+        "   → Fiabilité exemplaire dans le respect des engagements.",
+        "   → Attention aux détails et méthodologie structurée."
+    ]),
+    ("Influence", [
+        "   → Grande aisance relationnelle et capacité à convaincre.",
+        "   → Présence naturelle dans les interactions de groupe.",
+        "   → Leadership assertif et visibilité sociale marquée."
+    ]),
+    ("Coopération", [
+        "   → Intelligence relationnelle développée et empathie naturelle.",
+        "   → Facilité à collaborer et à créer du consensus.",
+        "   → Approche gagnant-gagnant dans les interactions."
+    ]),
+    ("Résilience", [
+        "   → Excellente stabilité émotionnelle sous pression.",
+        "   → Capacité à maintenir son calme dans l'adversité.",
+        "   → Récupération rapide après les échecs."
+    ]),
+    ("Drive", [
+        "   → Motivation intrinsèque puissante et ambition affirmée.",
+        "   → Besoin fort de défis et de reconnaissance.",
+        "   → Engagement élevé dans les projets porteurs de sens."
+    ]),
+    ("Style", [
+        "   → Approche de l'action adaptée et efficace.",
+        "   → Bon équilibre entre initiative et cadre structuré.",
+        "   → Capacité à ajuster son rythme selon le contexte."
+    ]),
+    ("Alignement", [
+        "   → Vision stratégique claire et cohérence décisionnelle.",
+        "   → Excellente projection dans le futur.",
+        "   → Alignement fort entre actions présentes et objectifs futurs."
+    ])
+]
+
+DEVELOPMENT_LINES = [
+    ("Ouverture", [
+        "   → Développer la curiosité intellectuelle et l'ouverture au changement.",
+        "   💡 Actions : Lire régulièrement, suivre des formations, s'exposer à de nouvelles idées."
+    ]),
+    ("Discipline", [
+        "   → Renforcer la rigueur et la méthodologie de travail.",
+        "   💡 Actions : Utiliser des outils de gestion du temps, établir des routines claires."
+    ]),
+    ("Influence", [
+        "   → Développer l'aisance relationnelle et la prise de parole.",
+        "   💡 Actions : Participer à des clubs de parole, s'entraîner aux présentations publiques."
+    ]),
+    ("Coopération", [
+        "   → Travailler l'empathie et la capacité à collaborer.",
+        "   💡 Actions : Pratiquer l'écoute active, rechercher activement les feedbacks."
+    ]),
+    ("Résilience", [
+        "   → Renforcer la gestion du stress et la stabilité émotionnelle.",
+        "   💡 Actions : Techniques de relaxation, sport régulier, accompagnement si besoin."
+    ]),
+    ("Drive", [
+        "   → Clarifier ses sources de motivation et d'engagement.",
+        "   💡 Actions : Identifier ses valeurs profondes, fixer des objectifs alignés."
+    ]),
+    ("Style", [
+        "   → Ajuster son rapport au cadre et à l'autonomie.",
+        "   💡 Actions : Expérimenter différents modes de travail, demander du feedback."
+    ]),
+    ("Alignement", [
+        "   → Développer une vision stratégique plus claire.",
+        "   💡 Actions : Coaching de carrière, exercices de projection à 3-5 ans."
+    ])
+]
+
+# (axes requis dans le top 3, seuils minimaux de score, lignes ajoutées)
+RECOMMENDATION_RULES = [
+    (("Ouverture & Curiosité", "Discipline & Fiabilité"), {}, [
+        "• CHEF DE PROJET INNOVATION / R&D MANAGER",
+        "  Combinez curiosité intellectuelle et rigueur d'exécution."
+    ]),
+    (("Influence & Présence",), {"Coopération": 60}, [
+        "\n• RESPONSABLE COMMERCIAL / BUSINESS DEVELOPER",
+        "  Votre aisance relationnelle et capacité à convaincre sont des atouts majeurs."
+    ]),
+    (("Drive & Motivation", "Alignement stratégique"), {}, [
+        "\n• ENTREPRENEUR / INTRAPRENEUR",
+        "  Votre vision claire et motivation intrinsèque favorisent l'entrepreneuriat."
+    ]),
+    (("Coopération", "Résilience & Stress"), {}, [
+        "\n• RESPONSABLE RH / PEOPLE MANAGER",
+        "  Intelligence relationnelle et stabilité émotionnelle idéales pour gérer des équipes."
+    ]),
+    (("Discipline & Fiabilité",), {"Alignement stratégique": 65}, [
+        "\n• CHEF DE PROJET / PROJECT MANAGER",
+        "  Rigueur, organisation et vision permettent de piloter des projets complexes."
+    ]),
+    (("Ouverture & Curiosité", "Influence & Présence"), {}, [
+        "\n• CONSULTANT / COACH",
+        "  Capacité à explorer, innover et influencer positivement les autres."
+    ]),
+    ((), {"Drive & Motivation": 70, "Style d'action": 65}, [
+        "\n• DIRECTEUR OPÉRATIONNEL / COO",
+        "  Motivation élevée et style d'action adapté pour diriger les opérations."
+    ])
+]
+
+GENERIC_RECOMMENDATIONS_HIGH = [
+    "• POSTES À EXPLORER :",
+    "  Rôles nécessitant polyvalence et adaptabilité.",
+    "  Postes en développement de compétences transversales."
+]
+
+GENERIC_RECOMMENDATIONS_LOW = [
+    "• POSTES À EXPLORER :",
+    "  Postes d'apprentissage en environnement structuré.",
+    "  Missions avec accompagnement et mentorat."
+]
+
+REPORT_HEADER = "\n".join([
+    "\n" + "="*80,
+    "                    RAPPORT D'ANALYSE NYOTA PERSONALITY",
+    "="*80 + "\n",
+    "📊 SYNTHÈSE GLOBALE",
+    "-" * 80
+])
+
+REPORT_FOOTER = "\n".join([
+    "\n💼 CONSEILS POUR VALORISER VOTRE PROFIL",
+    "-" * 80,
+    "1. 🎯 Mettez en avant vos 3 points forts dans vos candidatures et entretiens",
+    "2. 📚 Travaillez activement vos axes de développement (formations, coaching)",
+    "3. 🏢 Recherchez des environnements alignés avec votre profil naturel",
+    "4. 🔄 Demandez régulièrement du feedback pour progresser continuellement",
+    "5. 💎 Restez authentique : votre profil unique est votre plus grande force",
+    "\n" + "="*80,
+    "                           FIN DU RAPPORT",
+    "="*80 + "\n"
+])
+
+
+def axis_paragraph(axis: str, paragraphs: list) -> str:
+    """Bloc de lignes du premier mot-clé contenu dans le nom de l'axe ("" si aucun)"""
+    for keyword, lines in paragraphs:
+        if keyword in axis:
+            return "\n".join(lines)
+    return ""
+
+
+def average_score(values) -> float:
+    return sum(values) / len(values)
+
+
+def matching_recommendations(top_axes, scores: Dict[str, float], avg_score: float) -> List[str]:
+    recommendations = []
     
-    report = []
+    for required_axes, thresholds, lines in RECOMMENDATION_RULES:
+        if all(axis in top_axes for axis in required_axes) and \
+                all(scores[axis] >= minimum for axis, minimum in thresholds.items()):
+            recommendations.extend(lines)
     
-    # ===== EN-TÊTE =====
-    report.append("\n" + "="*80)
-    report.append("                    RAPPORT D'ANALYSE NYOTA PERSONALITY")
-    report.append("="*80 + "\n")
+    # Postes génériques si aucune correspondance
+    if not recommendations:
+        return GENERIC_RECOMMENDATIONS_HIGH if avg_score >= 60 else GENERIC_RECOMMENDATIONS_LOW
     
-    # ===== SYNTHÈSE GLOBALE =====
-    avg_score = sum(scores.values()) / len(scores)
-    report.append("📊 SYNTHÈSE GLOBALE")
-    report.append("-" * 80)
-    report.append(f"Score moyen général : {avg_score:.1f}/100")
+    return recommendations
+
+
+def render_written_report(avg_score: float, top_3, bottom_3, recommendations: List[str],
+                          strength_blocks: Dict[str, str], development_blocks: Dict[str, str]) -> str:
+    """
+    Assemble le rapport texte à partir de blocs déjà préparés.
+    Partagé par generate_written_report et la génération par cohorte (nyota_cohort_reports).
+    """
+    report = [REPORT_HEADER, f"Score moyen général : {avg_score:.1f}/100"]
     
     if avg_score >= 70:
         report.append("✅ Profil équilibré avec des aptitudes marquées dans plusieurs domaines.")
@@ -194,47 +307,8 @@ def generate_written_report(scores: Dict[str, float]) -> str:
     
     for i, (axis, score) in enumerate(top_3, 1):
         report.append(f"\n{i}. {axis.upper()} - Score: {score:.1f}/100")
-        
-        # Descriptions personnalisées par axe
-        if "Ouverture" in axis:
-            report.append("   → Vous excellez dans l'exploration intellectuelle et l'innovation.")
-            report.append("   → Capacité à remettre en question les méthodes établies.")
-            report.append("   → Curiosité naturelle et goût pour l'apprentissage continu.")
-            
-        elif "Discipline" in axis:
-            report.append("   → Excellente rigueur et organisation dans le travail.")
-            report.append("   → Fiabilité exemplaire dans le respect des engagements.")
-            report.append("   → Attention aux détails et méthodologie structurée.")
-            
-        elif "Influence" in axis:
-            report.append("   → Grande aisance relationnelle et capacité à convaincre.")
-            report.append("   → Présence naturelle dans les interactions de groupe.")
-            report.append("   → Leadership assertif et visibilité sociale marquée.")
-            
-        elif "Coopération" in axis:
-            report.append("   → Intelligence relationnelle développée et empathie naturelle.")
-            report.append("   → Facilité à collaborer et à créer du consensus.")
-            report.append("   → Approche gagnant-gagnant dans les interactions.")
-            
-        elif "Résilience" in axis:
-            report.append("   → Excellente stabilité émotionnelle sous pression.")
-            report.append("   → Capacité à maintenir son calme dans l'adversité.")
-            report.append("   → Récupération rapide après les échecs.")
-            
-        elif "Drive" in axis:
-            report.append("   → Motivation intrinsèque puissante et ambition affirmée.")
-            report.append("   → Besoin fort de défis et de reconnaissance.")
-            report.append("   → Engagement élevé dans les projets porteurs de sens.")
-            
-        elif "Style" in axis:
-            report.append("   → Approche de l'action adaptée et efficace.")
-            report.append("   → Bon équilibre entre initiative et cadre structuré.")
-            report.append("   → Capacité à ajuster son rythme selon le contexte.")
-            
-        elif "Alignement" in axis:
-            report.append("   → Vision stratégique claire et cohérence décisionnelle.")
-            report.append("   → Excellente projection dans le futur.")
-            report.append("   → Alignement fort entre actions présentes et objectifs futurs.")
+        if strength_blocks[axis]:
+            report.append(strength_blocks[axis])
     
     report.append("")
     
@@ -244,106 +318,43 @@ def generate_written_report(scores: Dict[str, float]) -> str:
     
     for i, (axis, score) in enumerate(bottom_3, 1):
         report.append(f"\n{i}. {axis.upper()} - Score: {score:.1f}/100")
-        
-        if "Ouverture" in axis:
-            report.append("   → Développer la curiosité intellectuelle et l'ouverture au changement.")
-            report.append("   💡 Actions : Lire régulièrement, suivre des formations, s'exposer à de nouvelles idées.")
-            
-        elif "Discipline" in axis:
-            report.append("   → Renforcer la rigueur et la méthodologie de travail.")
-            report.append("   💡 Actions : Utiliser des outils de gestion du temps, établir des routines claires.")
-            
-        elif "Influence" in axis:
-            report.append("   → Développer l'aisance relationnelle et la prise de parole.")
-            report.append("   💡 Actions : Participer à des clubs de parole, s'entraîner aux présentations publiques.")
-            
-        elif "Coopération" in axis:
-            report.append("   → Travailler l'empathie et la capacité à collaborer.")
-            report.append("   💡 Actions : Pratiquer l'écoute active, rechercher activement les feedbacks.")
-            
-        elif "Résilience" in axis:
-            report.append("   → Renforcer la gestion du stress et la stabilité émotionnelle.")
-            report.append("   💡 Actions : Techniques de relaxation, sport régulier, accompagnement si besoin.")
-            
-        elif "Drive" in axis:
-            report.append("   → Clarifier ses sources de motivation et d'engagement.")
-            report.append("   💡 Actions : Identifier ses valeurs profondes, fixer des objectifs alignés.")
-            
-        elif "Style" in axis:
-            report.append("   → Ajuster son rapport au cadre et à l'autonomie.")
-            report.append("   💡 Actions : Expérimenter différents modes de travail, demander du feedback.")
-            
-        elif "Alignement" in axis:
-            report.append("   → Développer une vision stratégique plus claire.")
-            report.append("   💡 Actions : Coaching de carrière, exercices de projection à 3-5 ans.")
+        if development_blocks[axis]:
+            report.append(development_blocks[axis])
     
     report.append("")
     
     # ===== RECOMMANDATIONS DE POSTES =====
     report.append("🎯 RECOMMANDATIONS DE POSTES / RÔLES ADAPTÉS")
     report.append("-" * 80)
-    
-    # Logique de recommandation basée sur le profil
-    recommendations = []
-    top_axes = [axis for axis, _ in top_3]
-    
-    if "Ouverture & Curiosité" in top_axes and "Discipline & Fiabilité" in top_axes:
-        recommendations.append("• CHEF DE PROJET INNOVATION / R&D MANAGER")
-        recommendations.append("  Combinez curiosité intellectuelle et rigueur d'exécution.")
-        
-    if "Influence & Présence" in top_axes and scores["Coopération"] >= 60:
-        recommendations.append("\n• RESPONSABLE COMMERCIAL / BUSINESS DEVELOPER")
-        recommendations.append("  Votre aisance relationnelle et capacité à convaincre sont des atouts majeurs.")
-        
-    if "Drive & Motivation" in top_axes and "Alignement stratégique" in top_axes:
-        recommendations.append("\n• ENTREPRENEUR / INTRAPRENEUR")
-        recommendations.append("  Votre vision claire et motivation intrinsèque favorisent l'entrepreneuriat.")
-        
-    if "Coopération" in top_axes and "Résilience & Stress" in top_axes:
-        recommendations.append("\n• RESPONSABLE RH / PEOPLE MANAGER")
-        recommendations.append("  Intelligence relationnelle et stabilité émotionnelle idéales pour gérer des équipes.")
-        
-    if "Discipline & Fiabilité" in top_axes and scores["Alignement stratégique"] >= 65:
-        recommendations.append("\n• CHEF DE PROJET / PROJECT MANAGER")
-        recommendations.append("  Rigueur, organisation et vision permettent de piloter des projets complexes.")
-        
-    if "Ouverture & Curiosité" in top_axes and "Influence & Présence" in top_axes:
-        recommendations.append("\n• CONSULTANT / COACH")
-        recommendations.append("  Capacité à explorer, innover et influencer positivement les autres.")
-        
-    if scores["Drive & Motivation"] >= 70 and scores["Style d'action"] >= 65:
-        recommendations.append("\n• DIRECTEUR OPÉRATIONNEL / COO")
-        recommendations.append("  Motivation élevée et style d'action adapté pour diriger les opérations.")
-    
-    # Postes génériques si aucune correspondance
-    if not recommendations:
-        recommendations.append("• POSTES À EXPLORER :")
-        if avg_score >= 60:
-            recommendations.append("  Rôles nécessitant polyvalence et adaptabilité.")
-            recommendations.append("  Postes en développement de compétences transversales.")
-        else:
-            recommendations.append("  Postes d'apprentissage en environnement structuré.")
-            recommendations.append("  Missions avec accompagnement et mentorat.")
-    
     report.extend(recommendations)
     report.append("")
     
-    # ===== CONSEILS GÉNÉRAUX =====
-    report.append("\n💼 CONSEILS POUR VALORISER VOTRE PROFIL")
-    report.append("-" * 80)
-    report.append("1. 🎯 Mettez en avant vos 3 points forts dans vos candidatures et entretiens")
-    report.append("2. 📚 Travaillez activement vos axes de développement (formations, coaching)")
-    report.append("3. 🏢 Recherchez des environnements alignés avec votre profil naturel")
-    report.append("4. 🔄 Demandez régulièrement du feedback pour progresser continuellement")
-    report.append("5. 💎 Restez authentique : votre profil unique est votre plus grande force")
-    
-    report.append("\n" + "="*80)
-    report.append("                           FIN DU RAPPORT")
-    report.append("="*80 + "\n")
+    report.append(REPORT_FOOTER)
     
     return "\n".join(report)
 
 
+def generate_written_report(scores: Dict[str, float]) -> str:
+    """
+    Génère un rapport écrit complet avec points forts, points faibles et recommandations
+    """
+    
+    # Trier les scores
+    sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    top_3 = sorted_scores[:3]
+    bottom_3 = sorted_scores[-3:]
+    
+    avg_score = average_score(list(scores.values()))
+    top_axes = [axis for axis, _ in top_3]
+    
+    return render_written_report(
+        avg_score, top_3, bottom_3,
+        matching_recommendations(top_axes, scores, avg_score),
+        {axis: axis_paragraph(axis, STRENGTH_LINES) for axis, _ in top_3},
+        {axis: axis_paragraph(axis, DEVELOPMENT_LINES) for axis, _ in bottom_3}
+    )
+
+
 # ============================================
 # GÉNÉRATION DU RAPPORT ÉCRIT EN HTML
 # ============================================
@@ -837,46 +848,33 @@ def generate_html_report(scores: Dict[str, float]) -> str:
 # VISUALISATION KIVIAT (MATPLOTLIB)
 # ============================================
 
-def plot_kiviat(scores: Dict[str, float], save_path: str = None):
+def plot_kiviat(scores: Dict[str, float], save_path: str = None, show: bool = True):
     """Génère le diagramme radar à 8 axes avec matplotlib"""
     
     if len(scores) != 8:
         raise ValueError(f"⚠️ Le diagramme nécessite 8 axes, trouvé : {len(scores)}")
     
-    labels = list(scores.keys())
-    values = list(scores.values())
-    
-    num_axes = len(labels)
-    angles = np.linspace(0, 2 * np.pi, num_axes, endpoint=False).tolist()
-    
-    values += values[:1]
-    angles += angles[:1]
-    
-    fig, ax = plt.subplots(figsize=(12, 12), subplot_kw=dict(polar=True))
-    
-    ax.set_theta_offset(np.pi / 2)
-    ax.set_theta_direction(-1)
-    
-    ax.set_xticks(angles[:-1])
-    ax.set_xticklabels(labels, fontsize=12, fontweight='bold', color='#1F2937')
-    
-    ax.set_ylim(0, 100)
-    ax.set_yticks([20, 40, 60, 80, 100])
-    ax.set_yticklabels(['20', '40', '60', '80', '100'], fontsize=10, color='gray')
-    
-    ax.plot(angles, values, 'o-', linewidth=3, color='#0066FF', label='Profil', markersize=8)
-    ax.fill(angles, values, alpha=0.3, color='#0066FF')
-    
-    ax.grid(True, linestyle='--', alpha=0.7, color='#E5E7EB')
-    
-    ax.set_title("NYOTA Personality – Profil à 8 dimensions", 
-                 pad=30, fontsize=18, fontweight='bold', color='#1F2937')
-    
-    plt.tight_layout()
+    if not show:
+        # Figure autonome (nyota_render) : aucun état pyplot, utilisable depuis plusieurs threads
+        if save_path:
+            png = render_radar_png(scores, KIVIAT_STYLE)
+            if isinstance(save_path, str):
+                with open(save_path, "wb") as f:
+                    f.write(png)
+                print(f"✅ Diagramme Kiviat sauvegardé : {save_path}")
+            else:
+                save_path.write(png)
+        return
+    
+    # Affichage interactif : la figure doit être gérée par pyplot pour ouvrir une fenêtre
+    fig = plt.figure(figsize=KIVIAT_STYLE["figsize"])
+    draw_radar(fig, scores, KIVIAT_STYLE)
+    fig.tight_layout()
     
     if save_path:
-        plt.savefig(save_path, dpi=300, bbox_inches='tight', facecolor='white')
-        print(f"✅ Diagramme Kiviat sauvegardé : {save_path}")
+        fig.savefig(save_path, dpi=KIVIAT_STYLE["dpi"], bbox_inches='tight', facecolor='white', format='png')
+        if isinstance(save_path, str):
+            print(f"✅ Diagramme Kiviat sauvegardé : {save_path}")
     
     plt.show()
 
@@ -885,7 +883,8 @@ def plot_kiviat(scores: Dict[str, float], save_path: str = None):
 # DASHBOARD PLOTLY UNIFIÉ AMÉLIORÉ (2x4)
 # ============================================
 
-def create_unified_dashboard(scores: Dict[str, float]):
+def create_unified_dashboard(scores: Dict[str, float], output_path: str = "nyota_dashboard_complet.html",
+                             show: bool = True):
     """
     Crée un dashboard unique avec tous les graphiques en grille 2×4
     VERSION AMÉLIORÉE avec couleurs harmonieuses et tailles optimisées
@@ -1238,10 +1237,11 @@ def create_unified_dashboard(scores: Dict[str, float]):
     )
     
     # Sauvegarder et afficher
-    fig.write_html("nyota_dashboard_complet.html")
-    print("✅ Dashboard sauvegardé : nyota_dashboard_complet.html")
+    fig.write_html(output_path)
+    print(f"✅ Dashboard sauvegardé : {output_path}")
     
-    fig.show()
+    if show:
+        fig.show()
 
 
 # ============================================
@@ -0,0 +1,130 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from nyota_calculator import (
+    COMPILED_AXES,
+    MISSING,
+    PRIOR_VARIANCE,
+    SCORE_SCALE,
+    Z_SCORE,
+    CompiledAxes,
+    axis_moments,
+    axis_variance,
+    compute_scores_matrix
+)
+
+
+# ============================================
+# MODE ADAPTATIF (FORMAT COURT)
+# ============================================
+
+DEFAULT_TOLERANCE = 7.5     # demi-largeur (IC 95 %) visée sur l'échelle 0-100
+MIN_ITEMS_PER_AXIS = 2
+
+
+def _standard_error(variance: np.ndarray, counts: np.ndarray, totals: np.ndarray) -> np.ndarray:
+    """Erreur type de la moyenne d'un axe, avec correction d'échantillon fini (0 quand l'axe est complet)"""
+    safe_counts = np.maximum(counts, 1)
+    correction = np.where(totals > 1, (totals - counts) / np.maximum(totals - 1, 1), 0.0)
+    return SCORE_SCALE * np.sqrt(variance / safe_counts * np.clip(correction, 0.0, 1.0))
+
+
+def axis_uncertainty(vector: np.ndarray, layout: CompiledAxes = COMPILED_AXES) -> Dict[str, np.ndarray]:
+    """
+    Estime, pour chaque axe, l'incertitude du score provisoire à partir des items déjà répondus.
+    La variance observée est lissée vers PRIOR_VARIANCE tant que peu d'items sont connus.
+    """
+    answered = vector != MISSING
+    sums, squares, counts = (moment[0] for moment in axis_moments(vector, layout))
+    variance = axis_variance(sums, squares, counts)
+
+    totals = layout.item_counts.astype(np.float64)
+    standard_error = np.where(counts > 0, _standard_error(variance, counts, totals),
+                              SCORE_SCALE * np.sqrt(PRIOR_VARIANCE))
+
+    return {
+        "answered": answered,
+        "counts": counts,
+        "variance": variance,
+        "standard_error": standard_error
+    }
+
+
+def parse_tolerance(value: Any) -> Tuple[Optional[float], List[Dict[str, Any]]]:
+    """Tolérance demandée et erreurs de validation : un nombre fini strictement positif est attendu"""
+    try:
+        tolerance = float(value) if not isinstance(value, bool) else float("nan")
+    except (TypeError, ValueError, OverflowError):
+        tolerance = float("nan")
+    if not np.isfinite(tolerance) or tolerance <= 0:
+        return None, [{"field": "tolerance", "code": "invalid_tolerance", "value": value}]
+    return tolerance, []
+
+
+def next_item(vector: np.ndarray, tolerance: float = DEFAULT_TOLERANCE,
+              layout: CompiledAxes = COMPILED_AXES) -> Dict[str, Any]:
+    """
+    Choisit l'item non répondu qui réduit le plus l'incertitude des axes non convergés
+    (un item commun à plusieurs axes compte pour chacun). Renvoie next_item=None quand
+    tous les axes sont dans la tolérance.
+    """
+    if not np.isfinite(tolerance) or tolerance <= 0:
+        raise ValueError(f"Tolérance invalide : {tolerance!r} (nombre fini strictement positif attendu)")
+
+    state = axis_uncertainty(vector, layout)
+    counts = state["counts"]
+    totals = layout.item_counts.astype(np.float64)
+    half_width = Z_SCORE * state["standard_error"]
+
+    pending = ((half_width > tolerance) | (counts < np.minimum(MIN_ITEMS_PER_AXIS, totals))) & (counts < totals)
+
+    after = _standard_error(state["variance"], counts + 1, totals)
+    gain = np.where(pending, state["standard_error"] - after, 0.0)
+    # Un axe pas encore commencé passe en priorité
+    gain = np.where(pending & (counts == 0), gain + SCORE_SCALE, gain)
+
+    item_gain = layout.weights @ gain
+    item_gain[state["answered"]] = -1.0
+    column = int(np.argmax(item_gain))
+
+    return {
+        "next_item": column + 1 if item_gain[column] > 0 else None,
+        "pending_axes": [axis for axis, p in zip(layout.axis_names, pending) if p],
+        "half_width": half_width,
+        "counts": counts
+    }
+
+
+def adaptive_step(vector: np.ndarray, tolerance: float = DEFAULT_TOLERANCE,
+                  layout: CompiledAxes = COMPILED_AXES) -> Dict[str, Any]:
+    """Étape complète du mode adaptatif : scores provisoires, intervalles et prochaine question"""
+    selection = next_item(vector, tolerance, layout)
+    scores = compute_scores_matrix(vector, layout)[0]
+
+    return {
+        "done": selection["next_item"] is None,
+        "next_item": selection["next_item"],
+        "answered": int(np.count_nonzero(vector != MISSING)),
+        "pending_axes": selection["pending_axes"],
+        "scores": {axis: float(score) for axis, score in zip(layout.axis_names, scores)},
+        "confidence": {
+            axis: round(float(width), 2)
+            for axis, width in zip(layout.axis_names, selection["half_width"])
+        }
+    }
+
+
+def simulate_short_form(full_vector: np.ndarray, tolerance: float = DEFAULT_TOLERANCE,
+                        layout: CompiledAxes = COMPILED_AXES, max_steps: Optional[int] = None) -> np.ndarray:
+    """Rejoue un questionnaire complet en mode adaptatif ; renvoie les réponses effectivement posées"""
+    vector = np.full_like(full_vector, MISSING)
+    steps = max_steps or len(full_vector)
+
+    for _ in range(steps):
+        item = next_item(vector, tolerance, layout)["next_item"]
+        if item is None:
+            break
+        vector[item - 1] = full_vector[item - 1]
+
+    return vector
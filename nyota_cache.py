@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+
+def vector_hash(vector: np.ndarray, namespace: str = "") -> str:
+    """Empreinte canonique d'un vecteur de réponses (72 colonnes uint8)"""
+    digest = hashlib.sha256(namespace.encode("utf-8"))
+    digest.update(np.ascontiguousarray(vector, dtype=np.uint8).tobytes())
+    return digest.hexdigest()
+
+
+def scores_hash(scores: Dict[str, float], namespace: str = "") -> str:
+    """Empreinte canonique d'un dictionnaire de scores (ordre des axes conservé, 2 décimales)"""
+    canonical = json.dumps([[axis, round(float(value), 2)] for axis, value in scores.items()],
+                           ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(f"{namespace}{canonical}".encode("utf-8")).hexdigest()
+
+
+def team_hash(member_ids: Sequence[str], member_scores: np.ndarray, axis_names: Sequence[str],
+              namespace: str = "") -> str:
+    """
+    Empreinte d'une composition d'équipe : membres triés par identifiant (l'ordre d'envoi
+    n'importe pas), avec leurs scores arrondis à 2 décimales (None pour un axe non couvert)
+    """
+    members = sorted(
+        [member_id, [None if np.isnan(value) else round(float(value), 2) for value in row]]
+        for member_id, row in zip(member_ids, np.asarray(member_scores, dtype=np.float64))
+    )
+    canonical = json.dumps([list(axis_names), members], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(f"{namespace}{canonical}".encode("utf-8")).hexdigest()
+
+
+class FileCacheBackend:
+    """
+    Cache partagé sur disque local (un fichier JSON par clé), en remplacement d'un cache réseau.
+    Avec max_entries, les entrées les plus anciennement écrites sont supprimées au-delà de la borne ;
+    l'élagage a lieu toutes les max_entries / 20 écritures de chaque processus pour ne pas relister
+    le répertoire à chaque écriture.
+    """
+
+    def __init__(self, directory: str, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._writes = 0
+        self._prune_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str, tag: str = "") -> str:
+        # L'étiquette (ex. disposition de scoring) préfixe le nom : invalidation sélective par préfixe
+        return os.path.join(self.directory, f"{tag}.{key}.json" if tag else f"{key}.json")
+
+    def get(self, key: str, tag: str = "") -> Optional[Any]:
+        path = self._path(key, tag)
+        try:
+            if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key: str, value: Any, tag: str = "") -> None:
+        path = self._path(key, tag)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+        if self.max_entries is not None:
+            with self._prune_lock:
+                self._writes += 1
+                due = self._writes >= max(1, self.max_entries // 20)
+                if due:
+                    self._writes = 0
+            if due:
+                self.prune()
+
+    def prune(self) -> int:
+        """Supprime les entrées les plus anciennes (date d'écriture) au-delà de max_entries"""
+        if self.max_entries is None:
+            return 0
+
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(".json"):
+                    try:
+                        entries.append((entry.stat().st_mtime_ns, entry.path))
+                    except OSError:
+                        pass
+
+        removed = 0
+        entries.sort()
+        for _, path in entries[:max(len(entries) - self.max_entries, 0)]:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        with self._prune_lock:
+            self.evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                os.remove(os.path.join(self.directory, name))
+
+    def invalidate(self, tag: str) -> int:
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name.startswith(f"{tag}.") and name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+class LRUCache:
+    """Cache LRU borné, thread-safe, avec TTL optionnel et backend partagé de second niveau"""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 backend: Optional[FileCacheBackend] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.backend_hits = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str, tag: str = "") -> Optional[Any]:
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value, _ = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        if self.backend is not None:
+            value = self.backend.get(key, tag)
+            if value is not None:
+                self._store(key, value, tag)
+                with self._lock:
+                    self.hits += 1
+                    self.backend_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any, tag: str = "") -> None:
+        self._store(key, value, tag)
+        if self.backend is not None:
+            self.backend.set(key, value, tag)
+
+    def _store(self, key: str, value: Any, tag: str = "") -> None:
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            self._entries[key] = (expires_at, value, tag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def invalidate(self, tag: str) -> int:
+        """Retire les seules entrées d'une étiquette (ex. disposition retirée), le reste du cache reste chaud"""
+        with self._lock:
+            keys = [key for key, (_, _, entry_tag) in self._entries.items() if entry_tag == tag]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+        if self.backend is not None:
+            self.backend.invalidate(tag)
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "backend_hits": self.backend_hits,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "shared_backend": self.backend.directory if self.backend is not None else None,
+                "backend_evictions": self.backend.evictions if self.backend is not None else 0
+            }
+
+
+def cache_from_env(prefix: str, default_size: int = 1024,
+                   default_ttl: Optional[float] = 3600) -> LRUCache:
+    """
+    Construit un cache configuré par variables d'environnement :
+    {prefix}_SIZE, {prefix}_TTL (secondes, 0 = sans expiration), {prefix}_DIR (backend fichier)
+    et {prefix}_DIR_SIZE (entrées sur disque, défaut : 10 × {prefix}_SIZE, 0 = sans borne).
+    """
+    size = int(os.environ.get(f"{prefix}_SIZE", default_size))
+    ttl = float(os.environ.get(f"{prefix}_TTL", default_ttl or 0)) or None
+    directory = os.environ.get(f"{prefix}_DIR")
+    max_entries = int(os.environ.get(f"{prefix}_DIR_SIZE", 10 * size)) or None
+    backend = FileCacheBackend(directory, ttl, max_entries) if directory else None
+
+    return LRUCache(maxsize=size, ttl=ttl, backend=backend)
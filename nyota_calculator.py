@@ -1,6 +1,6 @@
 import json
 import numpy as np
-from typing import Dict, List
+from typing import Any, Dict, List, NamedTuple, Tuple
 
 AXES_CONFIG = {
     "Ouverture & Curiosité": {
@@ -43,6 +43,77 @@ AXES_CONFIG = {
     }
 }
 
+NUM_ITEMS = 72
+LIKERT_MIN = 1
+LIKERT_MAX = 5
+MISSING = 0
+
+BLOC_RANGES = {
+    "bloc1": (1, 30),
+    "bloc2": (31, 46),
+    "bloc3": (47, 58),
+    "bloc4": (59, 72)
+}
+
+BLOC_NAMES = ["bloc1", "bloc2", "bloc3", "bloc4"]
+
+class CompiledAxes(NamedTuple):
+    """Disposition des axes compilée en masques sur les 72 colonnes de réponses"""
+    axis_names: Tuple[str, ...]
+    membership: np.ndarray
+    weights: np.ndarray
+    invert: np.ndarray
+    item_counts: np.ndarray
+    direct_weights: np.ndarray
+    invert_weights: np.ndarray
+    score_table: np.ndarray
+
+def item_column(bloc_name: str, item_num: int) -> int:
+    """Index de colonne (0-71) d'un item de bloc dans le vecteur de réponses"""
+    return BLOC_RANGES[bloc_name][0] + item_num - 2
+
+def compile_axes(axes_config: dict) -> CompiledAxes:
+    """Compile AXES_CONFIG une fois pour toutes en masques d'appartenance et d'inversion"""
+    axis_names = tuple(axes_config.keys())
+    membership = np.zeros((len(axis_names), NUM_ITEMS), dtype=bool)
+    invert = np.zeros((len(axis_names), NUM_ITEMS), dtype=bool)
+    
+    for row, config in enumerate(axes_config.values()):
+        for bloc_name in BLOC_NAMES:
+            for item_num in config.get(bloc_name, []):
+                membership[row, item_column(bloc_name, item_num)] = True
+        for bloc_name, item_num in config["invert"]:
+            invert[row, item_column(bloc_name, item_num)] = True
+    
+    membership.setflags(write=False)
+    invert.setflags(write=False)
+    item_counts = membership.sum(axis=1)
+    item_counts.setflags(write=False)
+    weights = np.ascontiguousarray(membership.T, dtype=np.float64)
+    weights.setflags(write=False)
+    direct_weights = np.ascontiguousarray((membership & ~invert).T, dtype=np.float64)
+    direct_weights.setflags(write=False)
+    invert_weights = np.ascontiguousarray(invert.T, dtype=np.float64)
+    invert_weights.setflags(write=False)
+    score_table = build_score_table(int(item_counts.max()))
+    
+    return CompiledAxes(axis_names, membership, weights, invert, item_counts,
+                        direct_weights, invert_weights, score_table)
+
+def build_score_table(max_items: int) -> np.ndarray:
+    """
+    Table [nombre d'items répondus, somme des réponses] → score normalisé.
+    Chaque case est calculée avec normalize_to_100 : les arrondis sont identiques au calcul direct.
+    """
+    table = np.zeros((max_items + 1, LIKERT_MAX * max_items + 1), dtype=np.float64)
+    
+    for count in range(1, max_items + 1):
+        for total in range(LIKERT_MIN * count, LIKERT_MAX * count + 1):
+            table[count, total] = normalize_to_100(total / count)
+    
+    table.setflags(write=False)
+    return table
+
 def invert_score(value: int) -> int:
     return 6 - value
 
@@ -57,21 +128,10 @@ def parse_responses(json_data: Dict[int, int]) -> Dict[str, Dict[int, int]]:
         "bloc4": {}
     }
     
-    for i in range(1, 31):
-        if i in json_data:
-            responses["bloc1"][i] = json_data[i]
-    
-    for i in range(31, 47):
-        if i in json_data:
-            responses["bloc2"][i - 30] = json_data[i]
-    
-    for i in range(47, 59):
-        if i in json_data:
-            responses["bloc3"][i - 46] = json_data[i]
-    
-    for i in range(59, 73):
-        if i in json_data:
-            responses["bloc4"][i - 58] = json_data[i]
+    for bloc_name, (first, last) in BLOC_RANGES.items():
+        for i in range(first, last + 1):
+            if i in json_data:
+                responses[bloc_name][i - first + 1] = json_data[i]
     
     return responses
 
@@ -100,6 +160,12 @@ def compute_axis_score(axis_name: str, config: dict, responses: dict) -> float:
     return normalize_to_100(mean_score)
 
 def compute_all_scores(json_responses: Dict[int, int]) -> Dict[str, float]:
+    if all(type(item) is int for item in json_responses):
+        vector, errors = responses_to_vector(json_responses)
+        if not errors and vector.min() >= MISSING and vector.max() <= LIKERT_MAX:
+            return scores_to_dict(compute_scores_matrix(vector)[0])
+    
+    # Chemin de référence (clés non entières, valeurs hors échelle)
     responses = parse_responses(json_responses)
     scores = {}
     
@@ -108,6 +174,299 @@ def compute_all_scores(json_responses: Dict[int, int]) -> Dict[str, float]:
     
     return scores
 
+COMPILED_AXES = compile_axes(AXES_CONFIG)
+
+def responses_to_vector(json_data: Dict[Any, Any]) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """
+    Convertit un dictionnaire de réponses (clés "1".."72") en vecteur de 72 colonnes.
+    Les clés ou valeurs non convertibles sont rapportées comme erreurs ; les items
+    absents valent MISSING.
+    """
+    vector = np.full(NUM_ITEMS, MISSING, dtype=np.int64)
+    errors = []
+    
+    # Chemin rapide : clés numériques valides et valeurs entières (cas du frontend)
+    try:
+        columns = np.fromiter(map(int, json_data), dtype=np.int64, count=len(json_data)) - 1
+        if all(type(value) is int and value != MISSING for value in json_data.values()) and \
+                (len(columns) == 0 or (columns.min() >= 0 and columns.max() < NUM_ITEMS)):
+            vector[columns] = np.fromiter(json_data.values(), dtype=np.int64, count=len(json_data))
+            return vector, errors
+    except (TypeError, ValueError, OverflowError):
+        pass
+    
+    for key, value in json_data.items():
+        try:
+            item = int(key)
+        except (TypeError, ValueError):
+            errors.append({"item": key, "code": "unknown_item", "value": value})
+            continue
+        
+        if item < 1 or item > NUM_ITEMS:
+            errors.append({"item": key, "code": "unknown_item", "value": value})
+            continue
+        
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            errors.append({"item": item, "code": "invalid_value", "value": value})
+            continue
+        
+        try:
+            number = float(value)
+        except ValueError:
+            errors.append({"item": item, "code": "invalid_value", "value": value})
+            continue
+        
+        if not number.is_integer():
+            errors.append({"item": item, "code": "invalid_value", "value": value})
+            continue
+        
+        if number == MISSING or abs(number) > np.iinfo(np.int32).max:
+            errors.append({"item": item, "code": "out_of_range", "value": value})
+            continue
+        
+        vector[item - 1] = int(number)
+    
+    return vector, errors
+
+def validate_matrix(matrix: np.ndarray, require_complete: bool = True,
+                    layout: CompiledAxes = COMPILED_AXES) -> Dict[str, np.ndarray]:
+    """
+    Valide un lot de réponses N×72 en une seule passe vectorisée.
+    Retourne les masques d'erreurs par item, la validité par ligne et la couverture par axe.
+    """
+    matrix = np.atleast_2d(matrix)
+    missing = matrix == MISSING
+    out_of_range = ~missing & ((matrix < LIKERT_MIN) | (matrix > LIKERT_MAX))
+    answered = ~missing & ~out_of_range
+    
+    coverage = (answered @ layout.weights) / layout.item_counts
+    
+    invalid = out_of_range.any(axis=1)
+    if require_complete:
+        invalid |= missing.any(axis=1)
+    
+    return {
+        "valid": ~invalid,
+        "missing": missing,
+        "out_of_range": out_of_range,
+        "coverage": coverage
+    }
+
+def validate_responses(json_data: Any, require_complete: bool = True,
+                       layout: CompiledAxes = COMPILED_AXES) -> Dict[str, Any]:
+    """Valide une soumission et retourne les erreurs structurées par item et la couverture par axe"""
+    if not isinstance(json_data, dict):
+        return {
+            "valid": False,
+            "errors": [{"item": None, "code": "invalid_payload", "value": None}],
+            "coverage": {axis: 0.0 for axis in layout.axis_names},
+            "vector": np.full(NUM_ITEMS, MISSING, dtype=np.uint8)
+        }
+    
+    vector, errors = responses_to_vector(json_data)
+    result = validate_matrix(vector, require_complete, layout)
+    
+    for column in np.flatnonzero(result["out_of_range"][0]):
+        errors.append({"item": int(column) + 1, "code": "out_of_range", "value": int(vector[column])})
+    
+    if require_complete:
+        reported = {error["item"] for error in errors}
+        for column in np.flatnonzero(result["missing"][0]):
+            if column + 1 not in reported:
+                errors.append({"item": int(column) + 1, "code": "missing", "value": None})
+    
+    vector[result["out_of_range"][0]] = MISSING
+    coverage = result["coverage"][0]
+    
+    return {
+        "valid": not errors,
+        "errors": errors,
+        "coverage": {axis: round(float(c), 4) for axis, c in zip(layout.axis_names, coverage)},
+        "vector": vector.astype(np.uint8)
+    }
+
+def validate_scores(scores: Any, layout: CompiledAxes = COMPILED_AXES) -> List[Dict[str, Any]]:
+    """Vérifie qu'un dictionnaire de scores contient exactement les axes attendus, entre 0 et 100"""
+    if not isinstance(scores, dict):
+        return [{"axis": None, "code": "invalid_payload", "value": None}]
+    
+    errors = []
+    
+    for axis, value in scores.items():
+        if axis not in layout.axis_names:
+            errors.append({"axis": axis, "code": "unknown_axis", "value": value})
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            errors.append({"axis": axis, "code": "invalid_value", "value": value})
+        elif not 0 <= value <= 100:
+            errors.append({"axis": axis, "code": "out_of_range", "value": value})
+    
+    for axis in layout.axis_names:
+        if axis not in scores:
+            errors.append({"axis": axis, "code": "missing", "value": None})
+    
+    return errors
+
+def vector_to_responses(vector: np.ndarray) -> Dict[int, int]:
+    return {int(column) + 1: int(vector[column]) for column in np.flatnonzero(vector != MISSING)}
+
+def axis_sums(matrix: np.ndarray, layout: CompiledAxes = COMPILED_AXES) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sommes entières (items inversés compris) et nombres d'items répondus par axe pour un lot N×72
+    de réponses valides (MISSING pour les items absents).
+    """
+    values = np.atleast_2d(matrix).astype(np.float64)
+    answered = values != MISSING
+    
+    sums = values @ layout.direct_weights + (answered * (LIKERT_MAX + LIKERT_MIN) - values) @ layout.invert_weights
+    counts = answered @ layout.weights
+    
+    return sums.astype(np.intp), counts.astype(np.intp)
+
+class ScoringPolicy(NamedTuple):
+    """
+    Traitement des réponses manquantes et pondération des items, compilé pour une disposition :
+    les masques de l'axe sont multipliés une fois pour toutes par le poids de chaque item.
+    """
+    weights: np.ndarray          # 72×axes, poids des items (0 hors de l'axe)
+    direct_weights: np.ndarray
+    invert_weights: np.ndarray
+    axis_weights: np.ndarray     # poids total de chaque axe
+    item_means: Any              # moyennes de cohorte (72,) sur l'échelle brute, ou None (pas d'imputation)
+    min_coverage: np.ndarray     # couverture pondérée minimale par axe ; en dessous, le score vaut NaN
+
+def compile_policy(layout: CompiledAxes = COMPILED_AXES, item_weights: Any = None,
+                   item_means: Any = None, min_coverage: Any = 0.0) -> ScoringPolicy:
+    """
+    item_weights : {item (1-72): poids} ou vecteur de 72 poids (1.0 par défaut)
+    item_means : moyennes par item d'une cohorte de référence (ItemStatistics.mean()), imputées aux items manquants
+    min_coverage : part minimale du poids d'un axe effectivement répondue, globale ou {axe: part}
+    """
+    weights = np.ones(NUM_ITEMS, dtype=np.float64)
+    if isinstance(item_weights, dict):
+        for item, weight in item_weights.items():
+            if not 1 <= int(item) <= NUM_ITEMS:
+                raise ValueError(f"❌ Item {item} inconnu")
+            weights[int(item) - 1] = float(weight)
+    elif item_weights is not None:
+        weights[:] = item_weights
+    if not np.isfinite(weights).all() or (weights < 0).any():
+        raise ValueError("❌ Les poids des items doivent être positifs ou nuls")
+
+    if item_means is not None:
+        item_means = np.array(item_means, dtype=np.float64)
+        if item_means.shape != (NUM_ITEMS,) or not ((item_means >= LIKERT_MIN) & (item_means <= LIKERT_MAX)).all():
+            raise ValueError(f"❌ {NUM_ITEMS} moyennes entre {LIKERT_MIN} et {LIKERT_MAX} attendues pour l'imputation")
+        item_means.setflags(write=False)
+
+    if isinstance(min_coverage, dict):
+        unknown = set(min_coverage) - set(layout.axis_names)
+        if unknown:
+            raise ValueError(f"❌ Axes inconnus : {sorted(unknown)}")
+        min_coverage = [min_coverage.get(axis, 0.0) for axis in layout.axis_names]
+    min_coverage = np.broadcast_to(np.asarray(min_coverage, dtype=np.float64), (len(layout.axis_names),)).copy()
+    if ((min_coverage < 0) | (min_coverage > 1)).any():
+        raise ValueError("❌ La couverture minimale est une part entre 0 et 1")
+    min_coverage.setflags(write=False)
+
+    compiled = []
+    for mask in (layout.weights, layout.direct_weights, layout.invert_weights):
+        weighted = np.ascontiguousarray(mask * weights[:, None])
+        weighted.setflags(write=False)
+        compiled.append(weighted)
+    axis_weights = compiled[0].sum(axis=0)
+    if (axis_weights <= 0).any():
+        empty = [axis for axis, total in zip(layout.axis_names, axis_weights) if total <= 0]
+        raise ValueError(f"❌ Axes sans poids : {empty}")
+    axis_weights.setflags(write=False)
+
+    return ScoringPolicy(*compiled, axis_weights, item_means, min_coverage)
+
+def compute_policy_scores(matrix: np.ndarray, policy: ScoringPolicy) -> np.ndarray:
+    """
+    Moyenne pondérée par axe avec imputation et seuil de couverture, en opérations masquées
+    sur tout le lot : le coût est le même que les lignes soient complètes ou partielles.
+    Sans imputation, un axe sans aucune réponse vaut 0.0, comme compute_axis_score.
+    """
+    values = np.atleast_2d(matrix).astype(np.float64)
+    answered = values != MISSING
+
+    coverage = (answered @ policy.weights) / policy.axis_weights
+
+    if policy.item_means is not None:
+        values = np.where(answered, values, policy.item_means)
+        present = np.ones_like(answered)
+    else:
+        present = answered
+
+    totals = values @ policy.direct_weights + (present * (LIKERT_MAX + LIKERT_MIN) - values) @ policy.invert_weights
+    counted = present @ policy.weights
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = totals / counted
+    scores = np.where(counted > 0, np.round((means - LIKERT_MIN) / (LIKERT_MAX - LIKERT_MIN) * 100, 2), 0.0)
+    scores[coverage < policy.min_coverage] = np.nan
+    return scores
+
+def compute_scores_matrix(matrix: np.ndarray, layout: CompiledAxes = COMPILED_AXES,
+                          policy: ScoringPolicy = None) -> np.ndarray:
+    """
+    Scores N×8 d'un lot de réponses valides : sommes entières puis lecture dans la table précalculée.
+    Avec une politique (compile_policy), moyenne pondérée, imputation et seuils de couverture.
+    """
+    if policy is not None:
+        return compute_policy_scores(matrix, policy)
+    sums, counts = axis_sums(matrix, layout)
+    return layout.score_table[counts, sums]
+
+SCORE_SCALE = 100 / (LIKERT_MAX - LIKERT_MIN)
+PRIOR_VARIANCE = 1.0        # variance a priori d'une réponse Likert 1-5
+PRIOR_WEIGHT = 2.0          # poids (en nombre d'items) de cette variance a priori
+Z_SCORE = 1.96              # intervalles de confiance à 95 %
+CONFIDENCE_LEVEL = 0.95
+
+def axis_moments(matrix: np.ndarray, layout: CompiledAxes = COMPILED_AXES) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sommes, sommes des carrés (items inversés compris) et nombres d'items répondus par axe, en une passe"""
+    values = np.atleast_2d(matrix).astype(np.float64)
+    answered = values != MISSING
+    inverted = answered * (LIKERT_MAX + LIKERT_MIN) - values
+
+    sums = values @ layout.direct_weights + inverted @ layout.invert_weights
+    squares = (values ** 2) @ layout.direct_weights + (inverted ** 2) @ layout.invert_weights
+    counts = answered @ layout.weights
+
+    return sums, squares, counts
+
+def axis_variance(sums: np.ndarray, squares: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Variance des réponses d'un axe, lissée vers PRIOR_VARIANCE tant que peu d'items sont connus"""
+    observed = np.maximum(squares - sums ** 2 / np.maximum(counts, 1), 0.0)
+    return (observed + PRIOR_VARIANCE * PRIOR_WEIGHT) / (np.maximum(counts - 1, 0) + PRIOR_WEIGHT)
+
+def compute_scores_with_errors(matrix: np.ndarray,
+                               layout: CompiledAxes = COMPILED_AXES) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scores N×8 (identiques à compute_scores_matrix) et erreurs types N×8 sur l'échelle 0-100,
+    tirées du nombre d'items répondus et de la variance des réponses de chaque axe.
+    Un axe sans réponse a une erreur type NaN.
+    """
+    sums, squares, counts = axis_moments(matrix, layout)
+    scores = layout.score_table[counts.astype(np.intp), sums.astype(np.intp)]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        standard_errors = SCORE_SCALE * np.sqrt(axis_variance(sums, squares, counts) / counts)
+    standard_errors = np.where(counts > 0, np.round(standard_errors, 2), np.nan)
+
+    return scores, standard_errors
+
+def confidence_intervals(scores: np.ndarray, standard_errors: np.ndarray,
+                         z: float = Z_SCORE) -> Tuple[np.ndarray, np.ndarray]:
+    """Bornes basse et haute (score ± z erreurs types), ramenées dans 0-100"""
+    low = np.clip(np.round(scores - z * standard_errors, 2), 0.0, 100.0)
+    high = np.clip(np.round(scores + z * standard_errors, 2), 0.0, 100.0)
+    return low, high
+
+def scores_to_dict(row: np.ndarray, layout: CompiledAxes = COMPILED_AXES) -> Dict[str, float]:
+    return {axis: float(score) for axis, score in zip(layout.axis_names, row)}
+
 def generate_radar_chart_data(scores: Dict[str, float]):
     """Prépare les données pour le diagramme radar en format JSON"""
     labels = list(scores.keys())
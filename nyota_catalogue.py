@@ -0,0 +1,208 @@
+import argparse
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from nyota_calculator import (
+    AXES_CONFIG,
+    BLOC_NAMES,
+    BLOC_RANGES,
+    COMPILED_AXES,
+    LIKERT_MAX,
+    LIKERT_MIN,
+    NUM_ITEMS,
+    CompiledAxes,
+    compile_axes
+)
+
+
+# ============================================
+# CATALOGUE DES QUESTIONS + DISPOSITION DU SCORING
+# ============================================
+
+QUESTIONS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "questions.json")
+
+BLOC_TITLES = {
+    "bloc1": "Big Five",
+    "bloc2": "Hogan-inspired",
+    "bloc3": "PI-inspired",
+    "bloc4": "Recherche innovante"
+}
+
+_layouts = {}  # empreinte de disposition → tables compilées (partagées entre versions)
+_catalogues = {}
+_registry_lock = threading.Lock()
+
+
+class Catalogue(dict):
+    """
+    Document servi aux clients (sérialisable tel quel), qui garde une référence à ses tables de
+    scoring compilées : une requête qui tient le catalogue tient aussi sa disposition, même si
+    un rechargement retire la version entre-temps.
+    """
+    compiled: CompiledAxes
+
+
+def load_questions(path: str = QUESTIONS_FILE) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        questions = json.load(f)
+
+    if [q["id"] for q in questions] != list(range(1, NUM_ITEMS + 1)):
+        raise ValueError(f"❌ Le catalogue doit contenir les questions 1 à {NUM_ITEMS} dans l'ordre")
+    return questions
+
+
+def bloc_of(question_id: int):
+    for bloc_name, (first, last) in BLOC_RANGES.items():
+        if first <= question_id <= last:
+            return bloc_name, question_id - first + 1
+    raise ValueError(f"Question hors disposition : {question_id}")
+
+
+def layout_key(axes_config: dict) -> str:
+    """Empreinte de la disposition de scoring seule : deux catalogues qui la partagent partagent leurs tables"""
+    canonical = json.dumps(
+        [[axis, {key: sorted(map(list, items)) if key == "invert" else sorted(items)
+                 for key, items in sorted(config.items())}]
+         for axis, config in axes_config.items()],
+        ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def build_catalogue(questions: List[Dict[str, Any]], axes_config: dict) -> Dict[str, Any]:
+    """Document unique servi aux clients : questions, blocs, axes et version"""
+    memberships = {q["id"]: [] for q in questions}
+    axes = {}
+
+    for axis, config in axes_config.items():
+        inverted = {(bloc_name, item) for bloc_name, item in config["invert"]}
+        items = []
+        for bloc_name in BLOC_NAMES:
+            for item in config.get(bloc_name, []):
+                question_id = BLOC_RANGES[bloc_name][0] + item - 1
+                is_inverted = (bloc_name, item) in inverted
+                memberships[question_id].append({"axis": axis, "inverted": is_inverted})
+                items.append(question_id)
+        axes[axis] = {
+            "items": items,
+            "inverted": [BLOC_RANGES[b][0] + i - 1 for b, i in config["invert"]]
+        }
+
+    catalogue = {
+        "scale": {"min": LIKERT_MIN, "max": LIKERT_MAX},
+        "blocs": {
+            bloc_name: {"title": BLOC_TITLES.get(bloc_name, bloc_name), "first": first, "last": last}
+            for bloc_name, (first, last) in BLOC_RANGES.items()
+        },
+        "axes": axes,
+        "questions": [
+            {
+                "id": q["id"],
+                "text": q["text"],
+                "bloc": q["bloc"],
+                "section": bloc_of(q["id"])[0],
+                "item": bloc_of(q["id"])[1],
+                "axes": memberships[q["id"]]
+            }
+            for q in questions
+        ]
+    }
+
+    canonical = json.dumps(catalogue, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    catalogue["version"] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+    catalogue["layout"] = layout_key(axes_config)
+    return catalogue
+
+
+def register_catalogue(questions: List[Dict[str, Any]], axes_config: dict) -> Catalogue:
+    """Construit le catalogue et compile (une seule fois par disposition) ses tables de scoring"""
+    catalogue = Catalogue(build_catalogue(questions, axes_config))
+
+    with _registry_lock:
+        if catalogue["layout"] not in _layouts:
+            _layouts[catalogue["layout"]] = compile_axes(axes_config)
+        catalogue.compiled = _layouts[catalogue["layout"]]
+        _catalogues[catalogue["version"]] = catalogue
+
+    return catalogue
+
+
+def retire_catalogues(versions: Iterable[str]) -> List[str]:
+    """
+    Retire des versions du registre (jamais le catalogue par défaut) et les dispositions
+    qui ne servent plus à aucun catalogue ; renvoie ces dispositions pour invalider leurs caches.
+    Les requêtes en cours gardent leurs références et se terminent sur l'ancienne version.
+    """
+    with _registry_lock:
+        for version in versions:
+            if version != DEFAULT_CATALOGUE["version"]:
+                _catalogues.pop(version, None)
+
+        in_use = {catalogue["layout"] for catalogue in _catalogues.values()}
+        retired = [key for key in _layouts if key not in in_use]
+        for key in retired:
+            del _layouts[key]
+
+    return retired
+
+
+def get_catalogue(version: Optional[str] = None) -> Optional[Catalogue]:
+    return _catalogues.get(version or DEFAULT_CATALOGUE["version"])
+
+
+def get_layout(version: Optional[str] = None) -> Optional[CompiledAxes]:
+    """Tables de scoring précompilées correspondant à une version de catalogue"""
+    catalogue = get_catalogue(version)
+    return catalogue.compiled if catalogue is not None else None
+
+
+def render_question_js(catalogue: Dict[str, Any]) -> str:
+    """Régénère question.js (tableau NYOTA_QUESTIONS du frontend) depuis le catalogue"""
+    lines = [
+        f"// Tableau des {len(catalogue['questions'])} questions NYOTA",
+        "// Généré depuis questions.json : python nyota_catalogue.py --write-js question.js",
+        "const NYOTA_QUESTIONS = ["
+    ]
+    entries = []
+
+    for q in catalogue["questions"]:
+        bloc = catalogue["blocs"][q["section"]]
+        if q["id"] == bloc["first"]:
+            entries.append(f"    // Bloc {q['section'][-1]}: {bloc['title']} "
+                           f"(Questions {bloc['first']}-{bloc['last']})")
+        entries.append("    {\n"
+                       f"        id: {q['id']},\n"
+                       f"        text: {json.dumps(q['text'], ensure_ascii=False)},\n"
+                       f"        bloc: {json.dumps(q['bloc'], ensure_ascii=False)}\n"
+                       "    }")
+
+    body = []
+    for i, entry in enumerate(entries):
+        is_last = all(e.lstrip().startswith("//") for e in entries[i + 1:])
+        body.append(entry if entry.lstrip().startswith("//") or is_last else entry + ",")
+
+    return "\n".join(lines + body + ["];"])
+
+
+_layouts[layout_key(AXES_CONFIG)] = COMPILED_AXES
+DEFAULT_CATALOGUE = register_catalogue(load_questions(), AXES_CONFIG)
+
+
+# ============================================
+# LIGNE DE COMMANDE
+# ============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Catalogue des questions NYOTA")
+    parser.add_argument("--write-js", metavar="PATH", help="Régénérer question.js depuis questions.json")
+    args = parser.parse_args()
+
+    if args.write_js:
+        with open(args.write_js, "w", encoding="utf-8") as f:
+            f.write(render_question_js(DEFAULT_CATALOGUE))
+        print(f"✅ {args.write_js} régénéré (catalogue {DEFAULT_CATALOGUE['version']})")
+    else:
+        print(json.dumps(DEFAULT_CATALOGUE, ensure_ascii=False, indent=2))
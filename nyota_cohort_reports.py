@@ -0,0 +1,299 @@
+import argparse
+import io
+import os
+import tarfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from diag import (
+    DEVELOPMENT_LINES,
+    GENERIC_RECOMMENDATIONS_HIGH,
+    GENERIC_RECOMMENDATIONS_LOW,
+    RECOMMENDATION_RULES,
+    STRENGTH_LINES,
+    average_score,
+    axis_paragraph,
+    generate_html_report,
+    generate_written_report,
+    render_written_report
+)
+from nyota_calculator import COMPILED_AXES
+from nyota_jobs import ARTIFACTS
+from nyota_render import render_radar_png
+
+
+# ============================================
+# RAPPORTS ÉCRITS PAR COHORTE
+# ============================================
+
+DEFAULT_BATCH_SIZE = 8192
+PENDING_PER_WORKER = 4
+
+
+class CohortReportTemplates:
+    """Blocs de texte et règles de recommandation préparés une fois pour un jeu d'axes donné"""
+
+    def __init__(self, axis_names: Sequence[str] = COMPILED_AXES.axis_names):
+        self.axis_names = tuple(axis_names)
+        self.strength_blocks = {axis: axis_paragraph(axis, STRENGTH_LINES) for axis in self.axis_names}
+        self.development_blocks = {axis: axis_paragraph(axis, DEVELOPMENT_LINES) for axis in self.axis_names}
+
+        column = {axis: j for j, axis in enumerate(self.axis_names)}
+        self.rules = [
+            ([column[axis] for axis in required], [(column[axis], minimum) for axis, minimum in thresholds.items()])
+            for required, thresholds, _ in RECOMMENDATION_RULES
+        ]
+
+        # Lignes de recommandation de chaque combinaison de règles (bit i = règle i satisfaite)
+        self.recommendations = []
+        for code in range(2 ** len(RECOMMENDATION_RULES)):
+            lines = []
+            for i, (_, _, rule_lines) in enumerate(RECOMMENDATION_RULES):
+                if code >> i & 1:
+                    lines.extend(rule_lines)
+            self.recommendations.append(lines)
+
+    def rule_codes(self, scores: np.ndarray, in_top: np.ndarray) -> np.ndarray:
+        codes = np.zeros(len(scores), dtype=np.int64)
+        for i, (required, thresholds) in enumerate(self.rules):
+            mask = in_top[:, required].all(axis=1) if required else np.ones(len(scores), dtype=bool)
+            for j, minimum in thresholds:
+                mask &= scores[:, j] >= minimum
+            codes |= mask.astype(np.int64) << i
+        return codes
+
+
+def iter_written_reports(scores: np.ndarray, templates: Optional[CohortReportTemplates] = None,
+                         batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[str]:
+    """
+    Produit, ligne par ligne d'une matrice de scores N×8, le même texte que diag.generate_written_report.
+    Le classement (top 3 / bottom 3) et les règles de recommandation sont calculés par lots vectorisés.
+    """
+    templates = templates or CohortReportTemplates()
+    names = templates.axis_names
+
+    for start in range(0, len(scores), batch_size):
+        batch = np.asarray(scores[start:start + batch_size], dtype=np.float64)
+        # Tri stable décroissant : mêmes départages d'égalité que sorted(..., reverse=True)
+        order = np.argsort(-batch, axis=1, kind="stable")
+        top, bottom = order[:, :3], order[:, -3:]
+
+        in_top = np.zeros(batch.shape, dtype=bool)
+        np.put_along_axis(in_top, top, True, axis=1)
+        codes = templates.rule_codes(batch, in_top)
+
+        rows = batch.tolist()
+        for row, top_row, bottom_row, code in zip(rows, top.tolist(), bottom.tolist(), codes.tolist()):
+            avg_score = average_score(row)
+            recommendations = templates.recommendations[code] or (
+                GENERIC_RECOMMENDATIONS_HIGH if avg_score >= 60 else GENERIC_RECOMMENDATIONS_LOW
+            )
+            yield render_written_report(
+                avg_score,
+                [(names[j], row[j]) for j in top_row],
+                [(names[j], row[j]) for j in bottom_row],
+                recommendations,
+                templates.strength_blocks,
+                templates.development_blocks
+            )
+
+
+# ============================================
+# ARCHIVES EN FLUX (ZIP / TAR)
+# ============================================
+
+ARCHIVE_FORMATS = {
+    "zip": "application/zip",
+    "tar": "application/x-tar",
+    "tar.gz": "application/gzip"
+}
+
+# Artefacts d'un répondant dans un export complet (mêmes noms que les rapports de nyota_jobs)
+BUNDLE_ARTIFACTS = ("kiviat", "html", "text")
+
+
+class _StreamSink:
+    """Fichier en écriture seule : accumule ce que l'archive écrit jusqu'au prochain drain()"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def archive_format(target: str) -> Optional[str]:
+    for fmt in ("tar.gz", "tar", "zip"):
+        if target.endswith("." + fmt):
+            return fmt
+    if target.endswith(".tgz"):
+        return "tar.gz"
+    return None
+
+
+def stream_archive(members: Iterable[Tuple[str, bytes]], fmt: str = "zip") -> Iterator[bytes]:
+    """
+    Écrit les membres (nom, contenu) dans une archive zip/tar sans fichier intermédiaire
+    et produit les octets de l'archive au fur et à mesure : la mémoire reste bornée à un membre.
+    """
+    if fmt not in ARCHIVE_FORMATS:
+        raise ValueError(f"Format d'archive inconnu : {fmt}")
+
+    sink = _StreamSink()
+
+    if fmt == "zip":
+        # Sortie non positionnable : zipfile écrit un descripteur de données après chaque membre
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, data in members:
+                # Le PNG est déjà compressé : stocké tel quel
+                compression = zipfile.ZIP_STORED if name.endswith(".png") else zipfile.ZIP_DEFLATED
+                archive.writestr(name, data, compress_type=compression)
+                yield sink.drain()
+    else:
+        now = int(time.time())
+        with tarfile.open(fileobj=sink, mode="w|gz" if fmt == "tar.gz" else "w|") as archive:
+            for name, data in members:
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = now
+                archive.addfile(info, io.BytesIO(data))
+                yield sink.drain()
+
+    yield sink.drain()
+
+
+def write_members(members: Iterable[Tuple[str, bytes]], target: str) -> int:
+    """Écrit les membres dans une archive (.zip, .tar, .tar.gz) ou, à défaut, dans un répertoire"""
+    count = 0
+
+    def counted():
+        nonlocal count
+        for member in members:
+            count += 1
+            yield member
+
+    fmt = archive_format(target)
+    if fmt is not None:
+        with open(target, "wb") as f:
+            for chunk in stream_archive(counted(), fmt):
+                f.write(chunk)
+    else:
+        for name, data in counted():
+            path = os.path.join(target, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+
+    return count
+
+
+def write_reports(reports: Iterable[Tuple[str, str]], target: str) -> int:
+    """Rapports écrits seuls, nommés <identifiant>.txt"""
+    return write_members(((f"{respondent_id}.txt", text.encode("utf-8")) for respondent_id, text in reports),
+                         target)
+
+
+def export_cohort_reports(scores: np.ndarray, ids: List[str], target: str,
+                          axis_names: Sequence[str] = COMPILED_AXES.axis_names) -> int:
+    templates = CohortReportTemplates(axis_names)
+    return write_reports(zip(ids, iter_written_reports(scores, templates)), target)
+
+
+# ============================================
+# EXPORT COMPLET (PNG + HTML + TXT PAR RÉPONDANT)
+# ============================================
+
+def render_respondent_bundle(record: Tuple[str, Dict[str, float]]) -> List[Tuple[str, bytes]]:
+    """Rend en mémoire les artefacts d'un répondant, rangés sous <identifiant>/"""
+    respondent_id, scores = record
+    contents = {
+        "kiviat": render_radar_png(dict(scores)),
+        "html": generate_html_report(scores).encode("utf-8"),
+        "text": generate_written_report(scores).encode("utf-8")
+    }
+
+    return [(f"{respondent_id}/{ARTIFACTS[name][0]}", contents[name]) for name in BUNDLE_ARTIFACTS]
+
+
+def iter_bundle_members(records: Iterable[Tuple[str, Dict[str, float]]],
+                        workers: Optional[int] = None) -> Iterator[Tuple[str, bytes]]:
+    """
+    Rend les répondants sur `workers` processus et produit leurs artefacts dans l'ordre d'entrée.
+    Au plus PENDING_PER_WORKER rendus par worker sont en vol : la mémoire ne dépend pas de la cohorte.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for record in records:
+            yield from render_respondent_bundle(record)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for record in records:
+            pending.append(pool.submit(render_respondent_bundle, record))
+            if len(pending) >= workers * PENDING_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def iter_score_records(scores: np.ndarray, ids: Iterable[str],
+                       axis_names: Sequence[str] = COMPILED_AXES.axis_names) -> Iterator[Tuple[str, Dict[str, float]]]:
+    for respondent_id, row in zip(ids, scores):
+        yield respondent_id, {axis: float(score) for axis, score in zip(axis_names, row)}
+
+
+def stream_cohort_bundle(records: Iterable[Tuple[str, Dict[str, float]]], fmt: str = "zip",
+                         workers: Optional[int] = None) -> Iterator[bytes]:
+    """Archive complète d'une cohorte, produite en flux pendant le rendu"""
+    return stream_archive(iter_bundle_members(records, workers), fmt)
+
+
+# ============================================
+# LIGNE DE COMMANDE
+# ============================================
+
+if __name__ == "__main__":
+    from nyota_store import ResponseStore
+
+    parser = argparse.ArgumentParser(description="Rapports NYOTA pour toute une archive de réponses")
+    parser.add_argument("store", help="Répertoire d'une archive nyota_store")
+    parser.add_argument("output", help="Répertoire, .zip, .tar ou .tar.gz")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--full", action="store_true",
+                        help="Exporter aussi le diagramme PNG et le rapport HTML de chaque répondant")
+    parser.add_argument("--exclude-flagged", action="store_true",
+                        help="Ignorer les répondants signalés comme faible effort (nyota_quality)")
+    args = parser.parse_args()
+
+    store = ResponseStore(args.store)
+    start = time.perf_counter()
+    # Scores en float64 : les scores float32 afficheraient d'autres arrondis que le rapport individuel
+    scores = store.scores(workers=args.workers, output_dtype=np.float64)
+    ids = store.ids
+    if args.exclude_flagged:
+        kept = store.quality_flags() == 0
+        scores, ids = scores[kept], [respondent_id for respondent_id, keep in zip(ids, kept) if keep]
+    if args.full:
+        count = write_members(iter_bundle_members(iter_score_records(scores, ids), args.workers),
+                              args.output) // len(BUNDLE_ARTIFACTS)
+    else:
+        count = export_cohort_reports(scores, ids, args.output)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ {count} rapports écrits dans {args.output} ({count / elapsed * 60:,.0f} rapports/min)")
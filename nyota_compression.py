@@ -0,0 +1,161 @@
+import gzip
+import hashlib
+import os
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from nyota_cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # brotli est optionnel : gzip seul sinon
+    brotli = None
+
+
+# ============================================
+# COMPRESSION NÉGOCIÉE DES RÉPONSES HTTP
+# ============================================
+
+COMPRESSIBLE_MIMETYPES = (
+    "text/html",
+    "text/plain",
+    "text/css",
+    "application/json",
+    "application/javascript",
+    "text/javascript",
+    "image/svg+xml"
+)
+
+MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Corps compressés récents, indexés par (encodage, empreinte du contenu) :
+# les fragments de rapport identiques ne sont compressés qu'une fois
+COMPRESSED_CACHE = LRUCache(maxsize=int(os.environ.get("NYOTA_COMPRESSED_CACHE_SIZE", 256)), ttl=None)
+
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def supported_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Choisit br puis gzip selon l'en-tête Accept-Encoding (les encodages à q=0 sont refusés)"""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.lower()] = quality
+
+    for encoding in supported_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_cached(data: bytes, encoding: str) -> bytes:
+    key = f"{encoding}:{hashlib.sha1(data).hexdigest()}"
+    compressed = COMPRESSED_CACHE.get(key)
+    if compressed is None:
+        compressed = compress(data, encoding)
+        COMPRESSED_CACHE.set(key, compressed)
+    return compressed
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Compresse un flux bloc par bloc, en vidant le tampon à chaque bloc pour ne pas retarder le client"""
+    chunks = (chunk.encode("utf-8") if isinstance(chunk, str) else chunk for chunk in chunks)
+
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def precompress_file(path: str) -> None:
+    """Écrit les variantes .gz (et .br si disponible) d'un fichier à côté de l'original"""
+    with open(path, "rb") as f:
+        data = f.read()
+    for encoding in supported_encodings():
+        target = path + PRECOMPRESSED_SUFFIXES[encoding]
+        with open(target + ".tmp", "wb") as f:
+            f.write(compress(data, encoding))
+        os.replace(target + ".tmp", target)
+
+
+def precompressed_variant(path: str, accept_encoding: str) -> Optional[tuple]:
+    """Renvoie (chemin, encodage) de la variante précompressée acceptée par le client, si elle existe"""
+    encoding = negotiate_encoding(accept_encoding)
+    if encoding is None:
+        return None
+    variant = path + PRECOMPRESSED_SUFFIXES[encoding]
+    if os.path.exists(variant):
+        return variant, encoding
+    return None
+
+
+def _is_compressible(response) -> bool:
+    return (
+        response.status_code in (200, 201, 202)
+        and "Content-Encoding" not in response.headers
+        and not response.direct_passthrough
+        and response.mimetype in COMPRESSIBLE_MIMETYPES
+    )
+
+
+def init_compression(app, min_size: int = MIN_SIZE):
+    """Compresse les réponses textuelles de l'application selon Accept-Encoding"""
+    from flask import request
+
+    @app.after_request
+    def compress_response(response):
+        if not _is_compressible(response):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = negotiate_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < min_size:
+                return response
+            response.set_data(compress_cached(data, encoding))
+
+        response.headers["Content-Encoding"] = encoding
+        etag, _ = response.get_etag()
+        if etag:
+            # Une représentation compressée n'est pas identique octet pour octet : ETag faible
+            response.set_etag(etag, weak=True)
+        return response
+
+    return app
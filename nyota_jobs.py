@@ -0,0 +1,335 @@
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from nyota_cache import scores_hash
+from nyota_compression import COMPRESSIBLE_MIMETYPES, precompress_file
+
+
+# ============================================
+# FILE DE TÂCHES PERSISTANTE (SQLITE)
+# ============================================
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+EXPIRED = "expired"
+
+ARTIFACTS = {
+    "kiviat": ("nyota_profile.png", "image/png"),
+    "dashboard": ("nyota_dashboard_complet.html", "text/html"),
+    "text": ("nyota_rapport_ecrit.txt", "text/plain"),
+    "html": ("nyota_rapport_complet.html", "text/html")
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    scores TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    available_at REAL NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (status, available_at);
+"""
+
+
+class JobQueue:
+    """
+    File de génération de rapports persistée dans SQLite.
+    L'identifiant d'une tâche est l'empreinte de ses scores : une même demande n'est rendue qu'une fois.
+    """
+
+    def __init__(self, db_path: str, artifacts_dir: str, ttl: float = 86400,
+                 max_attempts: int = 3, retry_delay: float = 2.0):
+        self.db_path = db_path
+        self.artifacts_dir = artifacts_dir
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._changed = threading.Condition()
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    @contextmanager
+    def _connect(self):
+        # Base et répertoire créés au premier usage : importer l'application ne laisse aucun fichier
+        if not self._ready:
+            with self._ready_lock:
+                if not self._ready:
+                    os.makedirs(self.artifacts_dir, exist_ok=True)
+                    conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+                    try:
+                        conn.executescript(SCHEMA)
+                    finally:
+                        conn.close()
+                    self._ready = True
+
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    def job_dir(self, job_id: str) -> str:
+        return os.path.join(self.artifacts_dir, job_id)
+
+    def submit(self, scores: Dict[str, float]) -> Dict[str, Any]:
+        """Crée une tâche, ou renvoie la tâche existante pour les mêmes scores si elle est encore valable"""
+        job_id = scores_hash(scores)
+        now = time.time()
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT status, expires_at FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            # Un rapport échu mais pas encore purgé est expiré, comme le rapporte get()
+            lapsed = row is not None and row["status"] == DONE \
+                and row["expires_at"] is not None and row["expires_at"] <= now
+
+            if row is None:
+                conn.execute(
+                    "INSERT INTO jobs (id, status, scores, max_attempts, created_at, updated_at, available_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, QUEUED, json.dumps(scores, ensure_ascii=False), self.max_attempts, now, now, now)
+                )
+            elif row["status"] in (FAILED, EXPIRED) or lapsed:
+                if lapsed:
+                    shutil.rmtree(self.job_dir(job_id), ignore_errors=True)
+                conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = 0, error = NULL, expires_at = NULL, "
+                    "updated_at = ?, available_at = ? WHERE id = ?",
+                    (QUEUED, now, now, job_id)
+                )
+            conn.execute("COMMIT")
+
+        self._notify()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+        if row is None:
+            return None
+
+        job = dict(row)
+        job["scores"] = json.loads(job["scores"])
+        if job["status"] == DONE and job["expires_at"] is not None and job["expires_at"] <= time.time():
+            job["status"] = EXPIRED
+        return job
+
+    def wait(self, job_id: str, timeout: float, poll_interval: float = 0.5) -> Optional[Dict[str, Any]]:
+        """Long-polling : attend la fin de la tâche (ou le délai) avant de renvoyer son état"""
+        deadline = time.monotonic() + timeout
+
+        while True:
+            job = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job["status"] in (DONE, FAILED, EXPIRED) or remaining <= 0:
+                return job
+            with self._changed:
+                self._changed.wait(min(poll_interval, remaining))
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        now = time.time()
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND available_at <= ? ORDER BY created_at LIMIT 1",
+                (QUEUED, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (RUNNING, now, row["id"])
+            )
+            conn.execute("COMMIT")
+
+        return self.get(row["id"])
+
+    def complete(self, job_id: str):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = NULL, updated_at = ?, expires_at = ? WHERE id = ?",
+                (DONE, now, now + self.ttl, job_id)
+            )
+        self._notify()
+
+    def fail(self, job_id: str, error: str):
+        """Replanifie la tâche avec un délai croissant, ou la marque en échec après max_attempts"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row["attempts"] < row["max_attempts"]:
+                delay = self.retry_delay * 2 ** (row["attempts"] - 1)
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, updated_at = ?, available_at = ? WHERE id = ?",
+                    (QUEUED, error, now, now + delay, job_id)
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                    (FAILED, error, now, job_id)
+                )
+            conn.execute("COMMIT")
+        self._notify()
+
+    def requeue_stale(self, lease: float = 600) -> int:
+        """Remet en file les tâches restées « running » après l'arrêt brutal d'un worker"""
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?, available_at = ? WHERE status = ? AND updated_at < ?",
+                (QUEUED, now, now, RUNNING, now - lease)
+            )
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        """Supprime les artefacts des tâches expirées ; la ligne reste pour permettre une nouvelle demande"""
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND expires_at <= ?", (DONE, now)
+            ).fetchall()
+            for row in rows:
+                shutil.rmtree(self.job_dir(row["id"]), ignore_errors=True)
+                conn.execute("UPDATE jobs SET status = ?, updated_at = ? WHERE id = ?", (EXPIRED, now, row["id"]))
+        return len(rows)
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+
+# ============================================
+# RENDU DES ARTEFACTS
+# ============================================
+
+def render_report_artifacts(scores: Dict[str, float], output_dir: str) -> List[str]:
+    """Produit les 4 artefacts de diag.generate_nyota_report dans output_dir, sans affichage"""
+    import diag
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {name: os.path.join(output_dir, filename) for name, (filename, _) in ARTIFACTS.items()}
+
+    diag.plot_kiviat(dict(scores), paths["kiviat"], show=False)
+    diag.create_unified_dashboard(scores, output_path=paths["dashboard"], show=False)
+
+    with open(paths["text"], "w", encoding="utf-8") as f:
+        f.write(diag.generate_written_report(scores))
+    with open(paths["html"], "w", encoding="utf-8") as f:
+        f.write(diag.generate_html_report(scores))
+
+    # Variantes gzip/brotli préparées une fois, servies telles quelles au téléchargement
+    for name, (_, mimetype) in ARTIFACTS.items():
+        if mimetype in COMPRESSIBLE_MIMETYPES:
+            precompress_file(paths[name])
+
+    return list(paths.values())
+
+
+class JobWorkerPool:
+    """Threads de rendu locaux qui consomment la file ; démarrés à la demande par l'application"""
+
+    def __init__(self, queue: JobQueue, workers: int = 2, poll_interval: float = 1.0,
+                 render: Callable[[Dict[str, float], str], Any] = render_report_artifacts):
+        self.queue = queue
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.render = render
+        self._threads = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            self.queue.requeue_stale()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"nyota-report-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stop.clear()
+
+    def run_once(self) -> bool:
+        job = self.queue.claim()
+        if job is None:
+            return False
+
+        try:
+            self.render(job["scores"], self.queue.job_dir(job["id"]))
+        except Exception:
+            self.queue.fail(job["id"], traceback.format_exc(limit=3))
+        else:
+            self.queue.complete(job["id"])
+        return True
+
+    def _run(self):
+        last_purge = 0.0
+        while not self._stop.is_set():
+            if time.monotonic() - last_purge > 60:
+                self.queue.purge_expired()
+                last_purge = time.monotonic()
+            if not self.run_once():
+                self._stop.wait(self.poll_interval)
+
+
+def queue_from_env() -> JobQueue:
+    return JobQueue(
+        db_path=os.environ.get("NYOTA_JOBS_DB", "nyota_jobs.sqlite3"),
+        artifacts_dir=os.environ.get("NYOTA_JOBS_DIR", "nyota_jobs"),
+        ttl=float(os.environ.get("NYOTA_JOBS_TTL", 86400)),
+        max_attempts=int(os.environ.get("NYOTA_JOBS_MAX_ATTEMPTS", 3))
+    )
+
+
+# ============================================
+# WORKER AUTONOME
+# ============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Worker de génération des rapports NYOTA")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("NYOTA_JOBS_WORKERS", 2)))
+    args = parser.parse_args()
+
+    pool = JobWorkerPool(queue_from_env(), workers=args.workers)
+    pool.start()
+    print(f"✅ {args.workers} workers de rendu démarrés")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pool.stop()
@@ -0,0 +1,200 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+# ============================================
+# LIMITATION DE DÉBIT (SEAU À JETONS)
+# ============================================
+
+def refill(tokens: float, updated_at: float, now: float, rate: float, burst: float) -> float:
+    return min(burst, tokens + max(now - updated_at, 0.0) * rate)
+
+
+class MemoryBucketStore:
+    """Seaux en mémoire du processus, bornés en nombre (les clés les plus anciennes sont oubliées)"""
+
+    def __init__(self, maxsize: int = 100000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, cost: float, rate: float, burst: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = refill(tokens, updated_at, now, rate, burst)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+
+        return allowed, tokens
+
+
+class SQLiteBucketStore:
+    """Seaux partagés par tous les processus d'une machine (fichier SQLite local, transaction exclusive)"""
+
+    SCHEMA = "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.execute(self.SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def take(self, key: str, cost: float, rate: float, burst: float) -> Tuple[bool, float]:
+        # Horloge murale : partagée entre processus, contrairement à time.monotonic()
+        now = time.time()
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)).fetchone()
+                tokens = refill(*row, now, rate, burst) if row else burst
+                allowed = tokens >= cost
+                if allowed:
+                    tokens -= cost
+                conn.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                             (key, tokens, now))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return allowed, tokens
+
+
+class RateLimiter:
+    """
+    Seau à jetons par clé (client × route) : `rate` jetons par seconde, au plus `burst` en réserve.
+    Renvoie le délai (en secondes) avant qu'une requête refusée puisse réussir.
+    """
+
+    def __init__(self, rate: float, burst: float, store=None):
+        self.rate = rate
+        self.burst = burst
+        self.store = store or MemoryBucketStore()
+        self.rejected = 0
+
+    def acquire(self, key: str, cost: float = 1.0) -> Tuple[bool, float]:
+        if self.rate <= 0:
+            return True, 0.0
+
+        allowed, tokens = self.store.take(key, cost, self.rate, self.burst)
+        if allowed:
+            return True, 0.0
+
+        self.rejected += 1
+        return False, (cost - tokens) / self.rate
+
+
+# ============================================
+# CONTRÔLE D'ADMISSION (RENDUS SIMULTANÉS)
+# ============================================
+
+class AdmissionGate:
+    """
+    Borne le nombre de rendus simultanés d'un processus. Une requête qui ne trouve pas de place
+    dans le délai `wait` est refusée immédiatement (503) plutôt que de s'empiler derrière les autres.
+    """
+
+    def __init__(self, capacity: int, wait: float = 0.05):
+        self.capacity = capacity
+        self.wait = wait
+        self._slots = threading.BoundedSemaphore(capacity)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.rejected = 0
+
+    def try_enter(self) -> bool:
+        if not self._slots.acquire(timeout=self.wait):
+            with self._lock:
+                self.rejected += 1
+            return False
+        with self._lock:
+            self.active += 1
+        return True
+
+    def leave(self):
+        with self._lock:
+            self.active -= 1
+        self._slots.release()
+
+    @contextmanager
+    def admit(self) -> Iterator[bool]:
+        admitted = self.try_enter()
+        try:
+            yield admitted
+        finally:
+            if admitted:
+                self.leave()
+
+    def hold(self, chunks: Iterable[bytes]) -> "HeldStream":
+        """Garde la place (déjà obtenue par try_enter) pendant toute la durée d'une réponse en flux"""
+        return HeldStream(self, chunks)
+
+    def stats(self):
+        return {"capacity": self.capacity, "active": self.active, "rejected": self.rejected}
+
+
+class HeldStream:
+    """
+    Corps de réponse en flux qui libère sa place de rendu une seule fois : en fin de flux,
+    ou quand le serveur ferme la réponse (client déconnecté, flux jamais démarré).
+    """
+
+    def __init__(self, gate: AdmissionGate, chunks: Iterable[bytes]):
+        self.gate = gate
+        self.chunks = chunks
+        self._released = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        try:
+            yield from self.chunks
+        finally:
+            self.close()
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            if hasattr(self.chunks, "close"):
+                self.chunks.close()
+            self.gate.leave()
+
+
+def retry_after(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+def limiter_from_env(prefix: str, default_rate: float, default_burst: float,
+                     store=None) -> RateLimiter:
+    """{prefix}_RATE (jetons/s, 0 = illimité) et {prefix}_BURST"""
+    return RateLimiter(
+        rate=float(os.environ.get(f"{prefix}_RATE", default_rate)),
+        burst=float(os.environ.get(f"{prefix}_BURST", default_burst)),
+        store=store
+    )
+
+
+def store_from_env() -> Optional[SQLiteBucketStore]:
+    """NYOTA_LIMITS_DB : seaux partagés entre les workers d'une machine (sinon en mémoire, par processus)"""
+    path = os.environ.get("NYOTA_LIMITS_DB")
+    return SQLiteBucketStore(path) if path else None
@@ -0,0 +1,241 @@
+import argparse
+import json
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from nyota_calculator import (
+    COMPILED_AXES,
+    LIKERT_MAX,
+    MISSING,
+    NUM_ITEMS,
+    ScoringPolicy,
+    compile_policy,
+    compute_scores_matrix,
+    compute_scores_with_errors
+)
+
+
+# ============================================
+# SCORING D'UNE COHORTE SUR PLUSIEURS CŒURS
+# ============================================
+
+DEFAULT_CHUNK_SIZE = 65536
+
+_worker_state = {}
+
+
+def output_columns(with_errors: bool = False) -> int:
+    """Colonnes de la sortie : les 8 scores, suivis des 8 erreurs types si demandées"""
+    num_axes = len(COMPILED_AXES.axis_names)
+    return 2 * num_axes if with_errors else num_axes
+
+
+def score_chunk(chunk: np.ndarray, policy: Optional[ScoringPolicy] = None,
+                with_errors: bool = False) -> np.ndarray:
+    if not with_errors:
+        return compute_scores_matrix(chunk, policy=policy)
+    return np.hstack(compute_scores_with_errors(chunk))
+
+
+def memmap_source(matrix: np.ndarray) -> Optional[Tuple[str, int]]:
+    """
+    (fichier, décalage en octets) des lignes d'une memmap uint8 contiguë, ou None.
+    Une tranche garde le .offset de la memmap d'origine : le décalage réel se déduit
+    de la position de ses données dans la projection de la memmap racine.
+    """
+    if not (isinstance(matrix, np.memmap) and matrix.dtype == np.uint8 and matrix.flags.c_contiguous):
+        return None
+    root = matrix
+    while isinstance(root.base, np.memmap):
+        root = root.base
+    if not isinstance(root.base, mmap.mmap) or root.filename is None:
+        return None
+    return root.filename, root.offset + (matrix.ctypes.data - root.ctypes.data)
+
+
+def _attach_shared(input_name: str, output_name: str, rows: int, output_dtype: str,
+                   policy: Optional[ScoringPolicy] = None, with_errors: bool = False):
+    """Initialise un worker : attache les matrices partagées une seule fois par processus"""
+    input_shm = shared_memory.SharedMemory(name=input_name)
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    columns = output_columns(with_errors)
+
+    _worker_state["shms"] = (input_shm, output_shm)
+    _worker_state["policy"] = policy
+    _worker_state["with_errors"] = with_errors
+    _worker_state["input"] = np.ndarray((rows, NUM_ITEMS), dtype=np.uint8, buffer=input_shm.buf)
+    _worker_state["output"] = np.ndarray((rows, columns), dtype=output_dtype, buffer=output_shm.buf)
+
+
+def _attach_memmap(input_path: str, offset: int, output_name: str, rows: int, output_dtype: str,
+                   policy: Optional[ScoringPolicy] = None, with_errors: bool = False):
+    """Variante pour une matrice déjà sur disque : chaque worker mappe le fichier lui-même"""
+    output_shm = shared_memory.SharedMemory(name=output_name)
+    columns = output_columns(with_errors)
+
+    _worker_state["shms"] = (output_shm,)
+    _worker_state["policy"] = policy
+    _worker_state["with_errors"] = with_errors
+    _worker_state["input"] = np.memmap(input_path, dtype=np.uint8, mode="r",
+                                       offset=offset, shape=(rows, NUM_ITEMS))
+    _worker_state["output"] = np.ndarray((rows, columns), dtype=output_dtype, buffer=output_shm.buf)
+
+
+def _score_rows(bounds: Tuple[int, int]) -> int:
+    start, stop = bounds
+    _worker_state["output"][start:stop] = score_chunk(_worker_state["input"][start:stop],
+                                                      _worker_state["policy"], _worker_state["with_errors"])
+    return stop - start
+
+
+def check_responses(matrix: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Lève ValueError si la matrice n'est pas entière ou contient des valeurs hors de 0..5
+    (0 = non répondu) : elles indexeraient hors de la table de scores. Parcours bloc par bloc,
+    une memmap n'est jamais chargée entièrement.
+    """
+    if not np.issubdtype(matrix.dtype, np.integer):
+        raise ValueError(f"Réponses entières attendues, reçu : {matrix.dtype}")
+
+    for start, stop in iter_chunks(matrix.shape[0], chunk_size):
+        block = matrix[start:stop]
+        if block.size and (block.max() > LIKERT_MAX or block.min() < MISSING):
+            bad = (block > LIKERT_MAX) | (block < MISSING)
+            row = start + int(np.flatnonzero(bad.any(axis=1))[0])
+            raise ValueError(f"Réponses hors échelle (0-{LIKERT_MAX}) à la ligne {row}")
+
+
+def iter_chunks(rows: int, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    for start in range(0, rows, chunk_size):
+        yield start, min(start + chunk_size, rows)
+
+
+def score_cohort(matrix: np.ndarray, workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, output_dtype=np.float32,
+                 policy: Optional[ScoringPolicy] = None, with_errors: bool = False):
+    """
+    Calcule les scores N×8 d'une matrice de réponses uint8 N×72.
+    Les lignes sont découpées en blocs de chunk_size répartis sur `workers` processus ;
+    entrée et sortie vivent en mémoire partagée, aucune ligne n'est sérialisée.
+    Une np.memmap (ou une tranche de lignes) est mappée directement par les workers au lieu d'être copiée.
+    Avec une politique (compile_policy), les axes sous le seuil de couverture valent NaN.
+    with_errors=True renvoie (scores, erreurs types), calculés dans la même passe.
+    Les réponses sont vérifiées (entiers de 0 à 5) avant toute répartition : ValueError sinon.
+    """
+    workers = workers or os.cpu_count() or 1
+    rows = matrix.shape[0]
+    columns = output_columns(with_errors)
+    output_dtype = np.dtype(output_dtype)
+
+    if matrix.ndim != 2 or matrix.shape[1] != NUM_ITEMS:
+        raise ValueError(f"Matrice N×{NUM_ITEMS} attendue, reçu : {matrix.shape}")
+    if with_errors and policy is not None:
+        raise ValueError("Les erreurs types ne sont calculées que pour le scoring sans politique")
+    check_responses(matrix, chunk_size)
+
+    if workers == 1 or rows <= chunk_size:
+        output = np.empty((rows, columns), dtype=output_dtype)
+        for start, stop in iter_chunks(rows, chunk_size):
+            output[start:stop] = score_chunk(matrix[start:stop], policy, with_errors)
+        return split_output(output, with_errors)
+
+    output_shm = shared_memory.SharedMemory(create=True, size=max(rows * columns * output_dtype.itemsize, 1))
+    input_shm = None
+
+    try:
+        source = memmap_source(matrix)
+        if source is not None:
+            initializer = _attach_memmap
+            initargs = (*source, output_shm.name, rows, output_dtype.str, policy, with_errors)
+        else:
+            input_shm = shared_memory.SharedMemory(create=True, size=max(rows * NUM_ITEMS, 1))
+            shared_input = np.ndarray((rows, NUM_ITEMS), dtype=np.uint8, buffer=input_shm.buf)
+            shared_input[:] = matrix
+            del shared_input
+            initializer = _attach_shared
+            initargs = (input_shm.name, output_shm.name, rows, output_dtype.str, policy, with_errors)
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+            for _ in pool.map(_score_rows, iter_chunks(rows, chunk_size)):
+                pass
+
+        shared_output = np.ndarray((rows, columns), dtype=output_dtype, buffer=output_shm.buf)
+        output = shared_output.copy()
+        del shared_output
+        return split_output(output, with_errors)
+    finally:
+        for shm in (input_shm, output_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+
+def split_output(output: np.ndarray, with_errors: bool):
+    if not with_errors:
+        return output
+    num_axes = len(COMPILED_AXES.axis_names)
+    return output[:, :num_axes], output[:, num_axes:]
+
+
+def load_policy(norms_path: Optional[str] = None, weights_path: Optional[str] = None,
+                min_coverage: float = 0.0) -> Optional[ScoringPolicy]:
+    """
+    Politique de scoring des options de ligne de commande : normes de cohorte
+    (statistiques .npz de nyota_psychometrics --save-stats) et poids JSON {item: poids}.
+    Sans aucune option, None : le scoring historique par table.
+    """
+    if norms_path is None and weights_path is None and not min_coverage:
+        return None
+
+    item_means = None
+    if norms_path is not None:
+        from nyota_psychometrics import ItemStatistics
+        item_means = ItemStatistics.load(norms_path).mean()
+
+    item_weights = None
+    if weights_path is not None:
+        with open(weights_path, "r", encoding="utf-8") as f:
+            item_weights = json.load(f)
+
+    return compile_policy(item_weights=item_weights, item_means=item_means, min_coverage=min_coverage)
+
+
+def add_policy_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--norms", metavar="STATS", help="Imputer les items manquants par les moyennes d'une cohorte (.npz)")
+    parser.add_argument("--weights", metavar="JSON", help="Poids des items {item: poids}")
+    parser.add_argument("--min-coverage", type=float, default=0.0,
+                        help="Part minimale (pondérée) d'items répondus par axe, sinon NaN")
+
+
+# ============================================
+# LIGNE DE COMMANDE
+# ============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scoring NYOTA parallèle d'une matrice de réponses (.npy uint8 N×72)")
+    parser.add_argument("input", help="Fichier .npy des réponses")
+    parser.add_argument("output", help="Fichier .npy des scores N×8")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--errors", metavar="PATH", help="Fichier .npy des erreurs types N×8")
+    add_policy_arguments(parser)
+    args = parser.parse_args()
+
+    policy = load_policy(args.norms, args.weights, args.min_coverage)
+    responses = np.load(args.input, mmap_mode="r")
+    start = time.perf_counter()
+    scores = score_cohort(responses, workers=args.workers, chunk_size=args.chunk_size, policy=policy,
+                          with_errors=bool(args.errors))
+    elapsed = time.perf_counter() - start
+
+    if args.errors:
+        scores, standard_errors = scores
+        np.save(args.errors, standard_errors)
+    np.save(args.output, scores)
+    print(f"✅ {len(scores)} profils calculés en {elapsed:.2f}s ({len(scores) / elapsed:,.0f} profils/s)")
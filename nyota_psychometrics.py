@@ -0,0 +1,199 @@
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from nyota_calculator import (
+    COMPILED_AXES,
+    LIKERT_MAX,
+    LIKERT_MIN,
+    MISSING,
+    NUM_ITEMS,
+    CompiledAxes
+)
+from nyota_parallel import DEFAULT_CHUNK_SIZE, iter_chunks, memmap_source
+from nyota_quality import ALL_FLAGS, assess_quality
+
+
+# ============================================
+# ANALYSE PSYCHOMÉTRIQUE EN UNE PASSE
+# ============================================
+
+class ItemStatistics:
+    """
+    Statistiques suffisantes d'une cohorte (lignes complètes uniquement) :
+    effectif, sommes et produits croisés des 72 items, en entiers exacts.
+    Deux accumulateurs calculés sur des blocs disjoints se fusionnent par simple addition.
+    """
+
+    def __init__(self, num_items: int = NUM_ITEMS):
+        self.count = 0
+        self.skipped = 0
+        self.sums = np.zeros(num_items, dtype=np.int64)
+        self.cross_products = np.zeros((num_items, num_items), dtype=np.int64)
+
+    def update(self, chunk: np.ndarray, exclude: int = 0) -> "ItemStatistics":
+        """exclude : signalements de qualité (nyota_quality) dont les lignes sont écartées comme incomplètes"""
+        chunk = np.atleast_2d(chunk)
+        complete = (chunk != MISSING).all(axis=1)
+        if exclude:
+            complete &= (assess_quality(chunk)["flags"] & exclude) == 0
+        rows = chunk[complete].astype(np.float64)
+
+        self.count += len(rows)
+        self.skipped += int(len(chunk) - len(rows))
+        # Produits en float64 (exacts tant que 25 × taille du bloc < 2**53), cumulés en int64
+        self.sums += rows.sum(axis=0).astype(np.int64)
+        self.cross_products += (rows.T @ rows).astype(np.int64)
+        return self
+
+    def merge(self, other: "ItemStatistics") -> "ItemStatistics":
+        self.count += other.count
+        self.skipped += other.skipped
+        self.sums += other.sums
+        self.cross_products += other.cross_products
+        return self
+
+    def covariance(self) -> np.ndarray:
+        n = self.count
+        if n < 2:
+            raise ValueError("❌ Au moins 2 réponses complètes sont nécessaires")
+        mean = self.sums / n
+        return (self.cross_products - n * np.outer(mean, mean)) / (n - 1)
+
+    def mean(self) -> np.ndarray:
+        return self.sums / max(self.count, 1)
+
+    def save(self, path: str):
+        np.savez(path, count=self.count, skipped=self.skipped,
+                 sums=self.sums, cross_products=self.cross_products)
+
+    @classmethod
+    def load(cls, path: str) -> "ItemStatistics":
+        data = np.load(path)
+        stats = cls(len(data["sums"]))
+        stats.count = int(data["count"])
+        stats.skipped = int(data["skipped"])
+        stats.sums = data["sums"].astype(np.int64)
+        stats.cross_products = data["cross_products"].astype(np.int64)
+        return stats
+
+
+def _chunk_statistics(args) -> ItemStatistics:
+    path, offset, rows, start, stop, exclude = args
+    matrix = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=(rows, NUM_ITEMS))
+    return ItemStatistics().update(matrix[start:stop], exclude)
+
+
+def accumulate(matrix: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE,
+               workers: Optional[int] = None, exclude: int = 0) -> ItemStatistics:
+    """
+    Parcourt une matrice N×72 (de préférence une memmap) bloc par bloc sans la charger entièrement.
+    Avec workers > 1 sur une memmap, chaque processus mappe le fichier et renvoie un accumulateur partiel.
+    exclude écarte les réponses signalées (nyota_quality) pour que les normes n'en dépendent pas.
+    """
+    rows = matrix.shape[0]
+    source = memmap_source(matrix) if workers and workers > 1 else None
+
+    if source is not None:
+        tasks = [(*source, rows, start, stop, exclude)
+                 for start, stop in iter_chunks(rows, chunk_size)]
+        total = ItemStatistics()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for partial in pool.map(_chunk_statistics, tasks):
+                total.merge(partial)
+        return total
+
+    return accumulate_chunks((matrix[start:stop] for start, stop in iter_chunks(rows, chunk_size)), exclude)
+
+
+def accumulate_chunks(chunks: Iterable[np.ndarray], exclude: int = 0) -> ItemStatistics:
+    stats = ItemStatistics()
+    for chunk in chunks:
+        stats.update(chunk, exclude)
+    return stats
+
+
+def _cronbach_alpha(covariance: np.ndarray) -> float:
+    k = covariance.shape[0]
+    total_variance = covariance.sum()
+    if k < 2 or total_variance <= 0:
+        return float("nan")
+    return float(k / (k - 1) * (1 - np.trace(covariance) / total_variance))
+
+
+def _rounded(value: float):
+    """Arrondi sérialisable en JSON : une statistique indéfinie (item sans variance) vaut None"""
+    value = float(value)
+    return round(value, 4) if np.isfinite(value) else None
+
+
+def psychometric_report(stats: ItemStatistics, layout: CompiledAxes = COMPILED_AXES) -> Dict[str, Any]:
+    """
+    Pour chaque axe : alpha de Cronbach, corrélation item-total corrigée, alpha si l'item est retiré,
+    et contrôle du sens des items inversés (corrélation corrigée attendue positive après inversion).
+    """
+    covariance = stats.covariance()
+    means = stats.mean()
+    report = {"respondents": stats.count, "skipped_incomplete": stats.skipped, "axes": {}}
+
+    for row, axis in enumerate(layout.axis_names):
+        columns = np.flatnonzero(layout.membership[row])
+        signs = np.where(layout.invert[row, columns], -1.0, 1.0)
+        axis_cov = covariance[np.ix_(columns, columns)] * np.outer(signs, signs)
+
+        item_variance = np.diag(axis_cov)
+        total_variance = axis_cov.sum()
+        item_total_cov = axis_cov.sum(axis=1)
+        rest_variance = total_variance - 2 * item_total_cov + item_variance
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corrected_r = (item_total_cov - item_variance) / np.sqrt(item_variance * rest_variance)
+
+        items = []
+        for i, column in enumerate(columns):
+            keep = np.arange(len(columns)) != i
+            mean = means[column] if signs[i] > 0 else LIKERT_MAX + LIKERT_MIN - means[column]
+            items.append({
+                "item": int(column) + 1,
+                "inverted": bool(signs[i] < 0),
+                "mean": _rounded(mean),
+                "variance": _rounded(item_variance[i]),
+                "item_total_r": _rounded(corrected_r[i]),
+                "alpha_if_deleted": _rounded(_cronbach_alpha(axis_cov[np.ix_(keep, keep)])),
+                "direction_ok": bool(corrected_r[i] > 0)
+            })
+
+        report["axes"][axis] = {
+            "items": len(columns),
+            "alpha": _rounded(_cronbach_alpha(axis_cov)),
+            "item_statistics": items,
+            "direction_warnings": [item["item"] for item in items if not item["direction_ok"]]
+        }
+
+    return report
+
+
+# ============================================
+# LIGNE DE COMMANDE
+# ============================================
+
+if __name__ == "__main__":
+    from nyota_store import ResponseStore
+
+    parser = argparse.ArgumentParser(description="Fidélité des axes NYOTA sur une archive de réponses")
+    parser.add_argument("store", help="Répertoire d'une archive nyota_store")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--save-stats", metavar="PATH", help="Sauvegarder les statistiques suffisantes (.npz)")
+    parser.add_argument("--exclude-flagged", action="store_true",
+                        help="Écarter les réponses signalées par nyota_quality (faible effort)")
+    args = parser.parse_args()
+
+    stats = accumulate(ResponseStore(args.store).matrix(), args.chunk_size, args.workers,
+                       exclude=ALL_FLAGS if args.exclude_flagged else 0)
+    if args.save_stats:
+        stats.save(args.save_stats)
+
+    print(json.dumps(psychometric_report(stats), ensure_ascii=False, indent=2, allow_nan=False))
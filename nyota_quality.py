@@ -0,0 +1,258 @@
+import argparse
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from nyota_calculator import (
+    COMPILED_AXES,
+    LIKERT_MAX,
+    LIKERT_MIN,
+    MISSING,
+    CompiledAxes,
+    compute_scores_matrix
+)
+
+
+# ============================================
+# QUALITÉ DES RÉPONSES (FAIBLE EFFORT)
+# ============================================
+
+# Bits du masque de signalement (uint8 par répondant, 0 = aucun signalement)
+QUALITY_FLAGS = {
+    "straight_lining": 1,   # longue série de réponses identiques
+    "patterned": 2,         # motif qui se répète (4,5,3,4,5,4,...)
+    "low_variance": 4,      # quasiment la même réponse partout
+    "inconsistent": 8,      # items inversés et directs d'un même axe d'accord entre eux
+    "speeding": 16,         # temps médian par item trop court
+    "timing_outlier": 32    # temps médian très éloigné de celui de la cohorte
+}
+ALL_FLAGS = sum(QUALITY_FLAGS.values())
+
+DEFAULT_THRESHOLDS = {
+    "longest_run": 12,            # réponses identiques consécutives
+    "pattern_agreement": 0.7,     # part des items égaux à l'item situé 2, 3 ou 4 positions avant
+    "min_std": 0.4,               # écart type intra-individuel minimal (échelle 1-5)
+    "polarity_gap": 2.0,          # écart entre moyennes directe et inversée d'un axe mixte
+    "min_seconds_per_item": 1.0,
+    "timing_z": 3.5               # z robuste (médiane/MAD) du log du temps médian par item
+}
+
+PATTERN_LAGS = (2, 3, 4)
+MAD_SCALE = 1.4826
+
+
+def _longest_run(values: np.ndarray, answered: np.ndarray) -> np.ndarray:
+    """Plus longue série de réponses identiques consécutives (un item manquant coupe la série)"""
+    same = (values[:, 1:] == values[:, :-1]) & answered[:, 1:] & answered[:, :-1]
+    positions = np.arange(1, values.shape[1])
+    run_start = np.maximum.accumulate(np.where(same, 0, positions), axis=1)
+    runs = positions - run_start + 1
+    longest = runs.max(axis=1, initial=1)
+    return np.where(answered.any(axis=1), longest, 0)
+
+
+def _pattern_agreement(values: np.ndarray, answered: np.ndarray) -> np.ndarray:
+    """Part maximale (sur PATTERN_LAGS) des items identiques à l'item `lag` positions plus tôt"""
+    agreement = np.full(len(values), np.nan)
+    for lag in PATTERN_LAGS:
+        both = answered[:, lag:] & answered[:, :-lag]
+        pairs = both.sum(axis=1)
+        equal = ((values[:, lag:] == values[:, :-lag]) & both).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            agreement = np.fmax(agreement, np.where(pairs > 0, equal / pairs, np.nan))
+    return agreement
+
+
+def _polarity_gap(values: np.ndarray, answered: np.ndarray, layout: CompiledAxes) -> np.ndarray:
+    """
+    Pour chaque axe qui mêle items directs et inversés (Résilience & Stress dans la disposition
+    d'origine) : écart entre la moyenne des items directs et celle des items inversés une fois
+    retournés. Un répondant attentif donne des moyennes proches ; le plus grand écart est retenu.
+    """
+    mixed = (layout.direct_weights.sum(axis=0) > 0) & (layout.invert_weights.sum(axis=0) > 0)
+    if not mixed.any():
+        return np.full(len(values), np.nan)
+
+    direct = layout.direct_weights[:, mixed]
+    inverted = layout.invert_weights[:, mixed]
+    direct_counts = answered @ direct
+    inverted_counts = answered @ inverted
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        direct_mean = (values @ direct) / direct_counts
+        inverted_mean = LIKERT_MAX + LIKERT_MIN - (values @ inverted) / inverted_counts
+        gap = np.abs(direct_mean - inverted_mean)
+    gap[(direct_counts == 0) | (inverted_counts == 0)] = np.nan
+
+    with np.errstate(all="ignore"):
+        return np.where(np.isnan(gap).all(axis=1), np.nan, np.nanmax(np.nan_to_num(gap, nan=-1.0), axis=1))
+
+
+def _median_seconds(timings: np.ndarray) -> np.ndarray:
+    timings = np.where(timings > 0, timings, np.nan)
+    result = np.full(len(timings), np.nan)
+    known = ~np.isnan(timings).all(axis=1)
+    result[known] = np.nanmedian(timings[known], axis=1)
+    return result
+
+
+def timing_reference(median_seconds: np.ndarray) -> Tuple[float, float]:
+    """(centre, échelle) robustes du log du temps médian par item d'une cohorte"""
+    logs = np.log(median_seconds[~np.isnan(median_seconds)])
+    if len(logs) == 0:
+        return float("nan"), float("nan")
+    center = float(np.median(logs))
+    return center, float(MAD_SCALE * np.median(np.abs(logs - center)))
+
+
+def assess_quality(matrix: np.ndarray, timings: Optional[np.ndarray] = None,
+                   thresholds: Optional[Dict[str, float]] = None,
+                   reference: Optional[Tuple[float, float]] = None,
+                   layout: CompiledAxes = COMPILED_AXES) -> Dict[str, np.ndarray]:
+    """
+    Indicateurs de qualité d'un lot N×72 (0 = non répondu) en opérations vectorisées, et masque
+    de signalement combiné. timings : secondes par item N×72 (NaN ou 0 = inconnu), facultatif.
+    Le temps de chaque ligne est comparé à `reference` (voir timing_reference) ou, à défaut, au lot lui-même.
+    Un indicateur NaN (trop peu de réponses) ne déclenche aucun signalement.
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    values = np.atleast_2d(matrix).astype(np.float64)
+    answered = values != MISSING
+    counts = answered.sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = values.sum(axis=1) / counts
+        variance = (values ** 2).sum(axis=1) / counts - mean ** 2
+    std = np.where(counts >= 2, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+    indicators = {
+        "longest_run": _longest_run(values, answered),
+        "pattern_agreement": _pattern_agreement(values, answered),
+        "response_std": std,
+        "polarity_gap": _polarity_gap(values, answered, layout)
+    }
+
+    with np.errstate(invalid="ignore"):
+        hits = {
+            "straight_lining": indicators["longest_run"] >= thresholds["longest_run"],
+            "patterned": indicators["pattern_agreement"] >= thresholds["pattern_agreement"],
+            "low_variance": std < thresholds["min_std"],
+            "inconsistent": indicators["polarity_gap"] >= thresholds["polarity_gap"]
+        }
+
+    if timings is not None:
+        median_seconds = _median_seconds(np.atleast_2d(np.asarray(timings, dtype=np.float64)))
+        center, scale = reference if reference is not None else timing_reference(median_seconds)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = (np.log(median_seconds) - center) / scale if scale > 0 else np.full(len(values), np.nan)
+            hits["speeding"] = median_seconds < thresholds["min_seconds_per_item"]
+            hits["timing_outlier"] = np.abs(z) > thresholds["timing_z"]
+        indicators["median_seconds"] = median_seconds
+        indicators["timing_z"] = z
+
+    flags = np.zeros(len(values), dtype=np.uint8)
+    for name, hit in hits.items():
+        flags[hit] |= QUALITY_FLAGS[name]
+    indicators["flags"] = flags
+    return indicators
+
+
+def score_with_quality(matrix: np.ndarray, timings: Optional[np.ndarray] = None,
+                       thresholds: Optional[Dict[str, float]] = None,
+                       reference: Optional[Tuple[float, float]] = None,
+                       layout: CompiledAxes = COMPILED_AXES) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Scores N×8 et indicateurs de qualité du même lot"""
+    return compute_scores_matrix(matrix, layout), assess_quality(matrix, timings, thresholds, reference, layout)
+
+
+def flag_names(flags: int) -> List[str]:
+    return [name for name, bit in QUALITY_FLAGS.items() if flags & bit]
+
+
+def parse_flags(names: Iterable[str]) -> int:
+    """Masque des signalements nommés ; « all » les sélectionne tous"""
+    mask = 0
+    for name in names:
+        if name == "all":
+            mask |= ALL_FLAGS
+        elif name in QUALITY_FLAGS:
+            mask |= QUALITY_FLAGS[name]
+        else:
+            raise ValueError(f"❌ Signalement inconnu : {name} (attendu : all, {', '.join(QUALITY_FLAGS)})")
+    return mask
+
+
+def quality_summary(quality: Dict[str, np.ndarray], row: int = 0) -> Dict[str, Any]:
+    """Indicateurs d'une ligne, arrondis et sérialisables en JSON (NaN → None)"""
+    summary = {"flags": flag_names(int(quality["flags"][row]))}
+    for name, values in quality.items():
+        if name != "flags":
+            value = float(values[row])
+            summary[name] = None if np.isnan(value) else round(value, 4)
+    return summary
+
+
+# ============================================
+# FILTRAGE PAR LOTS ET EN FLUX
+# ============================================
+
+def iter_quality_chunks(chunks: Iterable[np.ndarray], exclude: int = ALL_FLAGS,
+                        timing_chunks: Optional[Iterable[np.ndarray]] = None,
+                        thresholds: Optional[Dict[str, float]] = None,
+                        reference: Optional[Tuple[float, float]] = None,
+                        layout: CompiledAxes = COMPILED_AXES) -> Iterator[Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]]:
+    """
+    Filtre un flux de blocs N×72 : pour chaque bloc, renvoie (lignes gardées, scores, qualité),
+    la qualité portant sur tout le bloc (masque "kept" inclus). En flux, la cohorte complète
+    n'est pas connue : sans `reference`, seul le seuil absolu de temps s'applique.
+    """
+    timing_chunks = iter(timing_chunks) if timing_chunks is not None else None
+
+    for chunk in chunks:
+        timings = next(timing_chunks) if timing_chunks is not None else None
+        quality = assess_quality(chunk, timings, thresholds,
+                                 reference if reference is not None else (np.nan, np.nan), layout)
+        kept = (quality["flags"] & exclude) == 0
+        quality["kept"] = kept
+        rows = np.atleast_2d(chunk)[kept]
+        yield rows, compute_scores_matrix(rows, layout), quality
+
+
+def quality_flags(matrix: np.ndarray, chunk_size: int = 65536, timings: Optional[np.ndarray] = None,
+                  thresholds: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Masques de signalement de toute une matrice (de préférence une memmap), bloc par bloc"""
+    reference = None
+    if timings is not None:
+        reference = timing_reference(_median_seconds(np.asarray(timings, dtype=np.float64)))
+
+    flags = np.empty(matrix.shape[0], dtype=np.uint8)
+    for start in range(0, matrix.shape[0], chunk_size):
+        stop = min(start + chunk_size, matrix.shape[0])
+        chunk_timings = timings[start:stop] if timings is not None else None
+        flags[start:stop] = assess_quality(matrix[start:stop], chunk_timings, thresholds, reference)["flags"]
+    return flags
+
+
+# ============================================
+# LIGNE DE COMMANDE
+# ============================================
+
+if __name__ == "__main__":
+    from nyota_store import ResponseStore
+
+    parser = argparse.ArgumentParser(description="Signalement des réponses à faible effort d'une archive NYOTA")
+    parser.add_argument("store", help="Répertoire d'une archive nyota_store")
+    parser.add_argument("--timings", metavar="NPY", help="Temps de réponse par item (.npy N×72, secondes)")
+    parser.add_argument("--output", metavar="NPY", help="Sauvegarder les masques de signalement (.npy uint8)")
+    args = parser.parse_args()
+
+    store = ResponseStore(args.store)
+    timings = np.load(args.timings, mmap_mode="r") if args.timings else None
+    flags = quality_flags(store.matrix(), timings=timings)
+    if args.output:
+        np.save(args.output, flags)
+
+    counts = {name: int(np.count_nonzero(flags & bit)) for name, bit in QUALITY_FLAGS.items()}
+    print(json.dumps({"respondents": len(flags), "flagged": int(np.count_nonzero(flags)), "by_flag": counts},
+                     ensure_ascii=False, indent=2))
@@ -0,0 +1,241 @@
+import io
+from typing import Dict, Optional
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from PIL import Image
+
+
+# ============================================
+# RENDU RADAR SANS ÉTAT GLOBAL (FIGURE + AGG)
+# ============================================
+
+# Chaque rendu possède sa Figure et son canevas Agg : aucun passage par pyplot,
+# plusieurs threads peuvent donc dessiner en même temps dans un même processus.
+
+KIVIAT_STYLE = {
+    "figsize": (12, 12),
+    "dpi": 300,
+    "color": "#0066FF",
+    "linewidth": 3,
+    "markersize": 8,
+    "fill_alpha": 0.3,
+    "label_size": 12,
+    "label_weight": "bold",
+    "text_color": "#1F2937",
+    "grid_color": "#E5E7EB",
+    "tick_labels": True,
+    "title": "NYOTA Personality – Profil à 8 dimensions",
+    "title_pad": 30,
+    "title_size": 18,
+    "title_weight": "bold",
+    "tight_layout": True
+}
+
+SIMPLE_STYLE = {
+    "figsize": (10, 10),
+    "dpi": 150,
+    "color": "#2E86AB",
+    "linewidth": 2,
+    "markersize": 6,
+    "fill_alpha": 0.25,
+    "label_size": 9,
+    "label_weight": "normal",
+    "text_color": "black",
+    "grid_color": "#b0b0b0",
+    "tick_labels": False,
+    "title": "NYOTA Personality - Profil à 8 dimensions",
+    "title_pad": 20,
+    "title_size": "large",
+    "title_weight": "normal",
+    "tight_layout": False
+}
+
+
+def radar_axes(fig: Figure, labels, style: dict):
+    """Axes polaires du radar (sens horaire depuis le haut, échelle 0-100) et libellés des axes"""
+    angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
+
+    ax = fig.add_subplot(111, polar=True)
+    ax.set_theta_offset(np.pi / 2)
+    ax.set_theta_direction(-1)
+
+    ax.set_xticks(angles)
+    ax.set_xticklabels(labels, fontsize=style["label_size"], fontweight=style["label_weight"],
+                       color=style["text_color"])
+
+    ax.set_ylim(0, 100)
+    if style["tick_labels"]:
+        ax.set_yticks([20, 40, 60, 80, 100])
+        ax.set_yticklabels(['20', '40', '60', '80', '100'], fontsize=10, color='gray')
+    return ax, angles
+
+
+def finish_radar(ax, style: dict):
+    ax.grid(True, linestyle='--', alpha=0.7, color=style["grid_color"])
+    ax.set_title(style["title"], pad=style["title_pad"], fontsize=style["title_size"],
+                 fontweight=style["title_weight"], color=style["text_color"])
+
+
+def draw_radar(fig: Figure, scores: Dict[str, float], style: dict = KIVIAT_STYLE):
+    """Dessine le radar des scores dans une figure fournie (pyplot ou autonome)"""
+    ax, angles = radar_axes(fig, list(scores.keys()), style)
+    values = list(scores.values())
+    values += values[:1]
+    angles += angles[:1]
+
+    ax.plot(angles, values, 'o-', linewidth=style["linewidth"], color=style["color"],
+            label='Profil', markersize=style["markersize"])
+    ax.fill(angles, values, alpha=style["fill_alpha"], color=style["color"])
+    finish_radar(ax, style)
+    return ax
+
+
+def radar_figure(scores: Dict[str, float], style: dict = KIVIAT_STYLE) -> Figure:
+    """Figure autonome (canevas Agg attaché), indépendante de pyplot"""
+    fig = Figure(figsize=style["figsize"])
+    FigureCanvasAgg(fig)
+    draw_radar(fig, scores, style)
+    if style["tight_layout"]:
+        fig.tight_layout()
+    return fig
+
+
+def render_radar_png(scores: Dict[str, float], style: dict = KIVIAT_STYLE, dpi: Optional[float] = None) -> bytes:
+    """PNG du radar des scores ; sûr à appeler depuis plusieurs threads"""
+    if len(scores) != 8:
+        raise ValueError(f"⚠️ Le diagramme nécessite 8 axes, trouvé : {len(scores)}")
+
+    fig = radar_figure(scores, style)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi or style["dpi"], bbox_inches='tight', facecolor='white')
+    return buffer.getvalue()
+
+
+# ============================================
+# VARIANTES D'IMAGE (TAILLE × FORMAT)
+# ============================================
+
+IMAGE_FORMATS = {
+    "png": "image/png",
+    "webp": "image/webp"
+}
+
+# Chaque variante est rendue directement à sa résolution (jamais réduite depuis une grande image)
+IMAGE_VARIANTS = {
+    "thumbnail": {"figsize": (5, 5), "dpi": 60, "label_size": 7, "title_size": 9, "title_pad": 10,
+                  "linewidth": 1.5, "markersize": 3},
+    "screen": {},
+    "print": {"dpi": 300}
+}
+
+DEFAULT_VARIANT = "screen"
+WEBP_QUALITY = 80
+PNG_COLORS = 256
+
+
+def optimize_png(png: bytes, colors: int = PNG_COLORS) -> bytes:
+    """PNG en palette : le radar n'utilise que quelques teintes, 3 à 4 fois moins d'octets"""
+    image = Image.open(io.BytesIO(png)).convert("RGB").quantize(colors, method=Image.Quantize.FASTOCTREE)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=9)
+    return buffer.getvalue()
+
+
+def render_radar_image(scores: Dict[str, float], style: dict = SIMPLE_STYLE,
+                       variant: str = DEFAULT_VARIANT, fmt: str = "png") -> bytes:
+    """Radar dans une variante (thumbnail, screen, print) et un format (png optimisé, webp)"""
+    if variant not in IMAGE_VARIANTS:
+        raise ValueError(f"Variante inconnue : {variant}")
+    if fmt not in IMAGE_FORMATS:
+        raise ValueError(f"Format d'image inconnu : {fmt}")
+    if len(scores) != 8:
+        raise ValueError(f"⚠️ Le diagramme nécessite 8 axes, trouvé : {len(scores)}")
+
+    style = {**style, **IMAGE_VARIANTS[variant]}
+    return encode_figure(radar_figure(scores, style), style["dpi"], fmt)
+
+
+def encode_figure(fig: Figure, dpi: float, fmt: str = "png") -> bytes:
+    """WebP, ou PNG en palette (optimize_png)"""
+    buffer = io.BytesIO()
+
+    if fmt == "webp":
+        fig.savefig(buffer, format="webp", dpi=dpi, bbox_inches='tight', facecolor='white',
+                    pil_kwargs={"quality": WEBP_QUALITY, "method": 4})
+        return buffer.getvalue()
+
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches='tight', facecolor='white')
+    return optimize_png(buffer.getvalue())
+
+
+# ============================================
+# RADAR D'ÉQUIPE (PROFILS SUPERPOSÉS)
+# ============================================
+
+TEAM_STYLE = {
+    **KIVIAT_STYLE,
+    "figsize": (10, 10),
+    "dpi": 150,
+    "title": "NYOTA Personality – Profil d'équipe",
+    "member_color": "#6B7280",
+    "member_linewidth": 0.8,
+    "member_alpha": (0.04, 0.5),  # opacité d'un profil individuel, plus faible quand l'équipe grandit
+    "band_alpha": 0.2,
+    "tight_layout": False
+}
+
+
+def draw_team_radar(fig: Figure, axis_names, member_scores: np.ndarray, profile: dict,
+                    style: dict = TEAM_STYLE):
+    """
+    Radar d'équipe : tous les profils individuels dans une seule PolyCollection (un seul appel
+    de dessin, quelle que soit la taille de l'équipe), la bande moyenne ± écart type,
+    puis la moyenne tracée comme un profil de plot_kiviat. La couverture partielle d'un axe
+    est indiquée sous son libellé. Les membres sans score sur un axe (NaN) ne sont pas superposés.
+    """
+    coverage = np.asarray(profile["coverage"], dtype=np.float64)
+    labels = [axis if c >= 1 else f"{axis}\n({c:.0%} couvert)" for axis, c in zip(axis_names, coverage)]
+    ax, angles = radar_axes(fig, labels, style)
+    theta = np.asarray(angles)
+
+    members = np.asarray(member_scores, dtype=np.float64)
+    members = members[~np.isnan(members).any(axis=1)]
+    if len(members):
+        low_alpha, high_alpha = style["member_alpha"]
+        vertices = np.stack([np.broadcast_to(theta, members.shape), members], axis=-1)
+        ax.add_collection(PolyCollection(vertices, closed=True, facecolors="none",
+                                         edgecolors=style["member_color"], linewidths=style["member_linewidth"],
+                                         alpha=float(np.clip(8 / len(members), low_alpha, high_alpha))),
+                          autolim=False)  # échelle fixe 0-100 : inutile de parcourir les sommets
+
+    closed = np.append(theta, theta[0])
+    mean = np.nan_to_num(np.asarray(profile["mean"], dtype=np.float64))
+    spread = np.nan_to_num(np.asarray(profile["std"], dtype=np.float64))
+    low, high = np.clip(mean - spread, 0, 100), np.clip(mean + spread, 0, 100)
+    ax.fill_between(closed, np.append(low, low[0]), np.append(high, high[0]),
+                    color=style["color"], alpha=style["band_alpha"], linewidth=0)
+    ax.plot(closed, np.append(mean, mean[0]), 'o-', linewidth=style["linewidth"], color=style["color"],
+            label='Moyenne', markersize=style["markersize"])
+
+    finish_radar(ax, {**style, "title": f"{style['title']} ({int(profile['members'])} membres)"})
+    return ax
+
+
+def render_team_image(axis_names, member_scores: np.ndarray, profile: dict, style: dict = TEAM_STYLE,
+                      variant: str = DEFAULT_VARIANT, fmt: str = "png") -> bytes:
+    """Radar d'équipe dans une variante et un format, comme render_radar_image"""
+    if variant not in IMAGE_VARIANTS:
+        raise ValueError(f"Variante inconnue : {variant}")
+    if fmt not in IMAGE_FORMATS:
+        raise ValueError(f"Format d'image inconnu : {fmt}")
+    if len(axis_names) != 8:
+        raise ValueError(f"⚠️ Le diagramme nécessite 8 axes, trouvé : {len(axis_names)}")
+
+    style = {**style, **IMAGE_VARIANTS[variant]}
+    fig = Figure(figsize=style["figsize"])
+    FigureCanvasAgg(fig)
+    draw_team_radar(fig, axis_names, member_scores, profile, style)
+    return encode_figure(fig, style["dpi"], fmt)
@@ -0,0 +1,102 @@
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # fcntl est POSIX : sans lui, la coalescence reste limitée au processus
+    fcntl = None
+
+
+# ============================================
+# COALESCENCE DES CALCULS IDENTIQUES (SINGLE-FLIGHT)
+# ============================================
+
+LOCK_STRIPES = 256  # nombre fixe de fichiers de verrou, quel que soit le nombre de clés
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.failed = False
+
+
+class SingleFlight:
+    """
+    Une seule exécution en vol par clé : les appels concurrents pour la même clé attendent
+    le premier et reçoivent son résultat. Avec lock_dir, un verrou fichier coordonne aussi
+    les processus d'une machine : celui qui obtient le verrou après un autre relit d'abord
+    le résultat partagé (lookup) au lieu de recalculer.
+    Les erreurs ne sont pas partagées : chaque appel en attente réessaie alors pour son compte.
+    """
+
+    def __init__(self, lock_dir: Optional[str] = None):
+        self.lock_dir = lock_dir if fcntl is not None else None
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    @contextmanager
+    def _process_lock(self, key: str):
+        if not self.lock_dir:
+            yield
+            return
+
+        stripe = int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:8], 16) % LOCK_STRIPES
+        with open(os.path.join(self.lock_dir, f"render-{stripe:03d}.lock"), "a+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def do(self, key: str, fn: Callable[[], Any],
+           lookup: Optional[Callable[[], Any]] = None) -> Tuple[Any, bool]:
+        """Renvoie (valeur, partagée) ; partagée=True si la valeur vient d'un autre appel"""
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+                    self.leaders += 1
+
+            if not leader:
+                flight.done.wait()
+                if not flight.failed:
+                    with self._lock:
+                        self.coalesced += 1
+                    return flight.value, True
+                continue
+
+            try:
+                with self._process_lock(key):
+                    value = lookup() if lookup is not None else None
+                    shared = value is not None
+                    if not shared:
+                        value = fn()
+                flight.value = value
+                return value, shared
+            except BaseException:
+                flight.failed = True
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_flight": len(self._flights),
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "cross_process": self.lock_dir is not None
+            }
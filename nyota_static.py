@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import re
+from typing import Dict, NamedTuple
+
+from nyota_compression import compress, negotiate_encoding, supported_encodings
+
+
+# ============================================
+# FRONTEND STATIQUE EMPREINTÉ ET PRÉCOMPRESSÉ
+# ============================================
+
+FRONTEND_ASSETS = {
+    "style.css": "text/css",
+    "question.js": "application/javascript",
+    "script.js": "application/javascript"
+}
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+INDEX_CACHE_CONTROL = "no-cache"
+
+
+class StaticAsset(NamedTuple):
+    mimetype: str
+    etag: str
+    variants: Dict[str, bytes]
+
+
+def fingerprinted_name(filename: str, digest: str) -> str:
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{digest[:12]}{ext}"
+
+
+def build_asset(data: bytes, mimetype: str) -> StaticAsset:
+    """Empreinte du contenu et variantes gzip/brotli calculées une fois pour toutes"""
+    digest = hashlib.sha256(data).hexdigest()
+    variants = {"identity": data}
+    for encoding in supported_encodings():
+        variants[encoding] = compress(data, encoding)
+    return StaticAsset(mimetype, digest, variants)
+
+
+def build_frontend(root: str, api_url: str = "") -> Dict[str, StaticAsset]:
+    """
+    Construit le bundle servi par l'application : chaque fichier reçoit un nom empreinté
+    (style.<hash>.css…) et index.html est réécrit pour pointer vers ces noms.
+    """
+    assets = {}
+    renamed = {}
+
+    for filename, mimetype in FRONTEND_ASSETS.items():
+        with open(os.path.join(root, filename), "rb") as f:
+            asset = build_asset(f.read(), mimetype)
+        name = fingerprinted_name(filename, asset.etag)
+        assets[name] = asset
+        renamed[filename] = name
+
+    with open(os.path.join(root, "index.html"), "r", encoding="utf-8") as f:
+        index = f.read()
+
+    for filename, name in renamed.items():
+        index = re.sub(rf'(href|src)="{re.escape(filename)}"', rf'\1="/assets/{name}"', index)
+
+    # Le frontend servi ici appelle l'API sur la même origine
+    api_config = f"<script>window.NYOTA_API_URL = {json.dumps(api_url)};</script>\n    "
+    index = index.replace('<script src="/assets/', api_config + '<script src="/assets/', 1)
+
+    assets["index.html"] = build_asset(index.encode("utf-8"), "text/html")
+    return assets
+
+
+def register_frontend(app, root: str, api_url: str = ""):
+    """Sert index.html sur / et les fichiers empreintés sous /assets/ avec cache immuable et ETag"""
+    from flask import abort, request
+
+    assets = build_frontend(root, api_url)
+
+    def serve(name: str, cache_control: str):
+        asset = assets.get(name)
+        if asset is None:
+            abort(404)
+
+        encoding = negotiate_encoding(request.headers.get("Accept-Encoding", ""))
+        body = asset.variants.get(encoding) if encoding else None
+
+        response = app.response_class(body if body is not None else asset.variants["identity"],
+                                      mimetype=asset.mimetype)
+        if body is not None:
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        response.headers["Cache-Control"] = cache_control
+        response.set_etag(asset.etag, weak=body is not None)
+        # Réponse déjà compressée : pas de recompression par init_compression
+        response.direct_passthrough = True
+        return response.make_conditional(request)
+
+    @app.route("/")
+    def frontend_index():
+        return serve("index.html", INDEX_CACHE_CONTROL)
+
+    @app.route("/assets/<name>")
+    def frontend_asset(name):
+        if name == "index.html":
+            abort(404)
+        return serve(name, IMMUTABLE_CACHE_CONTROL)
+
+    return assets
@@ -0,0 +1,219 @@
+import argparse
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from nyota_calculator import NUM_ITEMS, responses_to_vector, validate_matrix
+from nyota_quality import ALL_FLAGS, assess_quality, flag_names, quality_flags
+
+
+# ============================================
+# STOCKAGE BINAIRE DES RÉPONSES (MEMMAP)
+# ============================================
+
+RECORDS_FILE = "responses.u8"
+INDEX_FILE = "ids.txt"
+
+
+class ResponseStore:
+    """
+    Archive de réponses en ajout seul : un enregistrement uint8 de 72 octets par répondant
+    (0 = item non répondu) dans responses.u8, et l'identifiant de chaque ligne dans ids.txt.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.records_path = os.path.join(directory, RECORDS_FILE)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self._rows = {}
+        self._ids = []
+        self._matrix = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                self._ids = f.read().splitlines()
+        self._rows = {respondent_id: row for row, respondent_id in enumerate(self._ids)}
+
+        # Reprise après une écriture interrompue : l'index fait foi
+        expected_size = len(self._ids) * NUM_ITEMS
+        if not os.path.exists(self.records_path):
+            open(self.records_path, "wb").close()
+        if os.path.getsize(self.records_path) != expected_size:
+            with open(self.records_path, "r+b") as f:
+                f.truncate(expected_size)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, respondent_id: str) -> bool:
+        return respondent_id in self._rows
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    def row_of(self, respondent_id: str) -> int:
+        return self._rows[respondent_id]
+
+    def matrix(self) -> np.ndarray:
+        """Matrice N×72 mappée en lecture seule (aucune copie, chargement quasi instantané)"""
+        if self._matrix is None or self._matrix.shape[0] != len(self._ids):
+            if not self._ids:
+                return np.zeros((0, NUM_ITEMS), dtype=np.uint8)
+            self._matrix = np.memmap(self.records_path, dtype=np.uint8, mode="r",
+                                     shape=(len(self._ids), NUM_ITEMS))
+        return self._matrix
+
+    def get(self, respondent_id: str) -> np.ndarray:
+        return self.matrix()[self._rows[respondent_id]]
+
+    def append_many(self, records: Iterable[Tuple[str, np.ndarray]]) -> int:
+        ids = []
+        seen = set()
+        vectors = []
+
+        for respondent_id, vector in records:
+            if respondent_id in self._rows or respondent_id in seen:
+                raise ValueError(f"Répondant déjà présent : {respondent_id}")
+            if not respondent_id or "\n" in respondent_id or "\r" in respondent_id:
+                raise ValueError(f"Identifiant invalide : {respondent_id!r}")
+            ids.append(respondent_id)
+            seen.add(respondent_id)
+            vectors.append(vector)
+
+        if not ids:
+            return 0
+
+        block = np.asarray(vectors).reshape(len(ids), NUM_ITEMS)
+        if not validate_matrix(block, require_complete=False)["valid"].all():
+            raise ValueError("Réponses hors échelle dans le lot à ajouter")
+
+        with open(self.records_path, "ab") as f:
+            f.write(block.astype(np.uint8).tobytes())
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write("".join(f"{respondent_id}\n" for respondent_id in ids))
+
+        for respondent_id in ids:
+            self._rows[respondent_id] = len(self._ids)
+            self._ids.append(respondent_id)
+
+        return len(ids)
+
+    def append(self, respondent_id: str, vector: np.ndarray) -> int:
+        self.append_many([(respondent_id, vector)])
+        return self._rows[respondent_id]
+
+    def ingest_json_files(self, paths: Iterable[str], batch_size: int = 10000,
+                          exclude: int = 0) -> Tuple[int, Dict[str, List[dict]]]:
+        """
+        Ajoute des fichiers de réponses au format reponse_per1.json (identifiant = nom du fichier).
+        Les fichiers invalides ou déjà ingérés sont ignorés et rapportés, de même que ceux
+        qui portent un des signalements de qualité `exclude` (nyota_quality).
+        """
+        ingested = 0
+        rejected = {}
+        batch = []
+        pending = set()
+
+        for path in paths:
+            respondent_id = os.path.splitext(os.path.basename(path))[0]
+            if respondent_id in self._rows or respondent_id in pending:
+                rejected[path] = [{"item": None, "code": "duplicate", "value": respondent_id}]
+                continue
+
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+            except (OSError, ValueError) as e:
+                rejected[path] = [{"item": None, "code": "unreadable", "value": str(e)}]
+                continue
+            if not isinstance(payload, dict):
+                rejected[path] = [{"item": None, "code": "invalid_payload", "value": type(payload).__name__}]
+                continue
+
+            vector, errors = responses_to_vector(payload)
+            out_of_range = validate_matrix(vector, require_complete=False)["out_of_range"][0]
+            errors += [{"item": int(column) + 1, "code": "out_of_range", "value": int(vector[column])}
+                       for column in np.flatnonzero(out_of_range)]
+            if not errors and exclude:
+                flags = int(assess_quality(vector)["flags"][0]) & exclude
+                if flags:
+                    errors = [{"item": None, "code": "low_quality", "value": flag_names(flags)}]
+            if errors:
+                rejected[path] = errors
+                continue
+
+            batch.append((respondent_id, vector))
+            pending.add(respondent_id)
+            if len(batch) >= batch_size:
+                ingested += self.append_many(batch)
+                batch = []
+                pending.clear()
+
+        ingested += self.append_many(batch)
+        return ingested, rejected
+
+    def quality_flags(self, timings: Optional[np.ndarray] = None) -> np.ndarray:
+        """Masques de signalement (nyota_quality) de toute l'archive, alignés sur ids"""
+        return quality_flags(self.matrix(), timings=timings)
+
+    def scores(self, workers: Optional[int] = None, chunk_size: Optional[int] = None,
+               output_dtype=np.float32, policy=None, with_errors: bool = False):
+        """
+        Scores N×8 de toute l'archive, calculés directement depuis la memmap (voir compile_policy) ;
+        with_errors=True renvoie aussi les erreurs types N×8
+        """
+        from nyota_parallel import DEFAULT_CHUNK_SIZE, score_cohort
+
+        return score_cohort(self.matrix(), workers=workers, chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+                            output_dtype=output_dtype, policy=policy, with_errors=with_errors)
+
+
+# ============================================
+# LIGNE DE COMMANDE
+# ============================================
+
+if __name__ == "__main__":
+    from nyota_parallel import add_policy_arguments, load_policy
+
+    parser = argparse.ArgumentParser(description="Archive binaire des réponses NYOTA")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="Ajouter des fichiers JSON de réponses")
+    ingest_parser.add_argument("store")
+    ingest_parser.add_argument("files", nargs="+")
+    ingest_parser.add_argument("--exclude-flagged", action="store_true",
+                               help="Refuser les réponses signalées comme faible effort")
+
+    score_parser = subparsers.add_parser("score", help="Calculer les scores de toute l'archive")
+    score_parser.add_argument("store")
+    score_parser.add_argument("output", help="Fichier .npy des scores N×8")
+    score_parser.add_argument("--workers", type=int, default=None)
+    score_parser.add_argument("--errors", metavar="PATH", help="Fichier .npy des erreurs types N×8")
+    score_parser.add_argument("--flags", metavar="PATH", help="Fichier .npy des signalements de qualité (uint8)")
+    add_policy_arguments(score_parser)
+
+    args = parser.parse_args()
+    store = ResponseStore(args.store)
+
+    if args.command == "ingest":
+        count, rejected = store.ingest_json_files(args.files, exclude=ALL_FLAGS if args.exclude_flagged else 0)
+        print(f"✅ {count} répondants ajoutés ({len(store)} au total)")
+        for path, errors in rejected.items():
+            print(f"⚠️ {path} ignoré : {errors[0]['code']}")
+    else:
+        policy = load_policy(args.norms, args.weights, args.min_coverage)
+        scores = store.scores(workers=args.workers, policy=policy, with_errors=bool(args.errors))
+        if args.errors:
+            scores, standard_errors = scores
+            np.save(args.errors, standard_errors)
+        if args.flags:
+            np.save(args.flags, store.quality_flags())
+        np.save(args.output, scores)
+        print(f"✅ Scores de {len(store)} répondants sauvegardés : {args.output}")
@@ -0,0 +1,113 @@
+import argparse
+import json
+import warnings
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from nyota_calculator import COMPILED_AXES, CompiledAxes, axis_sums, compute_scores_matrix
+
+
+# ============================================
+# PROFILS D'ÉQUIPE (AGRÉGATS DES MEMBRES)
+# ============================================
+
+MIN_TEAM_SIZE = 2
+MAX_TEAM_SIZE = 500
+PROFILE_STATISTICS = ("mean", "std", "min", "q1", "median", "q3", "max", "coverage")
+
+
+def group_profile(member_scores: np.ndarray) -> Dict[str, Any]:
+    """
+    Agrégats par axe d'une matrice membres × axes, en réductions vectorisées sur toute l'équipe.
+    NaN = axe non couvert pour ce membre : il est exclu des statistiques de l'axe et
+    abaisse sa couverture (part des membres qui ont un score).
+    """
+    scores = np.atleast_2d(np.asarray(member_scores, dtype=np.float64))
+    valid = ~np.isnan(scores)
+    counts = valid.sum(axis=0)
+    filled = np.where(valid, scores, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=0) / counts
+        squares = (np.where(valid, scores - mean, 0.0) ** 2).sum(axis=0)
+        std = np.where(counts > 1, np.sqrt(squares / (counts - 1)), np.where(counts == 1, 0.0, np.nan))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # axe couvert par aucun membre : NaN attendu
+        minimum, q1, median, q3, maximum = np.nanpercentile(scores, [0, 25, 50, 75, 100], axis=0)
+
+    return {
+        "members": len(scores),
+        "mean": mean,
+        "std": std,
+        "min": minimum,
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "max": maximum,
+        "coverage": counts / max(len(scores), 1)
+    }
+
+
+def profile_to_dict(profile: Dict[str, Any], axis_names: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+    """Profil sérialisable en JSON : {axe: {statistique: valeur arrondie ou None}}"""
+    return {
+        axis: {
+            stat: None if np.isnan(profile[stat][i]) else round(float(profile[stat][i]), 4 if stat == "coverage" else 2)
+            for stat in PROFILE_STATISTICS
+        }
+        for i, axis in enumerate(axis_names)
+    }
+
+
+def member_scores_from_vectors(matrix: np.ndarray, layout: CompiledAxes = COMPILED_AXES) -> np.ndarray:
+    """Scores des membres depuis leurs réponses ; un axe sans aucune réponse vaut NaN (et non 0.0)"""
+    scores = compute_scores_matrix(matrix, layout)
+    _, counts = axis_sums(matrix, layout)
+    return np.where(counts > 0, scores, np.nan)
+
+
+def member_scores_from_dicts(members: Iterable[Dict[str, Any]],
+                             axis_names: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+    """(identifiants, matrice membres × axes) de membres soumis {"id": ..., "scores": {axe: score}}"""
+    ids = []
+    rows = []
+    for member in members:
+        ids.append(str(member["id"]))
+        rows.append([member["scores"].get(axis, np.nan) for axis in axis_names])
+    return ids, np.array(rows, dtype=np.float64).reshape(len(ids), len(axis_names))
+
+
+def store_member_scores(store, member_ids: Sequence[str],
+                        layout: CompiledAxes = COMPILED_AXES) -> np.ndarray:
+    """Scores de membres archivés (nyota_store) : une seule lecture groupée des lignes de la memmap"""
+    rows = np.fromiter((store.row_of(member_id) for member_id in member_ids), dtype=np.intp, count=len(member_ids))
+    return member_scores_from_vectors(store.matrix()[rows], layout)
+
+
+# ============================================
+# LIGNE DE COMMANDE
+# ============================================
+
+if __name__ == "__main__":
+    from nyota_render import TEAM_STYLE, render_team_image
+    from nyota_store import ResponseStore
+
+    parser = argparse.ArgumentParser(description="Profil d'équipe NYOTA à partir d'une archive de réponses")
+    parser.add_argument("store", help="Répertoire d'une archive nyota_store")
+    parser.add_argument("members", help="Fichier texte des identifiants (un par ligne)")
+    parser.add_argument("--image", metavar="PATH", help="Radar d'équipe (.png ou .webp)")
+    args = parser.parse_args()
+
+    with open(args.members, "r", encoding="utf-8") as f:
+        member_ids = [line.strip() for line in f if line.strip()]
+
+    member_scores = store_member_scores(ResponseStore(args.store), member_ids)
+    profile = group_profile(member_scores)
+    if args.image:
+        fmt = "webp" if args.image.endswith(".webp") else "png"
+        with open(args.image, "wb") as f:
+            f.write(render_team_image(COMPILED_AXES.axis_names, member_scores, profile, TEAM_STYLE, fmt=fmt))
+
+    print(json.dumps(profile_to_dict(profile, COMPILED_AXES.axis_names), ensure_ascii=False, indent=2))
@@ -0,0 +1,251 @@
+import argparse
+import json
+import os
+import threading
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from nyota_calculator import BLOC_NAMES, BLOC_RANGES
+from nyota_catalogue import (
+    QUESTIONS_FILE,
+    get_catalogue,
+    load_questions,
+    register_catalogue,
+    retire_catalogues
+)
+
+
+# ============================================
+# CONFIGURATIONS DE SCORING PAR CLIENT (TENANT)
+# ============================================
+
+# Fichier JSON { "<tenant>": { "axes": {<axe>: {"bloc1": [...], ..., "invert": [["bloc1", 3], ...]}},
+#                              "questions": "chemin/optionnel.json" } }
+TENANTS_ENV = "NYOTA_TENANTS_FILE"
+RELOAD_ENV = "NYOTA_TENANTS_RELOAD"   # période de surveillance du fichier en secondes (0 = désactivée)
+DEFAULT_TENANT = "default"           # remplace, s'il est défini, le scoring des requêtes sans tenant
+
+_tenants = {}  # tenant → version de catalogue (les tables compilées vivent dans nyota_catalogue)
+_tenants_lock = threading.Lock()
+
+
+def _is_item_number(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def validate_axes_config(axes_config: Any) -> List[str]:
+    """Erreurs de structure d'une configuration d'axes (liste vide si elle est utilisable)"""
+    if not isinstance(axes_config, dict) or not axes_config:
+        return ["'axes' doit être un objet non vide"]
+
+    errors = []
+    for axis, config in axes_config.items():
+        if not isinstance(config, dict):
+            errors.append(f"{axis} : configuration invalide")
+            continue
+
+        unknown = set(config) - set(BLOC_NAMES) - {"invert"}
+        if unknown:
+            errors.append(f"{axis} : clés inconnues {sorted(unknown)}")
+
+        items = set()
+        for bloc_name in BLOC_NAMES:
+            first, last = BLOC_RANGES[bloc_name]
+            bloc_items = config.get(bloc_name, [])
+            if not isinstance(bloc_items, list):
+                errors.append(f"{axis} : '{bloc_name}' doit être une liste de numéros d'items")
+                continue
+            for item in bloc_items:
+                if not _is_item_number(item) or not 1 <= item <= last - first + 1:
+                    errors.append(f"{axis} : item {item!r} hors du {bloc_name}")
+                else:
+                    items.add((bloc_name, item))
+        if not items:
+            errors.append(f"{axis} : aucun item")
+
+        invert = config.get("invert")
+        if not isinstance(invert, list):
+            errors.append(f"{axis} : 'invert' doit être une liste de paires [bloc, item]")
+            continue
+        for entry in invert:
+            well_formed = isinstance(entry, (list, tuple)) and len(entry) == 2 \
+                and isinstance(entry[0], str) and _is_item_number(entry[1])
+            if not well_formed or tuple(entry) not in items:
+                errors.append(f"{axis} : item inversé {entry!r} absent de l'axe")
+
+    return errors
+
+
+def load_tenants(path: str) -> Dict[str, Dict[str, Any]]:
+    """Lit et valide le fichier des tenants ; lève ValueError avec toutes les erreurs trouvées"""
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    if not isinstance(raw, dict):
+        raise ValueError(f"❌ {path} : objet {{tenant: configuration}} attendu")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    questions_by_path = {}
+    tenants = {}
+    errors = []
+
+    for tenant, config in raw.items():
+        if not isinstance(config, dict):
+            errors.append(f"{tenant} : configuration invalide")
+            continue
+
+        axes_errors = validate_axes_config(config.get("axes"))
+        errors.extend(f"{tenant} / {error}" for error in axes_errors)
+
+        if config.get("questions") is not None and not isinstance(config["questions"], str):
+            errors.append(f"{tenant} : 'questions' doit être un chemin")
+            continue
+        questions_path = os.path.join(base_dir, config["questions"]) if config.get("questions") else QUESTIONS_FILE
+        if questions_path not in questions_by_path:
+            try:
+                questions_by_path[questions_path] = load_questions(questions_path)
+            except (OSError, ValueError) as e:
+                errors.append(f"{tenant} : questions illisibles ({e})")
+                continue
+
+        if not axes_errors:
+            axes_config = {
+                axis: {**axis_config, "invert": [tuple(entry) for entry in axis_config["invert"]]}
+                for axis, axis_config in config["axes"].items()
+            }
+            tenants[tenant] = {"axes": axes_config, "questions": questions_by_path[questions_path]}
+
+    if errors:
+        raise ValueError("❌ Configuration des tenants invalide :\n" + "\n".join(errors))
+    return tenants
+
+
+def register_tenants(tenants: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Compile chaque configuration (une seule fois par disposition, partagée entre tenants identiques)
+    puis remplace d'un bloc la table tenant → version : les requêtes en cours ne voient jamais de mélange.
+    """
+    versions = {
+        tenant: register_catalogue(config["questions"], config["axes"])["version"]
+        for tenant, config in tenants.items()
+    }
+
+    global _tenants
+    with _tenants_lock:
+        _tenants = versions
+    return dict(versions)
+
+
+def tenant_version(tenant: str) -> Optional[str]:
+    return _tenants.get(tenant)
+
+
+def get_tenant_catalogue(tenant: str) -> Optional[Dict[str, Any]]:
+    version = _tenants.get(tenant)
+    return get_catalogue(version) if version is not None else None
+
+
+def default_catalogue() -> Dict[str, Any]:
+    """Catalogue des requêtes sans tenant : le tenant « default » du fichier, sinon celui du dépôt"""
+    return get_tenant_catalogue(DEFAULT_TENANT) or get_catalogue()
+
+
+# ============================================
+# RECHARGEMENT À CHAUD
+# ============================================
+
+class TenantWatcher:
+    """
+    Surveille le fichier des tenants (date et taille) et, à chaque modification valide,
+    compile puis bascule atomiquement les nouvelles configurations. Une configuration invalide
+    est signalée et ignorée : l'ancienne reste en service.
+    """
+
+    def __init__(self, path: str, interval: float = 2.0,
+                 on_retire: Optional[Callable[[List[str]], None]] = None):
+        self.path = path
+        self.interval = interval
+        self.on_retire = on_retire
+        self.reloads = 0
+        self.last_error = None
+        self._signature = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def check(self, strict: bool = False) -> bool:
+        """Recharge si le fichier a changé ; strict=True propage les erreurs (démarrage)"""
+        signature = None
+        try:
+            signature = self._stat()
+            if signature == self._signature:
+                return False
+            tenants = load_tenants(self.path)
+        except (OSError, ValueError) as e:
+            if strict:
+                raise
+            if signature != self._signature:
+                print(f"⚠️ Rechargement de {self.path} ignoré : {e}")
+                self.last_error = str(e)
+            self._signature = signature
+            return False
+
+        previous = set(_tenants.values())
+        versions = register_tenants(tenants)
+        retired = retire_catalogues(previous - set(versions.values()))
+
+        self._signature = signature
+        self.reloads += 1
+        self.last_error = None
+        if retired and self.on_retire is not None:
+            self.on_retire(retired)
+        return True
+
+    def start(self):
+        if self.interval > 0 and (self._thread is None or not self._thread.is_alive()):
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="nyota-tenants", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                traceback.print_exc()
+
+
+def watcher_from_env(on_retire: Optional[Callable[[List[str]], None]] = None) -> Optional[TenantWatcher]:
+    """Charge NYOTA_TENANTS_FILE (erreurs fatales au démarrage) puis le surveille toutes les NYOTA_TENANTS_RELOAD s"""
+    path = os.environ.get(TENANTS_ENV)
+    if not path:
+        return None
+
+    watcher = TenantWatcher(path, float(os.environ.get(RELOAD_ENV, 2.0)), on_retire)
+    watcher.check(strict=True)
+    return watcher.start()
+
+
+# ============================================
+# LIGNE DE COMMANDE
+# ============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vérifier un fichier de configurations par tenant")
+    parser.add_argument("path", help="Fichier JSON des tenants")
+    args = parser.parse_args()
+
+    versions = register_tenants(load_tenants(args.path))
+    for tenant, version in versions.items():
+        catalogue = get_catalogue(version)
+        print(f"✅ {tenant} : catalogue {version}, disposition {catalogue['layout']}, "
+              f"{len(catalogue['axes'])} axes")
@@ -1,4 +1,5 @@
 // Tableau des 72 questions NYOTA
+// Généré depuis questions.json : python nyota_catalogue.py --write-js question.js
 const NYOTA_QUESTIONS = [
     // Bloc 1: Big Five (Questions 1-30)
     {
@@ -1,8 +1,11 @@
 // Configuration
-const API_URL = 'https://test-de-personnalit-backend.onrender.com'; // À changer après déploiement
+// NYOTA_API_URL est injecté quand le frontend est servi par app.py (même origine)
+const API_URL = window.NYOTA_API_URL ?? 'https://test-de-personnalit-backend.onrender.com'; // À changer après déploiement
 let currentQuestion = 0;
 let responses = {};
 let radarChart = null;
+let lastCalculation = null; // { etag, data } : évite de retélécharger un résultat identique
+let catalogueVersion = null;
 
 // Éléments DOM
 const welcomeScreen = document.getElementById('welcomeScreen');
@@ -23,6 +26,7 @@ const restartTestBtn = document.getElementById('restartTest');
 // Initialisation
 document.addEventListener('DOMContentLoaded', () => {
     totalQuestionsEl.textContent = NYOTA_QUESTIONS.length;
+    loadCatalogue();
     
     // Initialiser les réponses
     NYOTA_QUESTIONS.forEach(q => {
@@ -45,6 +49,23 @@ document.addEventListener('DOMContentLoaded', () => {
 });
 
 // Fonctions
+async function loadCatalogue() {
+    // Catalogue versionné du backend (mis en cache par le navigateur via ETag) ;
+    // question.js reste la version locale de secours
+    try {
+        const response = await fetch(`${API_URL}/api/catalogue`);
+        if (!response.ok) {
+            return;
+        }
+        const catalogue = await response.json();
+        NYOTA_QUESTIONS.splice(0, NYOTA_QUESTIONS.length, ...catalogue.questions);
+        catalogueVersion = catalogue.version;
+        totalQuestionsEl.textContent = NYOTA_QUESTIONS.length;
+    } catch (error) {
+        console.warn('Catalogue indisponible, questions locales utilisées');
+    }
+}
+
 function startTest() {
     welcomeScreen.classList.remove('active');
     testScreen.classList.add('active');
@@ -125,15 +146,32 @@ async function calculateResults() {
         nextBtn.innerHTML = '<span class="loading"></span> Calcul...';
         
         // Envoyer les réponses à l'API
+        const headers = {
+            'Content-Type': 'application/json',
+        };
+        if (lastCalculation) {
+            headers['If-None-Match'] = lastCalculation.etag;
+        }
+        if (catalogueVersion) {
+            headers['X-Catalogue-Version'] = catalogueVersion;
+        }
+        
         const response = await fetch(`${API_URL}/api/calculate`, {
             method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
+            headers,
             body: JSON.stringify(responses)
         });
         
-        const data = await response.json();
+        let data;
+        if (response.status === 304 && lastCalculation) {
+            data = lastCalculation.data;
+        } else {
+            data = await response.json();
+            const etag = response.headers.get('ETag');
+            if (data.success && etag) {
+                lastCalculation = { etag, data };
+            }
+        }
         
         if (data.success) {
             // Afficher les résultats
@@ -238,23 +276,26 @@ async function downloadPDF() {
             return acc;
         }, {});
         
-        const response = await fetch(`${API_URL}/api/generate-pdf`, {
+        // Mode binaire : le PNG arrive brut (sans base64) et en flux
+        const response = await fetch(`${API_URL}/api/generate-pdf?format=png`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                'Accept': 'image/png',
             },
             body: JSON.stringify({ scores })
         });
         
-        const data = await response.json();
-        
-        if (data.success) {
+        if (response.ok && response.headers.get('Content-Type').startsWith('image/png')) {
             // Créer un lien de téléchargement
+            const url = URL.createObjectURL(await response.blob());
             const link = document.createElement('a');
-            link.href = `data:image/png;base64,${data.image}`;
+            link.href = url;
             link.download = 'nyota-profil.png';
             link.click();
+            URL.revokeObjectURL(url);
         } else {
+            const data = await response.json();
             alert('Erreur lors de la génération : ' + data.error);
         }
     } catch (error) {
@@ -0,0 +1,22 @@
+import os
+import sys
+import tempfile
+
+import matplotlib
+import pytest
+
+# Modules du dépôt importables depuis tests/, rendu sans affichage
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+matplotlib.use("Agg")
+
+
+# File de rapports de l'application dans un répertoire temporaire, avant tout import de app
+_JOBS_DIR = tempfile.mkdtemp(prefix="nyota-jobs-")
+os.environ.setdefault("NYOTA_JOBS_DB", os.path.join(_JOBS_DIR, "jobs.sqlite3"))
+os.environ.setdefault("NYOTA_JOBS_DIR", os.path.join(_JOBS_DIR, "artifacts"))
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app import app
+    return app.test_client()
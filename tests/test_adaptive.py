@@ -0,0 +1,23 @@
+"""
+Mode adaptatif : une tolérance non finie ou non positive est refusée au lieu de désactiver l'arrêt.
+"""
+import numpy as np
+import pytest
+
+from nyota_adaptive import next_item, parse_tolerance
+from nyota_calculator import MISSING, NUM_ITEMS
+
+
+@pytest.mark.parametrize("value", [float("nan"), "nan", float("inf"), "1e400", -1, 0, "x", None, True, [5]])
+def test_invalid_tolerances_are_rejected(value):
+    tolerance, errors = parse_tolerance(value)
+    assert tolerance is None and errors[0]["code"] == "invalid_tolerance"
+
+
+def test_valid_tolerance():
+    assert parse_tolerance("7.5") == (7.5, [])
+
+
+def test_next_item_rejects_invalid_tolerance():
+    with pytest.raises(ValueError):
+        next_item(np.full(NUM_ITEMS, MISSING), float("nan"))
@@ -0,0 +1,26 @@
+"""
+Backend fichier du cache : borné comme le LRU en mémoire, les entrées les plus anciennes partent d'abord.
+"""
+import os
+
+from nyota_cache import FileCacheBackend, LRUCache
+
+
+def test_file_backend_evicts_oldest_entries(tmp_path):
+    backend = FileCacheBackend(str(tmp_path), max_entries=40)
+    for i in range(100):
+        backend.set(f"k{i}", {"value": i}, tag="layout" if i % 2 else "")
+        os.utime(backend._path(f"k{i}", "layout" if i % 2 else ""), ns=(i * 10**9, i * 10**9))
+
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".json")]) <= 40 + 40 // 20
+    assert backend.prune() >= 0
+    assert len(os.listdir(tmp_path)) == 40
+    assert backend.get("k0") is None and backend.get("k99", tag="layout") == {"value": 99}
+    assert backend.evictions == 60
+
+
+def test_backend_evictions_in_stats(tmp_path):
+    cache = LRUCache(maxsize=4, backend=FileCacheBackend(str(tmp_path), max_entries=2))
+    for i in range(5):
+        cache.set(f"k{i}", i)
+    assert cache.stats()["backend_evictions"] == 3
@@ -0,0 +1,54 @@
+"""
+Catalogue servi par l'API : ETag égal à la version, 304 en revalidation, version immuable,
+et 409 quand un client répond avec une version de catalogue périmée.
+"""
+import json
+import os
+
+from nyota_calculator import NUM_ITEMS
+from nyota_catalogue import DEFAULT_CATALOGUE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_current_catalogue_is_revalidated_by_version(client):
+    response = client.get("/api/catalogue")
+    version = DEFAULT_CATALOGUE["version"]
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'"{version}"'
+    assert response.headers["X-Catalogue-Version"] == version
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert len(response.get_json()["questions"]) == NUM_ITEMS
+
+    assert client.get("/api/catalogue", headers={"If-None-Match": f'"{version}"'}).status_code == 304
+    assert client.get("/api/catalogue", headers={"If-None-Match": '"ancienne"'}).status_code == 200
+
+
+def test_versioned_catalogue_is_immutable(client):
+    version = DEFAULT_CATALOGUE["version"]
+    response = client.get(f"/api/catalogue/{version}")
+
+    assert response.status_code == 200 and response.get_json()["version"] == version
+    assert "immutable" in response.headers["Cache-Control"]
+    assert client.get("/api/catalogue/0000000000000000").status_code == 404
+
+
+def test_stale_catalogue_version_is_409(client):
+    with open(os.path.join(ROOT, "reponse_per1.json"), "r", encoding="utf-8") as f:
+        responses = json.load(f)
+
+    stale = client.post("/api/calculate?catalogue_version=0000000000000000", json=responses)
+    assert stale.status_code == 409
+    assert stale.get_json()["catalogue_version"] == DEFAULT_CATALOGUE["version"]
+
+    header = client.post("/api/calculate", json=responses, headers={"X-Catalogue-Version": "0000000000000000"})
+    assert header.status_code == 409
+
+    current = client.post(f"/api/calculate?catalogue_version={DEFAULT_CATALOGUE['version']}", json=responses)
+    assert current.status_code == 200
+    assert current.get_json()["catalogue_version"] == DEFAULT_CATALOGUE["version"]
+
+
+def test_unknown_tenant_is_404(client):
+    assert client.get("/api/catalogue", headers={"X-Tenant": "inconnu"}).status_code == 404
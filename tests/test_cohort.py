@@ -0,0 +1,75 @@
+"""
+Traitements de cohorte multi-processus : les workers qui mappent eux-mêmes une memmap
+(y compris une tranche) doivent lire exactement les mêmes lignes que le calcul en mémoire,
+et le rapport de fidélité reste du JSON valide quand une statistique est indéfinie.
+"""
+import json
+
+import numpy as np
+import pytest
+
+from nyota_calculator import LIKERT_MAX, LIKERT_MIN, MISSING, NUM_ITEMS, compute_scores_matrix
+from nyota_parallel import memmap_source, score_cohort
+from nyota_psychometrics import ItemStatistics, accumulate, psychometric_report
+
+
+def cohort_memmap(tmp_path, rows=5000, seed=29):
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(LIKERT_MIN, LIKERT_MAX + 1, size=(rows, NUM_ITEMS), dtype=np.uint8)
+    matrix[rng.random(matrix.shape) < 0.05] = MISSING
+    path = tmp_path / "records.bin"
+    matrix.tofile(path)
+    return matrix, np.memmap(path, dtype=np.uint8, mode="r", shape=matrix.shape)
+
+
+def test_memmap_source_of_slices(tmp_path):
+    _, mapped = cohort_memmap(tmp_path, rows=100)
+    assert memmap_source(mapped)[1] == 0
+    assert memmap_source(mapped[20:60][5:])[1] == 25 * NUM_ITEMS
+    assert memmap_source(mapped[:, :10]) is None
+    assert memmap_source(np.asarray(mapped)) is None
+
+
+def test_parallel_scoring_of_sliced_memmap(tmp_path):
+    matrix, mapped = cohort_memmap(tmp_path)
+
+    for rows in (slice(None), slice(2000, 4000), slice(1, 4999, 2)):
+        scores = score_cohort(mapped[rows], workers=2, chunk_size=500, output_dtype=np.float64)
+        np.testing.assert_array_equal(scores, compute_scores_matrix(matrix[rows]))
+
+
+def test_parallel_statistics_of_sliced_memmap(tmp_path):
+    matrix, mapped = cohort_memmap(tmp_path)
+
+    stats = accumulate(mapped[2000:4000], chunk_size=500, workers=2)
+    expected = ItemStatistics().update(matrix[2000:4000])
+    assert (stats.count, stats.skipped) == (expected.count, expected.skipped)
+    np.testing.assert_array_equal(stats.sums, expected.sums)
+    np.testing.assert_array_equal(stats.cross_products, expected.cross_products)
+
+
+def test_report_without_variance_is_valid_json():
+    matrix = np.full((10, NUM_ITEMS), 3, dtype=np.uint8)
+    matrix[::2, ::3] = 4  # seuls certains items varient
+    report = psychometric_report(ItemStatistics().update(matrix))
+
+    json.dumps(report, allow_nan=False)
+    items = [item for axis in report["axes"].values() for item in axis["item_statistics"]]
+    assert any(item["item_total_r"] is None for item in items)
+
+
+@pytest.mark.parametrize("bad", [
+    np.full((10, NUM_ITEMS), 3.0),
+    np.full((10, NUM_ITEMS), 6, dtype=np.uint8),
+    np.full((10, NUM_ITEMS), -1, dtype=np.int16)
+])
+def test_out_of_scale_matrices_are_rejected(bad):
+    with pytest.raises(ValueError):
+        score_cohort(bad, workers=1)
+
+
+def test_rejected_row_is_reported(tmp_path):
+    matrix, _ = cohort_memmap(tmp_path, rows=300)
+    matrix[217, 5] = 9
+    with pytest.raises(ValueError, match="ligne 217"):
+        score_cohort(matrix, workers=2, chunk_size=100)
@@ -0,0 +1,58 @@
+"""
+Export de cohorte en flux : l'archive produite bloc par bloc s'ouvre avec zipfile/tarfile
+et contient, pour chaque répondant, son diagramme PNG et ses rapports HTML et texte.
+"""
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+import app as nyota_app
+from nyota_calculator import COMPILED_AXES
+from nyota_cohort_reports import ARCHIVE_FORMATS, BUNDLE_ARTIFACTS, stream_archive
+from nyota_jobs import ARTIFACTS
+from nyota_limits import RateLimiter
+
+RESPONDENTS = [
+    {"id": f"r{i}", "scores": {axis: 15.0 + 12 * i + j for j, axis in enumerate(COMPILED_AXES.axis_names)}}
+    for i in range(3)
+]
+
+
+def expected_names():
+    return {f"{respondent['id']}/{ARTIFACTS[name][0]}" for respondent in RESPONDENTS for name in BUNDLE_ARTIFACTS}
+
+
+def archive_contents(data, fmt):
+    if fmt == "zip":
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            assert archive.testzip() is None
+            return {name: archive.read(name) for name in archive.namelist()}
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:*") as archive:
+        return {member.name: archive.extractfile(member).read() for member in archive.getmembers()}
+
+
+@pytest.mark.parametrize("fmt", list(ARCHIVE_FORMATS))
+def test_stream_archive_round_trip(fmt):
+    members = [(f"r{i}/rapport.txt", f"rapport {i}".encode()) for i in range(5)] + [("r0/profil.png", b"\x89PNG")]
+    chunks = list(stream_archive(iter(members), fmt))
+
+    assert len(chunks) > 1
+    assert archive_contents(b"".join(chunks), fmt) == dict(members)
+
+
+@pytest.mark.parametrize("fmt", ["zip", "tar.gz"])
+def test_cohort_export_contains_every_artifact(client, monkeypatch, fmt):
+    monkeypatch.setattr(nyota_app, "EXPORT_LIMITER", RateLimiter(rate=0, burst=0))
+    response = client.post("/api/cohort-export", json={"format": fmt, "respondents": RESPONDENTS})
+
+    assert response.status_code == 200 and response.mimetype == ARCHIVE_FORMATS[fmt]
+    assert f"nyota-cohorte.{fmt}" in response.headers["Content-Disposition"]
+
+    contents = archive_contents(response.data, fmt)
+    assert set(contents) == expected_names()
+    for respondent in RESPONDENTS:
+        assert contents[f"{respondent['id']}/{ARTIFACTS['kiviat'][0]}"].startswith(b"\x89PNG")
+        assert b"<html" in contents[f"{respondent['id']}/{ARTIFACTS['html'][0]}"].lower()
+        assert contents[f"{respondent['id']}/{ARTIFACTS['text'][0]}"].decode("utf-8").strip()
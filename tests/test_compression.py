@@ -0,0 +1,100 @@
+"""
+Compression négociée : choix de l'encodage selon les q-values, seuil de taille, Vary,
+flux compressés bloc par bloc, et images brutes jamais recompressées.
+"""
+import gzip
+import json
+import zlib
+
+import pytest
+from flask import Flask, Response, jsonify
+
+from nyota_calculator import COMPILED_AXES
+from nyota_compression import MIN_SIZE, init_compression, negotiate_encoding, supported_encodings
+
+PREFERRED = supported_encodings()[0]
+BIG = {"text": "profil " * 400}
+
+
+@pytest.fixture(scope="module")
+def small_app():
+    app = Flask(__name__)
+    init_compression(app)
+
+    @app.route("/big")
+    def big():
+        return jsonify(BIG)
+
+    @app.route("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.route("/stream")
+    def stream():
+        return Response((f"ligne {i}\n" * 50 for i in range(20)), mimetype="text/plain")
+
+    return app.test_client()
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("GZIP;q=0.5", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip;q=abc", None),
+    ("identity", None),
+    ("", None),
+    ("*", PREFERRED),
+    ("*;q=0.5, gzip;q=0", "br" if "br" in supported_encodings() else None),
+    ("deflate, br", "br" if "br" in supported_encodings() else None)
+])
+def test_negotiation(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_large_json_is_compressed(small_app):
+    response = small_app.get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(response.data)) == BIG
+    assert len(response.data) < len(json.dumps(BIG))
+
+
+def test_identity_and_small_bodies_stay_plain(small_app):
+    identity = small_app.get("/big", headers={"Accept-Encoding": "identity"})
+    small = small_app.get("/small", headers={"Accept-Encoding": "gzip"})
+
+    for response in (identity, small):
+        assert "Content-Encoding" not in response.headers
+        assert "Accept-Encoding" in response.headers["Vary"]
+    assert identity.get_json() == BIG
+    assert len(small.data) < MIN_SIZE
+
+
+def test_streamed_body_is_compressed_by_chunks(small_app):
+    response = small_app.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    expected = "".join(f"ligne {i}\n" * 50 for i in range(20))
+    assert zlib.decompress(response.data, 16 + zlib.MAX_WBITS).decode() == expected
+
+
+def test_raw_png_is_not_recompressed(client):
+    scores = {axis: 33.0 for axis in COMPILED_AXES.axis_names}
+    response = client.post("/api/generate-pdf?size=thumbnail&format=png", json={"scores": scores},
+                           headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200 and response.mimetype == "image/png"
+    assert "Content-Encoding" not in response.headers
+    assert response.data.startswith(b"\x89PNG")
+    assert response.headers["ETag"]
+
+
+def test_html_report_is_compressed(client):
+    scores = {axis: 33.0 for axis in COMPILED_AXES.axis_names}
+    response = client.post("/api/report-html", json={"scores": scores}, headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data).decode("utf-8").lstrip().lower().startswith("<!doctype html")
@@ -0,0 +1,45 @@
+"""
+File de rapports : une tâche échue redevient demandable, qu'elle ait été purgée ou non, et la base
+n'est créée qu'au premier usage.
+"""
+import os
+import time
+
+from nyota_jobs import EXPIRED, QUEUED, JobQueue
+
+SCORES = {"Ouverture & Curiosité": 62.5}
+
+
+def finished_job(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), str(tmp_path / "artifacts"), ttl=0.01)
+    job_id = queue.submit(SCORES)["id"]
+    queue.claim()
+    os.makedirs(queue.job_dir(job_id))
+    queue.complete(job_id)
+    time.sleep(0.05)
+    return queue, job_id
+
+
+def test_lapsed_job_is_requeued_before_purge(tmp_path):
+    queue, job_id = finished_job(tmp_path)
+    assert queue.get(job_id)["status"] == EXPIRED
+
+    assert queue.submit(SCORES)["status"] == QUEUED
+    assert not os.path.exists(queue.job_dir(job_id))
+    assert queue.claim()["id"] == job_id
+
+
+def test_purged_job_is_requeued(tmp_path):
+    queue, job_id = finished_job(tmp_path)
+    assert queue.purge_expired() == 1
+
+    assert queue.submit(SCORES)["status"] == QUEUED
+    assert queue.claim()["id"] == job_id
+
+
+def test_queue_files_are_created_on_first_use(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), str(tmp_path / "artifacts"))
+    assert os.listdir(tmp_path) == []
+
+    queue.submit(SCORES)
+    assert {"jobs.db", "artifacts"} <= set(os.listdir(tmp_path))
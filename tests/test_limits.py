@@ -0,0 +1,139 @@
+"""
+Limitation de débit et contrôle d'admission : recharge des seaux et Retry-After, 429 (débit)
+contre 503 (capacité) sur les routes de rendu, place libérée en fin de flux ou sur erreur,
+et clés d'API inconnues ramenées à l'adresse du client.
+"""
+import itertools
+
+import pytest
+
+import app as nyota_app
+import nyota_limits
+from nyota_calculator import COMPILED_AXES
+from nyota_limits import AdmissionGate, RateLimiter, SQLiteBucketStore, retry_after
+
+_scores_seed = itertools.count()
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def fresh_scores():
+    """Scores jamais rendus : chaque requête est un vrai rendu (pas de HIT de cache)"""
+    value = 10 + next(_scores_seed) * 0.01
+    return {axis: value for axis in COMPILED_AXES.axis_names}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(nyota_limits.time, "monotonic", clock)
+    monkeypatch.setattr(nyota_limits.time, "time", clock)
+    return clock
+
+
+def test_bucket_refill_and_retry_after(clock):
+    limiter = RateLimiter(rate=0.5, burst=2)
+
+    assert limiter.acquire("render:a") == (True, 0.0)
+    assert limiter.acquire("render:a") == (True, 0.0)
+    assert limiter.acquire("render:a") == (False, pytest.approx(2.0))
+    assert limiter.acquire("render:b")[0]  # un seau par clé
+
+    clock.now += 1.0
+    assert limiter.acquire("render:a") == (False, pytest.approx(1.0))
+    clock.now += 1.0
+    assert limiter.acquire("render:a") == (True, 0.0)
+
+    clock.now += 60
+    assert [limiter.acquire("render:a")[0] for _ in range(3)] == [True, True, False]  # plafonné à burst
+    assert limiter.rejected == 3
+    assert [retry_after(s) for s in (0.2, 1.0, 2.0, 2.1)] == ["1", "1", "2", "3"]
+
+
+def test_sqlite_buckets_are_shared_between_processes(clock, tmp_path):
+    path = str(tmp_path / "limits.db")
+    first = RateLimiter(rate=1, burst=1, store=SQLiteBucketStore(path))
+    second = RateLimiter(rate=1, burst=1, store=SQLiteBucketStore(path))
+
+    assert first.acquire("render:a")[0]
+    assert second.acquire("render:a") == (False, pytest.approx(1.0))
+    clock.now += 1.0
+    assert second.acquire("render:a")[0]
+
+
+def test_rate_limit_is_429_and_capacity_is_503(client, monkeypatch):
+    monkeypatch.setattr(nyota_app, "RENDER_LIMITER", RateLimiter(rate=0.01, burst=1))
+    assert client.post("/api/generate-pdf?size=thumbnail", json={"scores": fresh_scores()}).status_code == 200
+
+    limited = client.post("/api/generate-pdf?size=thumbnail", json={"scores": fresh_scores()})
+    assert limited.status_code == 429
+    assert limited.headers["Retry-After"] == "100"
+    assert limited.get_json()["retry_after"] == pytest.approx(100, abs=1)
+
+    gate = AdmissionGate(1, wait=0.01)
+    monkeypatch.setattr(nyota_app, "RENDER_LIMITER", RateLimiter(rate=0, burst=0))
+    monkeypatch.setattr(nyota_app, "RENDER_GATE", gate)
+    assert gate.try_enter()
+
+    overloaded = client.post("/api/generate-pdf?size=thumbnail", json={"scores": fresh_scores()})
+    assert overloaded.status_code == 503
+    assert overloaded.headers["Retry-After"] == "2"
+    assert gate.stats() == {"capacity": 1, "active": 1, "rejected": 1}
+
+
+def test_held_stream_releases_its_slot_once():
+    gate = AdmissionGate(1, wait=0.01)
+
+    assert gate.try_enter()
+    assert list(gate.hold(iter([b"a", b"b"]))) == [b"a", b"b"]
+    assert gate.stats()["active"] == 0
+
+    def failing():
+        yield b"a"
+        raise OSError("disque plein")
+
+    assert gate.try_enter()
+    with pytest.raises(OSError):
+        list(gate.hold(failing()))
+    assert gate.stats()["active"] == 0
+
+    assert gate.try_enter()
+    stream = gate.hold(iter([b"a"]))
+    stream.close()
+    stream.close()  # une seule libération (BoundedSemaphore lèverait ValueError)
+    assert gate.stats()["active"] == 0 and gate.try_enter()
+    gate.leave()
+
+
+def test_streamed_export_releases_its_slot_when_closed(client, monkeypatch):
+    gate = AdmissionGate(1, wait=0.01)
+    monkeypatch.setattr(nyota_app, "RENDER_GATE", gate)
+    monkeypatch.setattr(nyota_app, "EXPORT_LIMITER", RateLimiter(rate=0, burst=0))
+    body = {"format": "tar", "respondents": [{"id": "r1", "scores": fresh_scores()}]}
+
+    response = client.post("/api/cohort-export", json=body, buffered=False)
+    assert response.status_code == 200 and gate.stats()["active"] == 1
+    assert client.post("/api/cohort-export", json=body).status_code == 503
+
+    response.close()  # client déconnecté avant la fin du flux
+    assert gate.stats()["active"] == 0
+
+
+def test_unknown_api_keys_share_the_address_bucket(client, monkeypatch):
+    monkeypatch.setattr(nyota_app, "RENDER_LIMITER", RateLimiter(rate=0.01, burst=1))
+    monkeypatch.setattr(nyota_app, "API_KEYS", frozenset({"cle-connue"}))
+
+    def render(api_key):
+        return client.post("/api/generate-pdf?size=thumbnail", json={"scores": fresh_scores()},
+                           headers={"X-Api-Key": api_key}).status_code
+
+    assert render("inventee-1") == 200
+    assert render("inventee-2") == 429
+    assert render("cle-connue") == 200
+    assert render("cle-connue") == 429
@@ -0,0 +1,104 @@
+"""
+Indicateurs de qualité des réponses : cas typiques de faible effort, équivalence avec un calcul
+ligne par ligne, et filtrage identique par lots et en flux.
+"""
+import json
+import os
+
+import numpy as np
+
+from nyota_calculator import LIKERT_MAX, LIKERT_MIN, MISSING, NUM_ITEMS, compute_scores_matrix, responses_to_vector
+from nyota_psychometrics import ItemStatistics
+from nyota_quality import (
+    ALL_FLAGS,
+    QUALITY_FLAGS,
+    assess_quality,
+    flag_names,
+    iter_quality_chunks,
+    quality_flags
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def random_matrix(rows, seed=49, missing=0.0):
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(LIKERT_MIN, LIKERT_MAX + 1, size=(rows, NUM_ITEMS), dtype=np.uint8)
+    matrix[rng.random(matrix.shape) < missing] = MISSING
+    return matrix
+
+
+def test_low_effort_patterns_are_flagged():
+    with open(os.path.join(ROOT, "reponse_per1.json"), "r", encoding="utf-8") as f:
+        alternating, _ = responses_to_vector(json.load(f))
+    constant = np.full(NUM_ITEMS, 4)
+    see_saw = np.tile([1, 5], NUM_ITEMS // 2)
+
+    flags = assess_quality(np.stack([alternating, constant, see_saw]))["flags"]
+
+    assert {"patterned", "inconsistent"} <= set(flag_names(flags[0]))
+    assert {"straight_lining", "low_variance", "inconsistent"} <= set(flag_names(flags[1]))
+    assert "patterned" in flag_names(flags[2])
+
+
+def test_random_answers_are_rarely_flagged():
+    flags = assess_quality(random_matrix(20000))["flags"]
+    assert (flags != 0).mean() < 0.02
+
+
+def test_indicators_match_row_reference():
+    matrix = random_matrix(300, missing=0.2)
+    matrix[:50, 10:40] = 3  # séries longues, coupées par des manquants ailleurs
+    quality = assess_quality(matrix)
+
+    for i, row in enumerate(matrix):
+        longest = run = 0
+        previous = None
+        for value in row:
+            run = run + 1 if value != MISSING and value == previous else (1 if value != MISSING else 0)
+            previous = value if value != MISSING else None
+            longest = max(longest, run)
+        assert quality["longest_run"][i] == longest
+
+        answered = row[row != MISSING].astype(float)
+        assert np.isclose(quality["response_std"][i], answered.std())
+
+
+def test_speeding_and_timing_outliers():
+    rng = np.random.default_rng(49)
+    timings = rng.lognormal(1.5, 0.3, size=(500, NUM_ITEMS))
+    timings[0] = 0.4
+    timings[1] = 400.0
+    timings[2] = np.nan
+
+    flags = assess_quality(random_matrix(500), timings)["flags"]
+    assert flags[0] & QUALITY_FLAGS["speeding"] and flags[0] & QUALITY_FLAGS["timing_outlier"]
+    assert flags[1] & QUALITY_FLAGS["timing_outlier"] and not flags[1] & QUALITY_FLAGS["speeding"]
+    assert not flags[2] & (QUALITY_FLAGS["speeding"] | QUALITY_FLAGS["timing_outlier"])
+
+
+def test_streaming_filter_matches_batch():
+    matrix = random_matrix(5000, missing=0.05)
+    matrix[::97] = 4
+    flags = quality_flags(matrix, chunk_size=700)
+    assert (flags != 0).sum() >= len(matrix[::97])
+
+    chunks = (matrix[start:start + 700] for start in range(0, len(matrix), 700))
+    kept_rows, kept_scores = [], []
+    for rows, scores, quality in iter_quality_chunks(chunks, exclude=ALL_FLAGS):
+        kept_rows.append(rows)
+        kept_scores.append(scores)
+
+    np.testing.assert_array_equal(np.concatenate(kept_rows), matrix[flags == 0])
+    np.testing.assert_array_equal(np.concatenate(kept_scores), compute_scores_matrix(matrix[flags == 0]))
+
+
+def test_norms_can_exclude_flagged_rows():
+    matrix = random_matrix(2000)
+    matrix[:200] = 4
+    clean = ItemStatistics().update(matrix, exclude=ALL_FLAGS)
+    kept = quality_flags(matrix) == 0
+
+    assert not kept[:200].any()
+    assert clean.count == kept.sum()
+    np.testing.assert_array_equal(clean.sums, ItemStatistics().update(matrix[kept]).sums)
@@ -0,0 +1,74 @@
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from PIL import Image
+
+import diag
+from nyota_calculator import compute_scores_matrix, scores_to_dict
+from nyota_render import KIVIAT_STYLE, SIMPLE_STYLE, render_radar_image, render_radar_png
+
+THREADS = 8
+RENDERS = 24
+DPI = 40  # petite résolution : le test porte sur la concurrence, pas sur la taille des images
+
+
+def random_profiles(count, seed=0):
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(1, 6, size=(count, 72), dtype=np.uint8)
+    return [scores_to_dict(row) for row in compute_scores_matrix(matrix)]
+
+
+def test_concurrent_renders_match_serial_renders():
+    profiles = random_profiles(RENDERS)
+    styles = [SIMPLE_STYLE if i % 2 else KIVIAT_STYLE for i in range(RENDERS)]
+    expected = [render_radar_png(scores, style, dpi=DPI) for scores, style in zip(profiles, styles)]
+
+    barrier = threading.Barrier(THREADS)
+
+    def render(i):
+        if i < THREADS:
+            barrier.wait()  # démarrage simultané des premiers rendus
+        return render_radar_png(profiles[i], styles[i], dpi=DPI)
+
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        results = list(pool.map(render, range(RENDERS)))
+
+    assert results == expected
+    assert len(set(results)) == RENDERS
+
+
+def test_plot_kiviat_without_display_leaves_pyplot_untouched():
+    plt.close("all")
+    profiles = random_profiles(4, seed=1)
+
+    def render(scores):
+        buffer = io.BytesIO()
+        diag.plot_kiviat(dict(scores), buffer, show=False)
+        return buffer.getvalue()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(render, profiles))
+
+    assert all(png.startswith(b"\x89PNG") for png in results)
+    assert plt.get_fignums() == []
+
+
+def test_render_rejects_wrong_axis_count():
+    scores = dict(list(random_profiles(1)[0].items())[:7])
+    with pytest.raises(ValueError):
+        render_radar_png(scores)
+
+
+def test_image_variants_are_rendered_at_their_own_resolution():
+    scores = random_profiles(1, seed=2)[0]
+    thumbnail = Image.open(io.BytesIO(render_radar_image(scores, variant="thumbnail", fmt="png")))
+    screen = Image.open(io.BytesIO(render_radar_image(scores, variant="screen", fmt="webp")))
+
+    assert max(thumbnail.size) <= 400
+    assert thumbnail.mode == "P"
+    assert screen.format == "WEBP"
+    assert max(screen.size) > 1000
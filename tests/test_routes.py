@@ -0,0 +1,89 @@
+"""
+Routes de l'API : un corps JSON qui n'est pas un objet reçoit un 400 structuré, jamais un 500,
+et chaque réponse porte la version du catalogue de la requête, même servie depuis le cache.
+"""
+import json
+import os
+
+import pytest
+
+from nyota_calculator import COMPILED_AXES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("route", [
+    "/api/team-profile",
+    "/api/cohort-export",
+    "/api/adaptive/next",
+    "/api/report-html",
+    "/api/generate-pdf",
+    "/api/reports"
+])
+@pytest.mark.parametrize("body", [[1, 2], "x", 3])
+def test_non_object_body_is_rejected(client, route, body):
+    response = client.post(route, json=body)
+    assert response.status_code == 400
+    assert response.get_json()["errors"][0]["code"] == "invalid_payload"
+
+
+def test_calculate_answers_with_each_tenant_catalogue(client, tmp_path):
+    from nyota_calculator import AXES_CONFIG
+    from nyota_tenants import load_tenants, register_tenants
+
+    with open(os.path.join(ROOT, "questions.json"), "r", encoding="utf-8") as f:
+        questions = json.load(f)
+    questions[0]["text"] += " (variante)"
+    (tmp_path / "questions.json").write_text(json.dumps(questions, ensure_ascii=False), encoding="utf-8")
+
+    axes = {axis: {**config, "invert": [list(entry) for entry in config["invert"]]}
+            for axis, config in AXES_CONFIG.items()}
+    (tmp_path / "tenants.json").write_text(json.dumps({
+        "a": {"axes": axes},
+        "b": {"axes": axes, "questions": "questions.json"}
+    }, ensure_ascii=False), encoding="utf-8")
+    versions = register_tenants(load_tenants(str(tmp_path / "tenants.json")))
+
+    try:
+        with open(os.path.join(ROOT, "reponse_per1.json"), "r", encoding="utf-8") as f:
+            responses = json.load(f)
+        first = client.post("/api/calculate", json=responses, headers={"X-Tenant": "a"})
+        second = client.post("/api/calculate", json=responses, headers={"X-Tenant": "b"})
+
+        assert second.headers["X-Cache"] == "HIT"
+        assert first.get_json()["catalogue_version"] == versions["a"]
+        assert second.get_json()["catalogue_version"] == versions["b"]
+        assert first.headers["ETag"] != second.headers["ETag"]
+        assert client.post("/api/calculate", json=responses, headers={
+            "X-Tenant": "b", "If-None-Match": second.headers["ETag"]
+        }).status_code == 304
+    finally:
+        register_tenants({})
+
+
+def test_cold_chart_counts_one_miss(client):
+    from app import CHART_CACHE
+
+    scores = {axis: 41.25 for axis in COMPILED_AXES.axis_names}
+    before = CHART_CACHE.stats()
+    statuses = [client.post("/api/generate-pdf?size=thumbnail", json={"scores": scores}).headers["X-Cache"]
+                for _ in range(2)]
+    after = CHART_CACHE.stats()
+
+    assert statuses == ["MISS", "HIT"]
+    assert (after["misses"] - before["misses"], after["hits"] - before["hits"]) == (1, 1)
+
+
+def test_team_profile_is_cached_per_membership(client):
+    from app import TEAM_CACHE
+
+    members = [{"id": f"m{i}", "scores": {axis: 20.0 + 7 * i for axis in COMPILED_AXES.axis_names}}
+               for i in range(6)]
+    before = TEAM_CACHE.stats()
+    first = client.post("/api/team-profile?size=thumbnail", json={"members": members})
+    second = client.post("/api/team-profile?size=thumbnail", json={"members": members[::-1]})
+    after = TEAM_CACHE.stats()
+
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert first.get_json() == second.get_json()
+    assert (after["misses"] - before["misses"], after["hits"] - before["hits"]) == (1, 1)
@@ -0,0 +1,367 @@
+"""
+Fuzzing du cœur de scoring : les chemins rapides (dictionnaire, vecteur, matrice, cohorte)
+doivent reproduire exactement compute_axis_score sur des réponses aléatoires et adverses,
+et respecter bornes, monotonie et symétrie d'inversion. Un budget de débit par cœur
+fait échouer la suite si le scoring vectorisé ralentit.
+
+    NYOTA_FUZZ_SEED      graine des cas générés (défaut fixe, reproductible)
+    NYOTA_FUZZ_CASES     nombre de cartes de réponses par propriété
+    NYOTA_SCORING_BUDGET_ROWS      lignes/s minimales de compute_scores_matrix
+    NYOTA_SCORING_BUDGET_REQUESTS  appels/s minimaux de compute_all_scores
+
+Les politiques de scoring (poids, imputation, couverture) sont comparées à une moyenne pondérée
+calculée item par item.
+
+Si hypothesis est installé, une propriété supplémentaire explore les cartes de réponses avec lui.
+"""
+import os
+import time
+
+import numpy as np
+import pytest
+
+from nyota_calculator import (
+    AXES_CONFIG,
+    PRIOR_VARIANCE,
+    PRIOR_WEIGHT,
+    BLOC_NAMES,
+    BLOC_RANGES,
+    COMPILED_AXES,
+    LIKERT_MAX,
+    LIKERT_MIN,
+    MISSING,
+    NUM_ITEMS,
+    compute_all_scores,
+    compute_axis_score,
+    compile_policy,
+    compute_scores_matrix,
+    compute_scores_with_errors,
+    confidence_intervals,
+    item_column,
+    parse_responses,
+    responses_to_vector,
+    scores_to_dict,
+    validate_responses,
+    vector_to_responses
+)
+from nyota_parallel import score_cohort
+
+try:
+    from hypothesis import given, settings, strategies as st
+except ImportError:  # hypothesis est optionnel : les générateurs maison suffisent
+    given = None
+
+SEED = int(os.environ.get("NYOTA_FUZZ_SEED", 46))
+CASES = int(os.environ.get("NYOTA_FUZZ_CASES", 2000))
+BUDGET_ROWS = float(os.environ.get("NYOTA_SCORING_BUDGET_ROWS", 150000))
+BUDGET_REQUESTS = float(os.environ.get("NYOTA_SCORING_BUDGET_REQUESTS", 5000))
+
+AXIS_NAMES = list(AXES_CONFIG)
+
+
+# ============================================
+# RÉFÉRENCE ET GÉNÉRATEURS
+# ============================================
+
+def reference_scores(responses):
+    parsed = parse_responses(responses)
+    return {axis: compute_axis_score(axis, config, parsed) for axis, config in AXES_CONFIG.items()}
+
+
+def axis_columns(axis, inverted=None):
+    config = AXES_CONFIG[axis]
+    columns = []
+    for bloc_name in BLOC_NAMES:
+        for item in config.get(bloc_name, []):
+            is_inverted = (bloc_name, item) in config["invert"]
+            if inverted is None or inverted == is_inverted:
+                columns.append(item_column(bloc_name, item))
+    return columns
+
+
+INVERTED_COLUMNS = sorted({c for axis in AXIS_NAMES for c in axis_columns(axis, inverted=True)})
+
+
+def adversarial_vector(rng, kind):
+    """Vecteur de réponses (0 = non répondu) d'une famille de cas limites"""
+    vector = np.zeros(NUM_ITEMS, dtype=np.int64)
+
+    if kind == "dense":
+        vector[:] = rng.integers(LIKERT_MIN, LIKERT_MAX + 1, NUM_ITEMS)
+    elif kind == "sparse":
+        density = rng.choice([0.02, 0.1, 0.5, 0.9])
+        answered = rng.random(NUM_ITEMS) < density
+        vector[answered] = rng.integers(LIKERT_MIN, LIKERT_MAX + 1, answered.sum())
+    elif kind == "empty":
+        pass
+    elif kind == "single":
+        vector[rng.integers(NUM_ITEMS)] = rng.integers(LIKERT_MIN, LIKERT_MAX + 1)
+    elif kind == "axis_missing":
+        vector[:] = rng.integers(LIKERT_MIN, LIKERT_MAX + 1, NUM_ITEMS)
+        vector[axis_columns(AXIS_NAMES[rng.integers(len(AXIS_NAMES))])] = MISSING
+    elif kind == "inverted_only":
+        vector[INVERTED_COLUMNS] = rng.integers(LIKERT_MIN, LIKERT_MAX + 1, len(INVERTED_COLUMNS))
+    elif kind == "single_bloc":
+        first, last = BLOC_RANGES[BLOC_NAMES[rng.integers(len(BLOC_NAMES))]]
+        vector[first - 1:last] = rng.integers(LIKERT_MIN, LIKERT_MAX + 1, last - first + 1)
+    elif kind == "extremes":
+        vector[:] = rng.choice([LIKERT_MIN, LIKERT_MAX], NUM_ITEMS)
+        vector[rng.random(NUM_ITEMS) < 0.3] = MISSING
+    elif kind == "constant":
+        vector[:] = rng.integers(LIKERT_MIN, LIKERT_MAX + 1)
+    return vector
+
+
+KINDS = ["dense", "sparse", "empty", "single", "axis_missing", "inverted_only", "single_bloc", "extremes", "constant"]
+
+
+def fuzz_vectors(cases=CASES, seed=SEED):
+    rng = np.random.default_rng(seed)
+    return [adversarial_vector(rng, KINDS[i % len(KINDS)]) for i in range(cases)]
+
+
+VECTORS = fuzz_vectors()
+
+
+def case_label(i):
+    return f"cas {i} ({KINDS[i % len(KINDS)]}, NYOTA_FUZZ_SEED={SEED})"
+
+
+# ============================================
+# ÉQUIVALENCE AVEC LA RÉFÉRENCE
+# ============================================
+
+def test_dict_path_matches_reference():
+    for i, vector in enumerate(VECTORS):
+        responses = vector_to_responses(vector)
+        assert compute_all_scores(responses) == reference_scores(responses), case_label(i)
+
+
+def test_matrix_and_cohort_paths_match_reference():
+    matrix = np.asarray(VECTORS, dtype=np.uint8)
+    expected = np.array([list(reference_scores(vector_to_responses(v)).values()) for v in VECTORS])
+
+    np.testing.assert_array_equal(compute_scores_matrix(matrix), expected)
+    np.testing.assert_array_equal(score_cohort(matrix, workers=1, chunk_size=257, output_dtype=np.float64),
+                                  expected)
+
+
+def test_json_path_matches_reference():
+    # Clés JSON en chaînes, comme reçues par /api/calculate
+    for i, vector in enumerate(VECTORS[:500]):
+        responses = vector_to_responses(vector)
+        validation = validate_responses({str(k): v for k, v in responses.items()}, require_complete=False)
+        assert validation["valid"], case_label(i)
+        scores = scores_to_dict(compute_scores_matrix(validation["vector"])[0])
+        assert scores == reference_scores(responses), case_label(i)
+
+
+def test_invalid_values_are_rejected_not_scored():
+    rng = np.random.default_rng(SEED)
+    for _ in range(200):
+        responses = vector_to_responses(adversarial_vector(rng, "dense"))
+        item = int(rng.integers(1, NUM_ITEMS + 1))
+        responses[item] = int(rng.choice([MISSING, LIKERT_MAX + 1, -1, 255]))
+        _, errors = responses_to_vector(responses)
+        validation = validate_responses(responses, require_complete=False)
+        assert errors or not validation["valid"]
+
+
+# ============================================
+# INVARIANTS
+# ============================================
+
+def test_bounds_and_empty_axes():
+    scores = compute_scores_matrix(np.asarray(VECTORS, dtype=np.uint8))
+    assert ((scores >= 0) & (scores <= 100)).all()
+
+    answered = (np.asarray(VECTORS) != MISSING).astype(np.float64) @ COMPILED_AXES.weights
+    assert (scores[answered == 0] == 0.0).all()
+
+
+def test_monotonicity():
+    rng = np.random.default_rng(SEED + 1)
+    for i, vector in enumerate(VECTORS[:800]):
+        column = int(rng.integers(NUM_ITEMS))
+        if vector[column] in (MISSING, LIKERT_MAX):
+            continue
+        raised = vector.copy()
+        raised[column] += 1
+
+        before, after = compute_scores_matrix(np.stack([vector, raised]).astype(np.uint8))
+        direct = COMPILED_AXES.membership[:, column] & ~COMPILED_AXES.invert[:, column]
+        inverted = COMPILED_AXES.invert[:, column]
+        unrelated = ~COMPILED_AXES.membership[:, column]
+
+        assert (after[direct] >= before[direct]).all(), case_label(i)
+        assert (after[inverted] <= before[inverted]).all(), case_label(i)
+        assert (after[unrelated] == before[unrelated]).all(), case_label(i)
+
+
+def test_inversion_symmetry():
+    matrix = np.asarray(VECTORS, dtype=np.int64)
+    mirrored = np.where(matrix != MISSING, LIKERT_MAX + LIKERT_MIN - matrix, MISSING)
+    scores = compute_scores_matrix(matrix.astype(np.uint8))
+    mirrored_scores = compute_scores_matrix(mirrored.astype(np.uint8))
+
+    answered = (matrix != MISSING).astype(np.float64) @ COMPILED_AXES.weights > 0
+    np.testing.assert_allclose(scores[answered] + mirrored_scores[answered], 100.0, atol=0.011)
+
+
+if given is not None:
+    @settings(max_examples=300, deadline=None)
+    @given(st.dictionaries(st.integers(1, NUM_ITEMS), st.integers(LIKERT_MIN, LIKERT_MAX)))
+    def test_hypothesis_dict_path_matches_reference(responses):
+        assert compute_all_scores(responses) == reference_scores(responses)
+
+
+# ============================================
+# ERREURS TYPES ET INTERVALLES
+# ============================================
+
+def reference_standard_error(vector, axis):
+    values = []
+    for column in axis_columns(axis):
+        if vector[column] != MISSING:
+            value = vector[column]
+            if column in axis_columns(axis, inverted=True):
+                value = LIKERT_MAX + LIKERT_MIN - value
+            values.append(float(value))
+    if not values:
+        return np.nan
+
+    n = len(values)
+    observed = sum((v - sum(values) / n) ** 2 for v in values)
+    variance = (observed + PRIOR_VARIANCE * PRIOR_WEIGHT) / (n - 1 + PRIOR_WEIGHT)
+    return round(25 * np.sqrt(variance / n), 2)
+
+
+def test_standard_errors_match_item_reference():
+    matrix = np.asarray(VECTORS, dtype=np.uint8)
+    scores, standard_errors = compute_scores_with_errors(matrix)
+    np.testing.assert_array_equal(scores, compute_scores_matrix(matrix))
+
+    for i, vector in enumerate(VECTORS[:400]):
+        expected = [reference_standard_error(vector, axis) for axis in AXIS_NAMES]
+        np.testing.assert_allclose(standard_errors[i], expected, atol=0.0101, err_msg=case_label(i))
+
+    low, high = confidence_intervals(scores, standard_errors)
+    answered = ~np.isnan(standard_errors)
+    assert ((low[answered] <= scores[answered]) & (scores[answered] <= high[answered])).all()
+    assert ((low[answered] >= 0) & (high[answered] <= 100)).all()
+
+
+def test_cohort_errors_match_single_pass():
+    matrix = np.asarray(VECTORS, dtype=np.uint8)
+    scores, standard_errors = score_cohort(matrix, workers=1, chunk_size=257, output_dtype=np.float64,
+                                           with_errors=True)
+    expected_scores, expected_errors = compute_scores_with_errors(matrix)
+    np.testing.assert_array_equal(scores, expected_scores)
+    np.testing.assert_array_equal(standard_errors, expected_errors)
+
+
+# ============================================
+# POLITIQUES DE SCORING
+# ============================================
+
+def reference_policy_scores(vector, item_weights, item_means, min_coverage):
+    scores = []
+    for axis in AXIS_NAMES:
+        total = weight_sum = answered_weight = axis_weight = 0.0
+        for column in axis_columns(axis):
+            weight = item_weights[column]
+            axis_weight += weight
+            value = vector[column]
+            if value != MISSING:
+                answered_weight += weight
+            elif item_means is not None:
+                value = item_means[column]
+            else:
+                continue
+            if column in axis_columns(axis, inverted=True):
+                value = LIKERT_MAX + LIKERT_MIN - value
+            total += weight * value
+            weight_sum += weight
+
+        if answered_weight / axis_weight < min_coverage:
+            scores.append(np.nan)
+        else:
+            scores.append(round((total / weight_sum - 1) / 4 * 100, 2) if weight_sum else 0.0)
+    return scores
+
+
+def test_default_policy_matches_table_path():
+    matrix = np.asarray(VECTORS, dtype=np.uint8)
+    np.testing.assert_array_equal(compute_scores_matrix(matrix, policy=compile_policy()),
+                                  compute_scores_matrix(matrix))
+
+
+def test_weighted_imputed_policy_matches_item_reference():
+    rng = np.random.default_rng(SEED + 2)
+    item_weights = rng.choice([0.0, 0.5, 1.0, 2.0, 3.0], NUM_ITEMS)
+    item_weights[[axis_columns(axis)[0] for axis in AXIS_NAMES]] = 1.0  # aucun axe de poids nul
+    item_means = rng.uniform(LIKERT_MIN, LIKERT_MAX, NUM_ITEMS)
+
+    for means in (None, item_means):
+        policy = compile_policy(item_weights=item_weights, item_means=means, min_coverage=0.5)
+        scores = compute_scores_matrix(np.asarray(VECTORS[:400], dtype=np.uint8), policy=policy)
+        for i, vector in enumerate(VECTORS[:400]):
+            expected = reference_policy_scores(vector, item_weights, means, 0.5)
+            np.testing.assert_allclose(scores[i], expected, atol=0.0101, err_msg=case_label(i))
+
+
+def test_imputation_leaves_complete_rows_unchanged():
+    complete = [v for v in VECTORS if (v != MISSING).all()]
+    matrix = np.asarray(complete, dtype=np.uint8)
+    policy = compile_policy(item_means=np.full(NUM_ITEMS, 2.5), min_coverage=1.0)
+    np.testing.assert_array_equal(compute_scores_matrix(matrix, policy=policy), compute_scores_matrix(matrix))
+
+
+def test_policy_rejects_unusable_configurations():
+    for kwargs in ({"item_weights": {0: 1.0}}, {"item_weights": np.zeros(NUM_ITEMS)},
+                   {"item_means": np.zeros(NUM_ITEMS)}, {"min_coverage": 1.5},
+                   {"min_coverage": {"Axe inconnu": 0.5}}):
+        with pytest.raises(ValueError):
+            compile_policy(**kwargs)
+
+
+def test_partial_batches_cost_no_more_than_complete_ones():
+    rng = np.random.default_rng(SEED)
+    complete = rng.integers(LIKERT_MIN, LIKERT_MAX + 1, size=(50000, NUM_ITEMS), dtype=np.uint8)
+    partial = np.where(rng.random(complete.shape) < 0.4, MISSING, complete).astype(np.uint8)
+    policy = compile_policy(item_means=np.full(NUM_ITEMS, 3.0), min_coverage=0.5)
+
+    # Mesures alternées (meilleur de 7) : une charge passagère de la machine touche les deux lots
+    complete_rate = partial_rate = 0.0
+    for _ in range(7):
+        complete_rate = max(complete_rate, best_rate(lambda: compute_scores_matrix(complete, policy=policy),
+                                                     len(complete), repeats=1))
+        partial_rate = max(partial_rate, best_rate(lambda: compute_scores_matrix(partial, policy=policy),
+                                                   len(partial), repeats=1))
+    assert partial_rate >= 0.7 * complete_rate, f"{partial_rate:,.0f} < 0.7 × {complete_rate:,.0f} lignes/s"
+
+
+# ============================================
+# BUDGET DE DÉBIT (PAR CŒUR)
+# ============================================
+
+def best_rate(fn, count, repeats=3):
+    best = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = max(best, count / (time.perf_counter() - start))
+    return best
+
+
+def test_matrix_throughput_budget():
+    rng = np.random.default_rng(SEED)
+    matrix = rng.integers(MISSING, LIKERT_MAX + 1, size=(100000, NUM_ITEMS), dtype=np.uint8)
+    rate = best_rate(lambda: compute_scores_matrix(matrix), len(matrix))
+    assert rate >= BUDGET_ROWS, f"{rate:,.0f} lignes/s < budget {BUDGET_ROWS:,.0f}"
+
+
+def test_request_throughput_budget():
+    maps = [vector_to_responses(v) for v in VECTORS[:1000]]
+    rate = best_rate(lambda: [compute_all_scores(responses) for responses in maps], len(maps))
+    assert rate >= BUDGET_REQUESTS, f"{rate:,.0f} appels/s < budget {BUDGET_REQUESTS:,.0f}"
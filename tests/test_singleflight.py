@@ -0,0 +1,83 @@
+"""
+Coalescence des rendus : des appels simultanés pour la même clé ne déclenchent qu'un rendu,
+et l'erreur du premier appel n'est jamais transmise comme résultat aux appels en attente.
+"""
+import threading
+import time
+
+import pytest
+
+from nyota_singleflight import SingleFlight
+
+CALLERS = 8
+
+
+def run_concurrently(flight, fn, lookup=None):
+    start = threading.Barrier(CALLERS)
+    results = [None] * CALLERS
+
+    def call(index):
+        start.wait()
+        try:
+            results[index] = ("ok", flight.do("radar", fn, lookup))
+        except Exception as e:
+            results[index] = ("error", e)
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_concurrent_identical_calls_render_once():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def render():
+        calls.append(1)
+        release.wait(5)
+        return "image"
+
+    threads, results = run_concurrently(flight, render)
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert sorted(shared for _, (_, shared) in results) == [False] + [True] * (CALLERS - 1)
+    assert all(value == "image" for _, (value, _) in results)
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": CALLERS - 1, "cross_process": False}
+
+
+def test_leader_error_is_not_shared():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    cache = {}
+
+    def render():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(5)
+            raise RuntimeError("rendu impossible")
+        cache["radar"] = "image"
+        return "image"
+
+    threads, results = run_concurrently(flight, render, lookup=lambda: cache.get("radar"))
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    errors = [outcome for status, outcome in results if status == "error"]
+    assert len(errors) == 1 and isinstance(errors[0], RuntimeError)
+    assert all(outcome[0] == "image" for status, outcome in results if status == "ok")
+    assert len(calls) == 2
+
+
+def test_lookup_hit_skips_render():
+    flight = SingleFlight()
+    value, shared = flight.do("radar", lambda: pytest.fail("rendu inutile"), lookup=lambda: "en cache")
+    assert (value, shared) == ("en cache", True)
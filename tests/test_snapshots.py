@@ -0,0 +1,218 @@
+"""
+Sorties de référence (golden) des rendus et rapports sur un corpus fixe de répondants synthétiques.
+
+Chaque couple (répondant, artefact) est un test indépendant : `pytest -n auto` (pytest-xdist)
+les répartit sur plusieurs processus. Pour régénérer les références après un changement voulu :
+
+    NYOTA_UPDATE_SNAPSHOTS=1 python -m pytest tests/test_snapshots.py
+"""
+import io
+import json
+import os
+import re
+from html.parser import HTMLParser
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import diag
+from nyota_calculator import NUM_ITEMS, compute_all_scores, vector_to_responses
+from nyota_render import KIVIAT_STYLE, SIMPLE_STYLE, render_radar_png
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshots")
+CORPUS_FILE = os.path.join(SNAPSHOT_DIR, "corpus.json")
+UPDATE = os.environ.get("NYOTA_UPDATE_SNAPSHOTS") == "1"
+
+SNAPSHOT_DPI = 30          # les références PNG sont petites : le test porte sur le tracé, pas la résolution
+HASH_SIZE = 16             # dHash 16×16 = 256 bits
+MAX_HASH_DISTANCE = 4
+MAX_MEAN_DIFFERENCE = 0.3  # écart moyen par canal, sur 255 (un axe décalé de 3 points dépasse déjà)
+MAX_CHANGED_PIXELS = 0.003 # part des pixels qui changent franchement (> 64 sur un canal)
+MAX_SIZE_DRIFT = 2         # pixels (arrondis de bbox_inches='tight')
+FLOAT_DIGITS = 6
+
+
+# ============================================
+# CORPUS SYNTHÉTIQUE
+# ============================================
+
+def build_corpus():
+    rng = np.random.default_rng(45)
+    vectors = {f"aleatoire{i}": rng.integers(1, 6, size=NUM_ITEMS) for i in range(1, 5)}
+    vectors["neutre"] = np.full(NUM_ITEMS, 3)
+    vectors["contraste"] = np.where(np.arange(NUM_ITEMS) < 12, 5, 1)
+    partial = rng.integers(1, 6, size=NUM_ITEMS)
+    partial[rng.random(NUM_ITEMS) < 0.2] = 0
+    vectors["partiel"] = partial
+
+    return [
+        {"id": respondent_id, "responses": vector_to_responses(vector)}
+        for respondent_id, vector in vectors.items()
+    ]
+
+
+def load_corpus():
+    if UPDATE or not os.path.exists(CORPUS_FILE):
+        corpus = build_corpus()
+        for respondent in corpus:
+            respondent["scores"] = compute_all_scores(respondent["responses"])
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with open(CORPUS_FILE, "w", encoding="utf-8") as f:
+            json.dump(corpus, f, ensure_ascii=False, indent=1)
+
+    with open(CORPUS_FILE, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    for respondent in corpus:
+        respondent["responses"] = {int(k): v for k, v in respondent["responses"].items()}
+    return corpus
+
+
+CORPUS = load_corpus()
+
+
+# ============================================
+# NORMALISATION ET COMPARAISON
+# ============================================
+
+class _DomEvents(HTMLParser):
+    """Arbre HTML aplati : balises, attributs triés, texte aux blancs réduits"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.events = []
+
+    def handle_starttag(self, tag, attrs):
+        self.events.append(["start", tag, sorted([name, value or ""] for name, value in attrs)])
+
+    def handle_endtag(self, tag):
+        self.events.append(["end", tag])
+
+    def handle_data(self, data):
+        text = " ".join(data.split())
+        if text:
+            self.events.append(["text", text])
+
+
+def normalized_dom(html: str):
+    parser = _DomEvents()
+    parser.feed(html)
+    parser.close()
+    return parser.events
+
+
+def _round_floats(value):
+    if isinstance(value, float):
+        return round(value, FLOAT_DIGITS)
+    if isinstance(value, list):
+        return [_round_floats(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _round_floats(v) for k, v in value.items()}
+    return value
+
+
+def dashboard_figure(html: str):
+    """Données, mise en page et configuration passées à Plotly.newPlot (sans la bibliothèque ni l'id aléatoire)"""
+    match = re.search(r'Plotly\.newPlot\(\s*"[^"]+",\s*', html)
+    assert match, "Plotly.newPlot introuvable dans le dashboard"
+
+    decoder = json.JSONDecoder()
+    position = match.end()
+    arguments = []
+    for _ in range(3):
+        value, position = decoder.raw_decode(html, position)
+        arguments.append(value)
+        position = re.compile(r"\s*,?\s*").match(html, position).end()
+
+    data, layout, config = arguments
+    layout.pop("template", None)  # thème par défaut de plotly, propre à la version installée
+    return _round_floats({"data": data, "layout": layout, "config": config})
+
+
+def dhash(image: Image.Image) -> np.ndarray:
+    pixels = np.asarray(image.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS), dtype=np.int16)
+    return (pixels[:, 1:] > pixels[:, :-1]).ravel()
+
+
+def assert_images_close(png: bytes, golden_path: str):
+    actual = Image.open(io.BytesIO(png)).convert("RGB")
+    expected = Image.open(golden_path).convert("RGB")
+
+    drift = np.abs(np.subtract(actual.size, expected.size))
+    assert drift.max() <= MAX_SIZE_DRIFT, f"taille {actual.size} au lieu de {expected.size}"
+
+    distance = int(np.count_nonzero(dhash(actual) != dhash(expected)))
+    assert distance <= MAX_HASH_DISTANCE, f"empreinte perceptuelle éloignée de {distance} bits"
+
+    if actual.size != expected.size:
+        actual = actual.resize(expected.size, Image.LANCZOS)
+    difference = np.abs(np.asarray(actual, dtype=np.int16) - np.asarray(expected, dtype=np.int16))
+    assert difference.mean() <= MAX_MEAN_DIFFERENCE, f"écart moyen de {difference.mean():.2f} par pixel"
+    changed = (difference.max(axis=2) > 64).mean()
+    assert changed <= MAX_CHANGED_PIXELS, f"{changed:.2%} des pixels modifiés"
+
+
+# ============================================
+# RÉFÉRENCES
+# ============================================
+
+def snapshot_path(respondent, name):
+    return os.path.join(SNAPSHOT_DIR, respondent["id"], name)
+
+
+def check_snapshot(respondent, name, actual, mode="b"):
+    path = snapshot_path(respondent, name)
+    if UPDATE:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        encoding = None if mode == "b" else "utf-8"
+        with open(path, "w" + mode, encoding=encoding) as f:
+            f.write(actual)
+    elif not os.path.exists(path):
+        pytest.fail(f"missing snapshot : {path} (générer avec NYOTA_UPDATE_SNAPSHOTS=1)")
+    return path
+
+
+def read_snapshot(path, mode="b"):
+    with open(path, "r" + mode, encoding=None if mode == "b" else "utf-8") as f:
+        return f.read()
+
+
+ids = [respondent["id"] for respondent in CORPUS]
+
+
+@pytest.mark.parametrize("respondent", CORPUS, ids=ids)
+def test_scores(respondent):
+    assert compute_all_scores(respondent["responses"]) == pytest.approx(respondent["scores"], abs=1e-9)
+
+
+@pytest.mark.parametrize("style_name", ["kiviat", "simple"])
+@pytest.mark.parametrize("respondent", CORPUS, ids=ids)
+def test_radar_png(respondent, style_name):
+    style = KIVIAT_STYLE if style_name == "kiviat" else SIMPLE_STYLE
+    png = render_radar_png(respondent["scores"], style, dpi=SNAPSHOT_DPI)
+    assert_images_close(png, check_snapshot(respondent, f"radar_{style_name}.png", png))
+
+
+@pytest.mark.parametrize("respondent", CORPUS, ids=ids)
+def test_written_report(respondent):
+    text = diag.generate_written_report(respondent["scores"])
+    assert text == read_snapshot(check_snapshot(respondent, "rapport_ecrit.txt", text, "t"), "t")
+
+
+@pytest.mark.parametrize("respondent", CORPUS, ids=ids)
+def test_html_report(respondent):
+    html = diag.generate_html_report(respondent["scores"])
+    golden = read_snapshot(check_snapshot(respondent, "rapport_complet.html", html, "t"), "t")
+    assert normalized_dom(html) == normalized_dom(golden)
+
+
+@pytest.mark.parametrize("respondent", CORPUS, ids=ids)
+def test_dashboard(respondent, tmp_path):
+    output = str(tmp_path / "dashboard.html")
+    diag.create_unified_dashboard(respondent["scores"], output_path=output, show=False)
+    with open(output, "r", encoding="utf-8") as f:
+        figure = dashboard_figure(f.read())
+
+    serialized = json.dumps(figure, ensure_ascii=False, indent=1, sort_keys=True)
+    golden = read_snapshot(check_snapshot(respondent, "dashboard.json", serialized, "t"), "t")
+    assert figure == json.loads(golden)
@@ -0,0 +1,74 @@
+"""
+Frontend servi par l'application : noms empreintés dans index.html, cache immuable des fichiers,
+ETag et 304, variantes précompressées.
+"""
+import gzip
+import os
+import re
+
+import pytest
+from flask import Flask
+
+from nyota_static import FRONTEND_ASSETS, IMMUTABLE_CACHE_CONTROL, INDEX_CACHE_CONTROL, register_frontend
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def frontend():
+    app = Flask(__name__)
+    register_frontend(app, ROOT)
+    return app.test_client()
+
+
+def asset_urls(frontend):
+    index = frontend.get("/").get_data(as_text=True)
+    return re.findall(r'(?:href|src)="(/assets/[^"]+)"', index)
+
+
+def test_index_points_to_fingerprinted_assets(frontend):
+    response = frontend.get("/")
+    urls = asset_urls(frontend)
+
+    assert response.headers["Cache-Control"] == INDEX_CACHE_CONTROL
+    assert len(urls) == len(FRONTEND_ASSETS)
+    for filename in FRONTEND_ASSETS:
+        stem, ext = os.path.splitext(filename)
+        assert any(re.fullmatch(rf"/assets/{re.escape(stem)}\.[0-9a-f]{{12}}{re.escape(ext)}", url) for url in urls)
+    assert "window.NYOTA_API_URL" in response.get_data(as_text=True)
+
+
+def test_assets_are_immutable_and_match_sources(frontend):
+    for url in asset_urls(frontend):
+        response = frontend.get(url)
+        source = re.sub(r"\.[0-9a-f]{12}(\.\w+)$", r"\1", os.path.basename(url))
+        with open(os.path.join(ROOT, source), "rb") as f:
+            assert response.data == f.read()
+        assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.mimetype == FRONTEND_ASSETS[source]
+
+
+def test_matching_etag_returns_304(frontend):
+    url = asset_urls(frontend)[0]
+    etag = frontend.get(url).headers["ETag"]
+
+    revalidated = frontend.get(url, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304 and not revalidated.data
+    assert frontend.get(url, headers={"If-None-Match": '"autre"'}).status_code == 200
+    assert frontend.get("/", headers={"If-None-Match": frontend.get("/").headers["ETag"]}).status_code == 304
+
+
+def test_precompressed_variant(frontend):
+    url = asset_urls(frontend)[0]
+    plain = frontend.get(url)
+    compressed = frontend.get(url, headers={"Accept-Encoding": "gzip"})
+
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.data) == plain.data
+    assert compressed.headers["ETag"].startswith("W/")
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+
+
+def test_unknown_assets_are_404(frontend):
+    assert frontend.get("/assets/style.000000000000.css").status_code == 404
+    assert frontend.get("/assets/index.html").status_code == 404
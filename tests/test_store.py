@@ -0,0 +1,55 @@
+"""
+Ingestion dans l'archive de réponses : un fichier illisible ou mal formé est rapporté
+sans interrompre le reste du lot, et les doublons d'un lot sont détectés en temps linéaire.
+"""
+import json
+import os
+import time
+
+import numpy as np
+import pytest
+
+from nyota_calculator import NUM_ITEMS
+from nyota_store import ResponseStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_invalid_files_are_rejected_not_fatal(tmp_path):
+    with open(os.path.join(ROOT, "reponse_per1.json"), "r", encoding="utf-8") as f:
+        valid = json.load(f)
+
+    files = {
+        "valide.json": json.dumps(valid),
+        "tronque.json": json.dumps(valid)[:40],
+        "liste.json": "[1, 2, 3]",
+        "binaire.json": b"\xff\xfe\x00".decode("latin-1")
+    }
+    paths = []
+    for name, content in files.items():
+        path = tmp_path / name
+        path.write_text(content, encoding="latin-1" if name == "binaire.json" else "utf-8")
+        paths.append(str(path))
+    paths.append(str(tmp_path / "absent.json"))
+
+    store = ResponseStore(str(tmp_path / "store"))
+    ingested, rejected = store.ingest_json_files(paths)
+
+    assert ingested == 1 and "valide" in store
+    assert rejected[str(tmp_path / "tronque.json")][0]["code"] == "unreadable"
+    assert rejected[str(tmp_path / "liste.json")][0]["code"] == "invalid_payload"
+    assert rejected[str(tmp_path / "binaire.json")][0]["code"] == "unreadable"
+    assert rejected[str(tmp_path / "absent.json")][0]["code"] == "unreadable"
+
+
+def test_append_many_rejects_duplicates_within_a_batch(tmp_path):
+    store = ResponseStore(str(tmp_path))
+    vector = np.full(NUM_ITEMS, 3, dtype=np.uint8)
+
+    with pytest.raises(ValueError):
+        store.append_many([("a", vector), ("b", vector), ("a", vector)])
+    assert len(store) == 0
+
+    start = time.perf_counter()
+    assert store.append_many((f"r{i}", vector) for i in range(20000)) == 20000
+    assert time.perf_counter() - start < 2.0  # linéaire : une liste quadratique prendrait des dizaines de secondes
@@ -0,0 +1,78 @@
+"""
+Profils d'équipe : agrégats comparés à un calcul axe par axe, empreinte indépendante de l'ordre
+des membres, radar en une seule collection et lecture groupée depuis une archive.
+"""
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+
+from nyota_cache import team_hash
+from nyota_calculator import COMPILED_AXES, LIKERT_MAX, LIKERT_MIN, MISSING, NUM_ITEMS
+from nyota_render import TEAM_STYLE, draw_team_radar
+from nyota_store import ResponseStore
+from nyota_teams import group_profile, member_scores_from_vectors, store_member_scores
+
+AXES = COMPILED_AXES.axis_names
+
+
+def team_scores(members, seed=50, uncovered=0.0):
+    rng = np.random.default_rng(seed)
+    scores = np.round(rng.uniform(0, 100, size=(members, len(AXES))), 2)
+    scores[rng.random(scores.shape) < uncovered] = np.nan
+    return scores
+
+
+def test_profile_matches_axis_reference():
+    scores = team_scores(40, uncovered=0.2)
+    scores[:, 3] = np.nan
+    profile = group_profile(scores)
+
+    for axis in range(len(AXES)):
+        column = scores[:, axis][~np.isnan(scores[:, axis])]
+        assert profile["coverage"][axis] == len(column) / len(scores)
+        if len(column) == 0:
+            assert np.isnan(profile["mean"][axis]) and np.isnan(profile["median"][axis])
+            continue
+        assert np.isclose(profile["mean"][axis], column.mean())
+        assert np.isclose(profile["std"][axis], column.std(ddof=1))
+        assert np.isclose(profile["median"][axis], np.median(column))
+        assert profile["min"][axis] == column.min() and profile["max"][axis] == column.max()
+
+
+def test_team_hash_ignores_member_order():
+    scores = team_scores(10)
+    ids = [f"m{i}" for i in range(10)]
+    order = np.random.default_rng(1).permutation(10)
+
+    key = team_hash(ids, scores, AXES)
+    assert team_hash([ids[i] for i in order], scores[order], AXES) == key
+    assert team_hash(ids, scores, AXES, namespace="thumbnail.png:") != key
+
+    changed = scores.copy()
+    changed[0, 0] += 1.0
+    assert team_hash(ids, changed, AXES) != key
+
+
+def test_team_radar_draws_members_as_one_collection():
+    scores = team_scores(500, uncovered=0.01)
+    fig = Figure(figsize=TEAM_STYLE["figsize"])
+    draw_team_radar(fig, AXES, scores, group_profile(scores), TEAM_STYLE)
+
+    ax = fig.axes[0]
+    collections = [c for c in ax.collections if type(c) is PolyCollection]
+    assert len(collections) == 1
+    assert len(collections[0].get_paths()) == int((~np.isnan(scores).any(axis=1)).sum())
+
+
+def test_store_member_scores(tmp_path):
+    rng = np.random.default_rng(50)
+    matrix = rng.integers(LIKERT_MIN, LIKERT_MAX + 1, size=(20, NUM_ITEMS), dtype=np.uint8)
+    matrix[0, COMPILED_AXES.membership[0] > 0] = MISSING
+    store = ResponseStore(str(tmp_path))
+    store.append_many((f"r{i}", row) for i, row in enumerate(matrix))
+
+    ids = ["r7", "r0", "r12"]
+    scores = store_member_scores(store, ids)
+    np.testing.assert_array_equal(scores, member_scores_from_vectors(matrix[[7, 0, 12]]))
+    assert np.isnan(scores[1, 0]) and not np.isnan(scores[0]).any()
+
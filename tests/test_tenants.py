@@ -0,0 +1,75 @@
+"""
+Validation des configurations d'axes par tenant : toute erreur de structure ou de type est
+renvoyée comme erreur de validation (jamais levée), pour que le rechargement à chaud l'ignore,
+et un catalogue retiré par un rechargement garde ses tables compilées.
+"""
+import json
+import os
+import time
+
+import pytest
+
+from nyota_calculator import AXES_CONFIG, COMPILED_AXES
+from nyota_catalogue import get_layout
+from nyota_tenants import (
+    TenantWatcher,
+    get_tenant_catalogue,
+    load_tenants,
+    register_tenants,
+    validate_axes_config
+)
+
+
+def default_axes():
+    return {axis: {**config, "invert": [list(entry) for entry in config["invert"]]}
+            for axis, config in AXES_CONFIG.items()}
+
+
+def test_default_axes_are_valid():
+    assert validate_axes_config(default_axes()) == []
+
+
+@pytest.mark.parametrize("config", [
+    {"bloc1": 5, "invert": []},
+    {"bloc1": "1,2", "invert": []},
+    {"bloc1": [1, True], "invert": []},
+    {"bloc1": [1, 2], "invert": [[["bloc1"], 1]]},
+    {"bloc1": [1, 2], "invert": [["bloc1", {"item": 2}]]},
+    {"bloc1": [1, 2], "invert": ["b1"]},
+    {"bloc1": [1, 2], "invert": {"bloc1": 2}}
+])
+def test_malformed_types_are_validation_errors(config):
+    assert validate_axes_config({"Axe": config})
+
+
+def test_watcher_ignores_malformed_file(tmp_path):
+    path = tmp_path / "tenants.json"
+    path.write_text(json.dumps({"acme": {"axes": {"Axe": {"bloc1": 5, "invert": []}}, "questions": 3}}))
+
+    with pytest.raises(ValueError):
+        load_tenants(str(path))
+
+    watcher = TenantWatcher(str(path), interval=0)
+    assert watcher.check() is False
+    assert "bloc1" in watcher.last_error and watcher._signature is not None
+
+
+def test_retired_catalogue_keeps_its_layout(tmp_path):
+    path = tmp_path / "tenants.json"
+    axes = default_axes()
+    axes["Coopération"]["bloc1"] = axes["Coopération"]["bloc1"][:-1]
+    path.write_text(json.dumps({"acme": {"axes": axes}}, ensure_ascii=False), encoding="utf-8")
+
+    watcher = TenantWatcher(str(path), interval=0)
+    assert watcher.check()
+    catalogue = get_tenant_catalogue("acme")
+    layout = catalogue.compiled
+
+    path.write_text(json.dumps({"acme": {"axes": default_axes()}}, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert watcher.check()
+
+    assert get_layout(catalogue["version"]) is None
+    assert catalogue.compiled is layout
+    assert layout.membership.sum() == COMPILED_AXES.membership.sum() - 1
+    register_tenants({})
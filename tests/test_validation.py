@@ -0,0 +1,78 @@
+"""
+Validation des soumissions : une erreur structurée par item pour chaque cas (manquant,
+hors échelle, non entier, clé inconnue, corps qui n'est pas un objet), et couverture par axe.
+"""
+import json
+import os
+
+import pytest
+
+from nyota_calculator import COMPILED_AXES, LIKERT_MAX, MISSING, NUM_ITEMS, validate_responses
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def responses():
+    with open(os.path.join(ROOT, "reponse_per1.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def errors_of(payload, require_complete=True):
+    result = validate_responses(payload, require_complete=require_complete)
+    assert result["valid"] is (not result["errors"])
+    return result["errors"]
+
+
+def test_complete_submission_is_valid(responses):
+    result = validate_responses(responses)
+    assert result["valid"] and result["errors"] == []
+    assert set(result["coverage"].values()) == {1.0}
+    assert (result["vector"] != MISSING).all()
+
+
+def test_missing_item(responses):
+    del responses["12"]
+    assert errors_of(responses) == [{"item": 12, "code": "missing", "value": None}]
+    assert errors_of(responses, require_complete=False) == []
+
+    coverage = validate_responses(responses, require_complete=False)["coverage"]
+    axes = {COMPILED_AXES.axis_names[i] for i in range(len(COMPILED_AXES.axis_names))
+            if COMPILED_AXES.membership[i, 11]}
+    assert all(coverage[axis] < 1.0 for axis in axes)
+    assert all(coverage[axis] == 1.0 for axis in set(coverage) - axes)
+
+
+@pytest.mark.parametrize("value", [LIKERT_MAX + 1, -2, 0, "9"])
+def test_out_of_range(responses, value):
+    responses["5"] = value
+    errors = errors_of(responses)
+    assert [(error["item"], error["code"]) for error in errors] == [(5, "out_of_range")]
+    assert validate_responses(responses, require_complete=False)["vector"][4] == MISSING
+
+
+@pytest.mark.parametrize("value", [2.5, "trois", None, True, [3]])
+def test_non_integer(responses, value):
+    responses["7"] = value
+    assert errors_of(responses) == [{"item": 7, "code": "invalid_value", "value": value}]
+
+
+@pytest.mark.parametrize("key", ["0", str(NUM_ITEMS + 1), "q1", ""])
+def test_unknown_key(responses, key):
+    responses[key] = 3
+    assert errors_of(responses) == [{"item": key, "code": "unknown_item", "value": 3}]
+
+
+def test_numeric_strings_are_accepted(responses):
+    responses["3"] = "4"
+    responses["4"] = 2.0
+    result = validate_responses(responses)
+    assert result["valid"] and result["vector"][2] == 4 and result["vector"][3] == 2
+
+
+@pytest.mark.parametrize("payload", [[1, 2, 3], "réponses", 3, None])
+def test_non_object_payload(payload):
+    result = validate_responses(payload)
+    assert not result["valid"]
+    assert result["errors"] == [{"item": None, "code": "invalid_payload", "value": None}]
+    assert set(result["coverage"].values()) == {0.0}